@@ -0,0 +1,414 @@
+"""
+Throughput benchmarks for the cache simulators and trace loaders.
+
+Run from the project root:
+
+    python -m benchmarks.run_benchmarks run [--sizes 10000 100000] [--output FILE]
+    python -m benchmarks.run_benchmarks compare BASELINE CURRENT [--threshold 10]
+    python -m benchmarks.run_benchmarks scaling [--max-workers N] [--size 4000000]
+    python -m benchmarks.run_benchmarks startup [--repeat 5]
+
+`run` writes a JSON file with accesses/sec and peak memory per benchmark,
+trace size and locality profile. `compare` exits with status 1 if any
+benchmark got slower (or used more memory) than the baseline by more than
+the threshold percentage. No baseline is committed, since throughput
+depends on the machine: create one with `run --output BASELINE` on the
+machine (and commit) you want to compare against. `scaling` times the
+set-partitioned parallel simulator from 1 to N worker processes and
+checks that every run matches the serial result. `startup` times a cold
+`python -m src.cli simulate` process as it runs now (plotting imported
+lazily) against the same command with matplotlib imported up front, as the
+entry points used to do.
+"""
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from config import Config
+from src.cache.cache_simulator import CacheSimulator
+from src.cache.browser_cache_simulator import BrowserLRUCache, simulate_different_cache_sizes
+from src.cache.parallel import simulate_partitioned
+from src.memory.block_stream import BlockStreamCache
+from src.memory.trace_formats import parse_trace
+from src.memory.trace_loader import load_memory_trace, load_browsing_pattern
+from src.memory.workloads import generate_workload, write_memory_trace, write_browsing_pattern
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+# Locality profiles: workload name and generator parameters
+PROFILES = {
+    'zipf': ('zipf', {'num_blocks': 4096, 'alpha': 1.1}),
+    'uniform': ('uniform', {'num_blocks': 4096}),
+    'loop': ('loop', {'loop_length': 64}),
+    'scan': ('scan', {}),
+}
+
+SWEEP_CACHE_SIZES = [5, 10, 15, 20, 25, 30]
+SWEEP_BLOCK_SIZES = [4, 16, 64]
+SWEEP_LINE_COUNTS = [16, 64, 256]
+
+
+def bench_access_memory(addresses, urls, trace_dir):
+    cache = CacheSimulator(cache_size=16, block_size=4)
+    for address in addresses:
+        cache.access_memory(address)
+    return len(addresses)
+
+
+def bench_access_page(addresses, urls, trace_dir):
+    cache = BrowserLRUCache(100)
+    for url in urls:
+        cache.access_page(url)
+    return len(urls)
+
+
+def bench_cache_size_sweep(addresses, urls, trace_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulate_different_cache_sizes(urls, SWEEP_CACHE_SIZES)
+    return len(urls) * len(SWEEP_CACHE_SIZES)
+
+
+def bench_block_stream_sweep(addresses, urls, trace_dir):
+    streams = BlockStreamCache(addresses)
+    for block_size in SWEEP_BLOCK_SIZES:
+        stream = streams.get(block_size)
+        for cache_size in SWEEP_LINE_COUNTS:
+            CacheSimulator(cache_size=cache_size, block_size=block_size).simulate_block_stream(stream)
+    return len(addresses) * len(SWEEP_BLOCK_SIZES) * len(SWEEP_LINE_COUNTS)
+
+
+def bench_load_memory_trace(addresses, urls, trace_dir):
+    return len(load_memory_trace(os.path.join(trace_dir, 'memory_trace.txt')))
+
+
+def bench_parse_trace(addresses, urls, trace_dir):
+    return len(parse_trace(os.path.join(trace_dir, 'memory_trace.txt'), 'hex'))
+
+
+def bench_load_browsing_pattern(addresses, urls, trace_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return len(load_browsing_pattern(os.path.join(trace_dir, 'browsing_pattern.txt')))
+
+
+BENCHMARKS = {
+    'CacheSimulator.access_memory': bench_access_memory,
+    'BrowserLRUCache.access_page': bench_access_page,
+    'simulate_different_cache_sizes': bench_cache_size_sweep,
+    'CacheSimulator.simulate_block_stream': bench_block_stream_sweep,
+    'load_memory_trace': bench_load_memory_trace,
+    'parse_trace': bench_parse_trace,
+    'load_browsing_pattern': bench_load_browsing_pattern,
+}
+
+
+def _measure(benchmark, inputs, repeat, measure_memory):
+    """
+    Time a benchmark (best of repeat runs) and optionally measure its peak memory.
+
+    Returns:
+        dict: seconds, accesses_per_sec and peak_memory_bytes
+    """
+    best = float('inf')
+    accesses = 0
+    for _ in range(repeat):
+        # Like timeit, keep the garbage collector from adding noise to the timing
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            accesses = benchmark(*inputs)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    peak = None
+    if measure_memory:
+        # Separate run: tracemalloc slows allocation down and would skew the timing
+        tracemalloc.start()
+        benchmark(*inputs)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        'accesses': accesses,
+        'seconds': best,
+        'accesses_per_sec': accesses / best if best > 0 else 0.0,
+        'peak_memory_bytes': peak,
+    }
+
+
+def run_benchmarks(sizes=None, profiles=None, benchmarks=None, repeat=5, measure_memory=True, seed=0):
+    """
+    Run the benchmark suite.
+
+    Args:
+        sizes (list): Trace lengths to benchmark
+        profiles (list): Locality profiles (keys of PROFILES)
+        benchmarks (list): Benchmarks to run (keys of BENCHMARKS)
+        repeat (int): Timing repetitions; the fastest run is kept
+        measure_memory (bool): Also record peak memory with tracemalloc
+        seed (int): Seed for the generated traces
+
+    Returns:
+        dict: Metadata and a list of result records
+    """
+    sizes = sizes or DEFAULT_SIZES
+    profiles = profiles or list(PROFILES)
+    benchmarks = benchmarks or list(BENCHMARKS)
+
+    results = []
+    with tempfile.TemporaryDirectory() as trace_dir:
+        for profile in profiles:
+            workload, params = PROFILES[profile]
+            for size in sizes:
+                addresses_array = generate_workload(workload, size, seed=seed, **params)
+                write_memory_trace(addresses_array, os.path.join(trace_dir, 'memory_trace.txt'))
+                write_browsing_pattern(addresses_array // 4, os.path.join(trace_dir, 'browsing_pattern.txt'))
+
+                addresses = addresses_array.tolist()
+                urls = [f"https://site{key}.com" for key in (addresses_array // 4).tolist()]
+                inputs = (addresses, urls, trace_dir)
+
+                for name in benchmarks:
+                    record = {'benchmark': name, 'profile': profile, 'size': size}
+                    record.update(_measure(BENCHMARKS[name], inputs, repeat, measure_memory))
+                    results.append(record)
+                    print(f"{name:<32} {profile:<8} {size:>9} "
+                          f"{record['accesses_per_sec']:>14,.0f} acc/s")
+
+    return {
+        'metadata': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline, current, threshold=10.0):
+    """
+    Compare two benchmark result sets.
+
+    Args:
+        baseline (dict): Results loaded from the stored baseline
+        current (dict): Results of the run under review
+        threshold (float): Allowed slowdown / memory growth in percent
+
+    Returns:
+        list: One dict per benchmark present in both runs, with the throughput
+              and memory change in percent (None when the baseline has no
+              usable value) and a 'regression' flag
+    """
+    def key(record):
+        return (record['benchmark'], record['profile'], record['size'])
+
+    baseline_by_key = {key(record): record for record in baseline['results']}
+    comparison = []
+
+    for record in current['results']:
+        base = baseline_by_key.get(key(record))
+        if base is None:
+            continue
+
+        speed_change = None
+        if record.get('accesses_per_sec') is not None and base.get('accesses_per_sec'):
+            speed_change = (record['accesses_per_sec'] / base['accesses_per_sec'] - 1.0) * 100.0
+        memory_change = None
+        if record.get('peak_memory_bytes') and base.get('peak_memory_bytes'):
+            memory_change = (record['peak_memory_bytes'] / base['peak_memory_bytes'] - 1.0) * 100.0
+
+        regression = ((speed_change is not None and speed_change < -threshold) or
+                      (memory_change is not None and memory_change > threshold))
+        comparison.append({
+            'benchmark': record['benchmark'],
+            'profile': record['profile'],
+            'size': record['size'],
+            'speed_change': speed_change,
+            'memory_change': memory_change,
+            'regression': regression,
+        })
+
+    return comparison
+
+
+def run_scaling(size=4000000, max_workers=None, cache_size=1024, block_size=16, seed=0):
+    """
+    Measure how the set-partitioned parallel simulator scales with workers.
+
+    Args:
+        size (int): Trace length
+        max_workers (int): Largest worker count (defaults to the CPU count)
+        cache_size (int): Number of cache lines
+        block_size (int): Block size in bytes
+        seed (int): Seed for the generated trace
+
+    Returns:
+        dict: Metadata and one record per worker count
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    addresses = generate_workload('zipf', size, seed=seed, num_blocks=1 << 16, alpha=1.1)
+
+    serial = CacheSimulator(cache_size=cache_size, block_size=block_size)
+    start = time.perf_counter()
+    for address in addresses.tolist():
+        serial.access_memory(address)
+    serial_seconds = time.perf_counter() - start
+
+    results = []
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        merged = simulate_partitioned(addresses, cache_size, block_size, workers=workers)
+        seconds = time.perf_counter() - start
+
+        exact = (merged.hits, merged.misses, merged.tags) == (serial.hits, serial.misses, serial.tags)
+        results.append({
+            'workers': workers,
+            'seconds': seconds,
+            'accesses_per_sec': size / seconds,
+            'speedup': serial_seconds / seconds,
+            'exact': exact,
+        })
+        print(f"{workers:>3} workers {seconds:>8.2f} s {size / seconds:>14,.0f} acc/s "
+              f"speedup {serial_seconds / seconds:5.2f}x {'exact' if exact else 'MISMATCH'}")
+
+    return {
+        'metadata': {'size': size, 'cache_size': cache_size, 'block_size': block_size,
+                     'serial_seconds': serial_seconds, 'cpu_count': os.cpu_count()},
+        'results': results,
+    }
+
+
+# A small simulate run as it starts now, and with pyplot imported first (the eager import the CLI avoids)
+STARTUP_COMMANDS = {
+    'lazy plotting': ['-m', 'src.cli'],
+    'eager matplotlib': ['-c', "import sys, runpy, matplotlib; matplotlib.use('Agg'); import matplotlib.pyplot; "
+                               "sys.argv[0] = 'src.cli'; runpy.run_module('src.cli', run_name='__main__')"],
+}
+
+
+def run_startup(repeat=5, size=1000, seed=0):
+    """
+    Measure the cold-start time of the batch CLI.
+
+    Each command is a fresh interpreter running `simulate` on a small trace,
+    so the time is dominated by interpreter start and imports.
+
+    Args:
+        repeat (int): Runs per command; the best is reported
+        size (int): Length of the generated trace
+        seed (int): Seed for the generated trace
+
+    Returns:
+        dict: Metadata and one record per command with its best wall time
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    with tempfile.TemporaryDirectory() as results_dir:
+        trace = os.path.join(results_dir, 'trace.txt')
+        write_memory_trace(generate_workload('zipf', size, seed=seed), trace)
+        arguments = ['--results-dir', results_dir, 'simulate', trace]
+        for name, command in STARTUP_COMMANDS.items():
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, *command, *arguments], cwd=project_root, check=True,
+                               stdout=subprocess.DEVNULL)
+                times.append(time.perf_counter() - start)
+            results.append({'command': name, 'seconds': min(times)})
+            print(f"{name:<20} {min(times) * 1000:8.1f} ms (best of {repeat})")
+
+    return {
+        'metadata': {'size': size, 'repeat': repeat, 'python': platform.python_version()},
+        'results': results,
+    }
+
+
+def _print_comparison(comparison, threshold):
+    print(f"{'Benchmark':<32} {'Profile':<8} {'Size':>9} {'Speed':>9} {'Memory':>9}")
+    print("-" * 71)
+    for row in comparison:
+        speed = f"{row['speed_change']:+.1f}%" if row['speed_change'] is not None else "n/a"
+        memory = f"{row['memory_change']:+.1f}%" if row['memory_change'] is not None else "n/a"
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"{row['benchmark']:<32} {row['profile']:<8} {row['size']:>9} "
+              f"{speed:>9} {memory:>9}{flag}")
+
+    regressions = sum(row['regression'] for row in comparison)
+    print(f"\n{regressions} regression(s) over the {threshold:.1f}% threshold")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache simulator throughput benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run the benchmarks and save JSON results")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+    run_parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--no-memory', action='store_true', help="Skip the peak-memory measurement")
+    run_parser.add_argument('--output', default=os.path.join(Config.RESULTS_DIR, 'benchmarks.json'))
+
+    compare_parser = subparsers.add_parser('compare', help="Compare results against a baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=10.0,
+                                help="Allowed slowdown or memory growth in percent")
+
+    scaling_parser = subparsers.add_parser('scaling', help="Parallel simulation scaling from 1 to N workers")
+    scaling_parser.add_argument('--size', type=int, default=4000000)
+    scaling_parser.add_argument('--max-workers', type=int)
+    scaling_parser.add_argument('--output', default=os.path.join(Config.RESULTS_DIR, 'scaling.json'))
+
+    startup_parser = subparsers.add_parser('startup', help="Cold-start time of the batch CLI")
+    startup_parser.add_argument('--repeat', type=int, default=5)
+    startup_parser.add_argument('--size', type=int, default=1000, help="Accesses in the simulated trace")
+    startup_parser.add_argument('--output', default=os.path.join(Config.RESULTS_DIR, 'startup.json'))
+
+    args = parser.parse_args(argv)
+
+    if args.command in ('run', 'scaling', 'startup'):
+        if args.command == 'run':
+            results = run_benchmarks(args.sizes, args.profiles, args.benchmarks, args.repeat, not args.no_memory)
+        elif args.command == 'scaling':
+            results = run_scaling(args.size, args.max_workers)
+        else:
+            results = run_startup(args.repeat, args.size)
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+        return 0
+
+    results = []
+    for path in (args.baseline, args.current):
+        if not os.path.exists(path):
+            raise SystemExit(f"Error: The file {path} was not found. "
+                             f"Create it with: python -m benchmarks.run_benchmarks run --output {path}")
+        with open(path) as f:
+            results.append(json.load(f))
+    baseline, current = results
+
+    comparison = compare_results(baseline, current, args.threshold)
+    _print_comparison(comparison, args.threshold)
+    return 1 if any(row['regression'] for row in comparison) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
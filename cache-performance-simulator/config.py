@@ -1,3 +1,6 @@
+import json
+
+
 class Config:
     """
     Configuration settings for the cache performance simulator.
@@ -18,4 +21,37 @@ class Config:
         print(f"Block Size: {Config.BLOCK_SIZE}")
         print(f"Trace File Path: {Config.TRACE_FILE_PATH}")
         print(f"Results Directory: {Config.RESULTS_DIR}")
-        print(f"Optimization Strategy: {Config.OPTIMIZATION_STRATEGY}")
\ No newline at end of file
+        print(f"Optimization Strategy: {Config.OPTIMIZATION_STRATEGY}")
+
+    @staticmethod
+    def settings():
+        """
+        Return the current configuration settings as a dictionary.
+        """
+        return {name: value for name, value in vars(Config).items() if name.isupper()}
+
+    @staticmethod
+    def update(**overrides):
+        """
+        Override configuration settings.
+
+        Keys are matched case-insensitively to the setting names
+        (e.g. cache_size -> CACHE_SIZE); None values are ignored.
+        """
+        for name, value in overrides.items():
+            key = name.upper().replace('-', '_')
+            if key not in Config.settings():
+                raise ValueError(f"Unknown configuration setting: {name}")
+            if value is not None:
+                setattr(Config, key, value)
+
+    @staticmethod
+    def load_file(file_path):
+        """
+        Override configuration settings from a JSON file.
+
+        Args:
+            file_path (str): Path to a JSON object of setting names and values
+        """
+        with open(file_path, 'r') as f:
+            Config.update(**json.load(f))
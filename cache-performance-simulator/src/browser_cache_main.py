@@ -1,7 +1,9 @@
 import os
 import random
 from cache.browser_cache_simulator import BrowserLRUCache, simulate_different_cache_sizes, plot_performance_comparison
-import matplotlib.pyplot as plt
+from memory.access_patterns import profile_access_stream
+from memory.trace_loader import load_browsing_pattern, save_browsing_pattern
+from visualization.chart_generator import plot_frequency_distribution
 
 def generate_browsing_pattern(num_pages=100, num_unique_sites=20, with_locality=True):
     """
@@ -29,9 +31,14 @@ def generate_browsing_pattern(num_pages=100, num_unique_sites=20, with_locality=
         popular_sites = random.sample(base_urls, max(1, int(num_unique_sites * 0.2)))
         
         # Moderate frequency sites (30% of sites)
-        moderate_sites = random.sample([url for url in base_urls if url not in popular_sites], 
+        popular_set = set(popular_sites)
+        moderate_sites = random.sample([url for url in base_urls if url not in popular_set], 
                                       max(1, int(num_unique_sites * 0.3)))
         
+        # Remaining sites are visited rarely (computed once, not per visit)
+        moderate_set = set(moderate_sites)
+        rare_sites = [url for url in base_urls if url not in popular_set and url not in moderate_set]
+        
         # Generate the browsing pattern with locality
         for i in range(num_pages):
             if i % 10 < 5:  # 50% chance to visit a popular site
@@ -39,7 +46,6 @@ def generate_browsing_pattern(num_pages=100, num_unique_sites=20, with_locality=
             elif i % 10 < 8:  # 30% chance to visit a moderate frequency site
                 browsing_pattern.append(random.choice(moderate_sites))
             else:  # 20% chance to visit a rare site
-                rare_sites = [url for url in base_urls if url not in popular_sites and url not in moderate_sites]
                 browsing_pattern.append(random.choice(rare_sites))
     else:
         # Without locality: random selection from all sites with equal probability
@@ -47,40 +53,6 @@ def generate_browsing_pattern(num_pages=100, num_unique_sites=20, with_locality=
     
     return browsing_pattern
 
-def save_browsing_pattern(browsing_pattern, filename):
-    """
-    Save the browsing pattern to a file.
-    
-    Args:
-        browsing_pattern (list): List of URLs
-        filename (str): Path to save the file
-    """
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    with open(filename, 'w') as f:
-        for url in browsing_pattern:
-            f.write(f"{url}\n")
-    print(f"Browsing pattern saved to {filename}")
-
-def load_browsing_pattern(filename):
-    """
-    Load a browsing pattern from a file.
-    
-    Args:
-        filename (str): Path to the file
-        
-    Returns:
-        list: List of URLs
-    """
-    if not os.path.exists(filename):
-        print(f"File {filename} does not exist.")
-        return []
-    
-    with open(filename, 'r') as f:
-        urls = [line.strip() for line in f if line.strip()]
-    
-    print(f"Loaded {len(urls)} URLs from {filename}")
-    return urls
-
 def demonstrate_lru_mechanism():
     """
     Demonstrate the LRU mechanism with a small example for educational purposes.
@@ -116,9 +88,35 @@ def demonstrate_lru_mechanism():
     print("\nFinal cache statistics:")
     cache.print_stats()
 
-def main():
+def get_site_frequencies(browsing_pattern, profile=None, top_k=100):
+    """
+    Count visits per site, most visited first.
+    
+    Args:
+        browsing_pattern (list): URLs in visit order
+        profile (StreamProfile): If given, read the counts from this fixed-memory
+                                 profile instead of counting exactly. Only the
+                                 top_k heaviest sites are returned and their
+                                 counts are upper-bound estimates.
+        top_k (int): Number of sites returned from the profile
+        
+    Returns:
+        list: (url, visits) tuples sorted by visits, descending
+    """
+    if profile is not None:
+        return [(url, count) for url, count, _ in profile.heavy_hitters(top_k)]
+    
+    url_counts = {}
+    for url in browsing_pattern:
+        url_counts[url] = url_counts.get(url, 0) + 1
+    return sorted(url_counts.items(), key=lambda x: x[1], reverse=True)
+
+def main(streaming=False):
     """
     Main function to run the browser cache simulation.
+    
+    Args:
+        streaming (bool): Profile the browsing pattern with fixed-memory sketches
     """
     print("Browser Cache Simulator with LRU Policy")
     print("=======================================")
@@ -142,19 +140,21 @@ def main():
         browsing_pattern = generate_browsing_pattern(num_pages=500, num_unique_sites=50)
     
     # Analyze browsing pattern
-    unique_urls = set(browsing_pattern)
     print(f"\nBrowsing Pattern Analysis:")
     print(f"Total page visits: {len(browsing_pattern)}")
-    print(f"Unique websites: {len(unique_urls)}")
+    profile = None
+    if streaming:
+        profile = profile_access_stream(browsing_pattern)
+        print(f"Unique websites (est.): {profile.distinct_count()} "
+              f"(±{profile.error_bounds()['distinct_relative_error'] * 100:.2f}%)")
+    else:
+        print(f"Unique websites: {len(set(browsing_pattern))}")
     
     # Frequency analysis (top 5 sites)
-    url_counts = {}
-    for url in browsing_pattern:
-        url_counts[url] = url_counts.get(url, 0) + 1
+    site_counts = get_site_frequencies(browsing_pattern, profile=profile)
     
     print("\nTop 5 most visited sites:")
-    top_sites = sorted(url_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    for url, count in top_sites:
+    for url, count in site_counts[:5]:
         print(f"{url}: {count} visits ({count/len(browsing_pattern)*100:.1f}%)")
     
     # Simulate with different cache sizes
@@ -167,15 +167,7 @@ def main():
     plot_performance_comparison(results)
     
     # Visualize frequency distribution
-    plt.figure(figsize=(10, 6))
-    sites, counts = zip(*sorted(url_counts.items(), key=lambda x: x[1], reverse=True))
-    plt.bar(range(len(counts)), counts)
-    plt.title('Website Visit Frequency Distribution')
-    plt.xlabel('Website Rank (by popularity)')
-    plt.ylabel('Number of Visits')
-    plt.tight_layout()
-    plt.savefig('website_frequency.png')
-    plt.show()
+    plot_frequency_distribution(site_counts)
     
     print("\nSimulation complete. Results saved to browser_cache_performance.png and website_frequency.png")
 
@@ -1,17 +1,18 @@
 from collections import OrderedDict
-import matplotlib.pyplot as plt
 
 class BrowserLRUCache:
     """
     A browser cache simulator that implements the LRU (Least Recently Used) caching policy.
     This simulates a browser cache that stores the last N visited web pages.
     """
-    def __init__(self, capacity):
+    def __init__(self, capacity, instrumentation=None):
         """
         Initialize the browser cache simulator.
         
         Args:
             capacity (int): Maximum number of pages that can be stored in the cache
+            instrumentation (CacheInstrumentation): Optional time-series sampling
+                and event hooks (the whole cache is treated as a single set)
         """
         self.capacity = capacity
         self.cache = OrderedDict()  # OrderedDict to keep track of access order
@@ -20,6 +21,12 @@ class BrowserLRUCache:
         self.total_accesses = 0
         self.hits = 0
         self.misses = 0
+        
+        # Only instrumented caches pay for instrumentation
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(1)
+            self.access_page = self._access_page_instrumented
     
     def access_page(self, url):
         """
@@ -51,6 +58,57 @@ class BrowserLRUCache:
             self.cache[url] = True
             return False
     
+    def _access_page_instrumented(self, url):
+        """
+        access_page with instrumentation; same results, plus time-series
+        samples and hooks.
+        """
+        self.total_accesses += 1
+        
+        if url in self.cache:
+            self.cache.move_to_end(url)
+            self.hits += 1
+            self.instrumentation.record_hit(0, url)
+            return True
+        else:
+            self.misses += 1
+            evicted_url = None
+            if len(self.cache) >= self.capacity:
+                evicted_url, _ = self.cache.popitem(last=False)
+            self.instrumentation.record_miss(0, url, evicted_url)
+            self.cache[url] = True
+            return False
+    
+    def get_state(self):
+        """
+        Capture the cache contents and counters (see cache.checkpoint).
+        
+        Returns:
+            dict: Capacity, URLs in LRU order and counters
+        """
+        return {
+            'capacity': self.capacity,
+            'urls': list(self.cache.keys()),
+            'total_accesses': self.total_accesses,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+    
+    def set_state(self, state):
+        """
+        Restore contents and counters captured by get_state.
+        
+        Args:
+            state (dict): State from a cache with the same capacity
+        """
+        if state['capacity'] != self.capacity:
+            raise ValueError("Checkpoint capacity does not match this cache")
+        
+        self.cache = OrderedDict.fromkeys(state['urls'], True)
+        self.total_accesses = state['total_accesses']
+        self.hits = state['hits']
+        self.misses = state['misses']
+    
     def get_hit_rate(self):
         """
         Calculate the hit rate.
@@ -130,13 +188,20 @@ def simulate_different_cache_sizes(urls, cache_sizes):
     return results
 
 
-def plot_performance_comparison(results):
+def plot_performance_comparison(results, output_path='browser_cache_performance.png', show=True,
+                                xlabel='Cache Size (number of pages)'):
     """
     Plot hit rate and miss rate for different cache sizes.
     
     Args:
         results (dict): Results from simulate_different_cache_sizes
+        output_path (str): File the chart is saved to
+        show (bool): Open an interactive window after saving
+        xlabel (str): Label for the cache size axis
     """
+    # Imported here so simulations that never plot don't pay for matplotlib
+    import matplotlib.pyplot as plt
+    
     cache_sizes = results['cache_sizes']
     hit_rates = results['hit_rates']
     miss_rates = results['miss_rates']
@@ -150,7 +215,7 @@ def plot_performance_comparison(results):
     plt.plot(cache_sizes, miss_rates, 'o-', color='red', label='Miss Rate')
     
     plt.title('Cache Performance vs. Cache Size')
-    plt.xlabel('Cache Size (number of pages)')
+    plt.xlabel(xlabel)
     plt.ylabel('Rate (%)')
     plt.grid(True)
     plt.legend()
@@ -161,5 +226,8 @@ def plot_performance_comparison(results):
         plt.text(cache_sizes[i], mr-2, f"{mr:.1f}%", ha='center')
     
     plt.tight_layout()
-    plt.savefig('browser_cache_performance.png')
-    plt.show()
\ No newline at end of file
+    plt.savefig(output_path)
+    if show:
+        plt.show()
+    else:
+        plt.close()
\ No newline at end of file
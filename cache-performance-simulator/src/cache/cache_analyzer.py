@@ -1,3 +1,8 @@
+import os
+
+from .results_table import ResultsTable, RunStore
+
+
 class CacheAnalyzer:
     """
     A class for analyzing cache performance metrics and comparing different cache configurations.
@@ -45,4 +50,98 @@ class CacheAnalyzer:
             'misses': cache.misses,
             'hit_rate': cache.get_hit_rate(),
             'miss_rate': cache.get_miss_rate()
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def analyze_region_misses(cache):
+        """
+        Return the per-region miss table of a cache instrumented with a region map.
+        
+        Args:
+            cache (CacheSimulator): A simulator whose instrumentation has a region map.
+        
+        Returns:
+            list: One dict per region, most misses first (see CacheInstrumentation.region_table).
+        """
+        if cache.instrumentation is None or cache.instrumentation.region_map is None:
+            raise ValueError("The cache has no region map instrumentation")
+        return cache.instrumentation.region_table()
+
+    @staticmethod
+    def format_region_table(region_rows, top=None):
+        """
+        Format a per-region miss table as text.
+        
+        Args:
+            region_rows (list): Rows from analyze_region_misses.
+            top (int): Only the first top regions (default: all).
+        
+        Returns:
+            str: One line per region with its accesses, misses, miss rate, miss share and evictions.
+        """
+        rows = region_rows[:top] if top else region_rows
+        width = max([len('Region')] + [len(row['region']) for row in rows])
+        lines = [f"{'Region':<{width}} {'Accesses':>10} {'Misses':>10} {'Miss rate':>9} {'Share':>7} {'Evictions':>10}"]
+        for row in rows:
+            lines.append(f"{row['region']:<{width}} {row['accesses']:>10} {row['misses']:>10} "
+                         f"{row['miss_rate']:>8.2f}% {row['miss_share']:>6.2f}% {row['evictions']:>10}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def results_table(stats_list, labels=None):
+        """
+        Build a columnar table from any number of cache statistics.
+        
+        Args:
+            stats_list (list): Statistics dicts (e.g. from analyze_cache_statistics or a sweep),
+                optionally with configuration columns such as cache_size and block_size.
+            labels (list): Optional name for each entry, stored in a 'label' column.
+        
+        Returns:
+            ResultsTable: One row per entry.
+        """
+        if labels is not None:
+            stats_list = [{'label': label, **stats} for label, stats in zip(labels, stats_list)]
+        return ResultsTable.from_rows(list(stats_list))
+
+    @staticmethod
+    def compare_many(stats_list, labels=None, by='miss_rate', top=10):
+        """
+        Compare any number of caches, ranked by one metric.
+        
+        Args:
+            stats_list (list): Statistics dicts of the caches to compare.
+            labels (list): Optional name for each cache (default: Cache 1, Cache 2, ...).
+            by (str): Column to rank by; lower is better for miss_rate and misses, higher otherwise.
+            top (int): Number of ranked caches to list.
+        
+        Returns:
+            str: A ranked table and a summary of the best cache.
+        """
+        labels = labels or [f"Cache {index}" for index in range(1, len(stats_list) + 1)]
+        table = CacheAnalyzer.results_table(stats_list, labels)
+        if len(table) == 0:
+            return "No caches to compare."
+        ranked = table.rank(by, descending=by not in ('miss_rate', 'misses'), top=top)
+        columns = [name for name in ('label', 'hits', 'misses', 'hit_rate', 'miss_rate') if name in table.columns]
+        best = ranked.data[0]
+        return "\n".join([ranked.format(columns), f"{best['label']} is best by {by} ({best[by]:.2f})."])
+
+    @staticmethod
+    def export_results(stats_list, results_dir, file_name='runs.csv', run=None):
+        """
+        Append statistics to a run store in the results directory.
+        
+        Args:
+            stats_list (list): Statistics dicts to append, one row each.
+            results_dir (str): Directory of the store (usually Config.RESULTS_DIR).
+            file_name (str): Store file; .csv or .jsonl.
+            run (str): Optional run name, stored in a 'run' column so runs can be diffed later.
+        
+        Returns:
+            str: Path of the store.
+        """
+        path = os.path.join(results_dir, file_name)
+        rows = [{'run': run, **stats} if run is not None else stats for stats in stats_list]
+        RunStore(path).extend(rows)
+        return path
@@ -1,16 +1,75 @@
-class CacheSimulator:
+from collections import OrderedDict
+
+VICTIM_MODES = ('victim', 'miss')
+
+
+class CacheStatsMixin:
+    """
+    Hit and miss rates of a memory cache simulator that counts
+    total_accesses, hits and misses, shared by the direct-mapped and
+    set-associative simulators.
+    """
+    def get_hit_rate(self):
+        """
+        Calculate the hit rate.
+
+        Returns:
+            float: Hit rate as a percentage
+        """
+        if self.total_accesses == 0:
+            return 0.0
+
+        return (self.hits / self.total_accesses) * 100.0
+
+    def get_miss_rate(self):
+        """
+        Calculate the miss rate.
+
+        Returns:
+            float: Miss rate as a percentage
+        """
+        if self.total_accesses == 0:
+            return 0.0
+
+        return (self.misses / self.total_accesses) * 100.0
+
+    def print_stats(self):
+        """
+        Print cache statistics.
+        """
+        print(f"Total memory accesses: {self.total_accesses}")
+        print(f"Cache hits: {self.hits}")
+        print(f"Cache misses: {self.misses}")
+        print(f"Hit rate: {self.get_hit_rate():.2f}%")
+        print(f"Miss rate: {self.get_miss_rate():.2f}%")
+
+
+class CacheSimulator(CacheStatsMixin):
     """
     A direct-mapped cache simulator that tracks hits and misses.
     Similar to the assembly implementation in cache_simulator.s
+    
+    An optional small fully associative LRU buffer can sit next to the
+    cache, either as a victim cache (holding lines evicted from the cache;
+    a buffer hit swaps the line back) or as a miss cache (holding a copy of
+    every line fetched on a miss). A miss served by the buffer still counts
+    as a cache miss, and is also counted in victim_hits.
     """
-    def __init__(self, cache_size=16, block_size=4):
+    def __init__(self, cache_size=16, block_size=4, instrumentation=None, victim_entries=0, victim_mode='victim'):
         """
         Initialize the cache simulator.
         
         Args:
             cache_size (int): Number of cache lines
             block_size (int): Size of each block in bytes
+            instrumentation (CacheInstrumentation): Optional per-set counters,
+                time-series sampling and event hooks
+            victim_entries (int): Lines in the victim/miss buffer (0 for none)
+            victim_mode (str): 'victim' for a victim cache, 'miss' for a miss cache
         """
+        if victim_mode not in VICTIM_MODES:
+            raise ValueError(f"Unknown victim buffer mode: {victim_mode}")
+        
         self.cache_size = cache_size
         self.block_size = block_size
         
@@ -26,6 +85,27 @@ class CacheSimulator:
         self.total_accesses = 0
         self.hits = 0
         self.misses = 0
+        
+        # Only simulators with instrumentation or a buffer pay for them: the
+        # extended access path replaces access_memory on this instance
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self.num_sets)
+            self.access_memory = self._access_memory_extended
+        
+        # Victim/miss buffer: block -> True, least recently used first, so
+        # lookup, insertion and LRU eviction are all O(1)
+        self.victim_entries = victim_entries
+        self.victim_mode = victim_mode
+        self.victim_buffer = OrderedDict()
+        self.victim_hits = 0
+        if victim_entries > 0:
+            self.access_memory = self._access_memory_extended
+            self._buffer_miss = self._victim_cache_miss if victim_mode == 'victim' else self._miss_cache_miss
+        
+        # simulate_block_stream inlines the plain lookup only when nothing
+        # else needs to see each access
+        self._fast_path = instrumentation is None and victim_entries == 0
     
     def calculate_index_and_tag(self, address):
         """
@@ -77,36 +157,188 @@ class CacheSimulator:
             self.tags[index] = tag
             return False
     
-    def get_hit_rate(self):
+    def _access_memory_extended(self, address):
         """
-        Calculate the hit rate.
+        access_memory with instrumentation and/or a victim or miss buffer;
+        same hits and misses, plus per-set counters, time-series samples,
+        hooks and buffer hits.
+        """
+        self.total_accesses += 1
+        
+        num_sets = self.num_sets
+        block = address // self.block_size
+        index = block % num_sets
+        tag = block // num_sets
+        tags = self.tags
+        valid_bits = self.valid_bits
         
+        if valid_bits[index] and tags[index] == tag:
+            self.hits += 1
+            if self.instrumentation is not None:
+                self.instrumentation.record_hit(index, address)
+            return True
+        
+        self.misses += 1
+        evicted = tags[index] * num_sets + index if valid_bits[index] else None
+        if self.victim_entries:
+            self._buffer_miss(block, evicted)
+        if self.instrumentation is not None:
+            self.instrumentation.record_miss(index, address,
+                                             evicted * self.block_size if evicted is not None else None)
+        
+        valid_bits[index] = 1
+        tags[index] = tag
+        return False
+    
+    def _victim_cache_miss(self, block, evicted):
+        """
+        Victim cache side of a miss on block, which replaces the line of
+        block number evicted (None if the line was empty).
+        """
+        buffer = self.victim_buffer
+        if block in buffer:
+            # Swap: the buffered line moves into the cache and the cache's
+            # old line takes its place in the buffer
+            self.victim_hits += 1
+            del buffer[block]
+        if evicted is not None:
+            buffer[evicted] = True
+            if len(buffer) > self.victim_entries:
+                buffer.popitem(last=False)
+    
+    def _miss_cache_miss(self, block, evicted):
+        """
+        Miss cache side of a miss on block: every line fetched on a miss is
+        also kept in the buffer.
+        """
+        buffer = self.victim_buffer
+        if block in buffer:
+            self.victim_hits += 1
+            buffer.move_to_end(block)
+        else:
+            buffer[block] = True
+            if len(buffer) > self.victim_entries:
+                buffer.popitem(last=False)
+    
+    def access_block_run(self, block, count=1):
+        """
+        Simulate count consecutive accesses to the same block.
+        
+        Only the first access can miss; the block is resident for the rest.
+        All the accesses are attributed to the block's base address, so a
+        region map must be aligned to the block size.
+        
+        Args:
+            block (int): Block address (address // block_size)
+            count (int): Number of consecutive accesses to the block
+            
         Returns:
-            float: Hit rate as a percentage
+            bool: True if the first access was a hit
         """
-        if self.total_accesses == 0:
-            return 0.0
+        address = block * self.block_size
+        hit = self.access_memory(address)
         
-        return (self.hits / self.total_accesses) * 100.0
+        repeats = count - 1
+        if repeats > 0:
+            self.total_accesses += repeats
+            self.hits += repeats
+            if self.instrumentation is not None:
+                self.instrumentation.record_hits(block % self.num_sets, repeats, address)
+        return hit
     
-    def get_miss_rate(self):
+    def simulate_block_stream(self, stream):
         """
-        Calculate the miss rate.
+        Simulate a run-length-collapsed block stream (see memory.block_stream).
+        
+        Gives the same counters and final state as feeding the original
+        trace through access_memory, with one lookup per run.
+        
+        Args:
+            stream (BlockStream): Stream built with this simulator's block size
+            
+        Raises:
+            ValueError: If the block sizes differ, or a region map has bounds
+                        inside a block (a run does not keep its addresses)
+        """
+        if stream.block_size != self.block_size:
+            raise ValueError(f"Stream block size {stream.block_size} does not match cache block size {self.block_size}")
+        if self.instrumentation is not None and self.instrumentation.region_map is not None:
+            self.instrumentation.region_map.check_aligned(self.block_size)
+        
+        blocks = stream.blocks.tolist()
+        counts = stream.counts.tolist()
+        
+        if not self._fast_path:
+            # Instrumentation or a buffer needs every run; go through the extended access path
+            for block, count in zip(blocks, counts):
+                self.access_block_run(block, count)
+            return
+        
+        # Plain direct-mapped path, inlined over the runs
+        num_sets = self.num_sets
+        tags = self.tags
+        valid_bits = self.valid_bits
+        hits = 0
+        misses = 0
+        for block, count in zip(blocks, counts):
+            index = block % num_sets
+            tag = block // num_sets
+            if valid_bits[index] and tags[index] == tag:
+                hits += count
+            else:
+                misses += 1
+                hits += count - 1
+                valid_bits[index] = 1
+                tags[index] = tag
+        
+        self.total_accesses += hits + misses
+        self.hits += hits
+        self.misses += misses
+    
+    def get_state(self):
+        """
+        Capture the cache contents and counters (see cache.checkpoint).
         
         Returns:
-            float: Miss rate as a percentage
+            dict: Geometry, tags, valid bits, victim buffer contents and counters
         """
-        if self.total_accesses == 0:
-            return 0.0
+        return {
+            'cache_size': self.cache_size,
+            'block_size': self.block_size,
+            'tags': list(self.tags),
+            'valid_bits': list(self.valid_bits),
+            'total_accesses': self.total_accesses,
+            'hits': self.hits,
+            'misses': self.misses,
+            'victim_blocks': list(self.victim_buffer),
+            'victim_hits': self.victim_hits,
+        }
+    
+    def set_state(self, state):
+        """
+        Restore contents and counters captured by get_state.
         
-        return (self.misses / self.total_accesses) * 100.0
+        Args:
+            state (dict): State from a simulator with the same geometry
+        """
+        if (state['cache_size'], state['block_size']) != (self.cache_size, self.block_size):
+            raise ValueError("Checkpoint geometry does not match this cache")
+        
+        self.tags[:] = state['tags']
+        self.valid_bits[:] = state['valid_bits']
+        self.total_accesses = state['total_accesses']
+        self.hits = state['hits']
+        self.misses = state['misses']
+        self.victim_buffer = OrderedDict.fromkeys(state.get('victim_blocks', ()), True)
+        self.victim_hits = state.get('victim_hits', 0)
     
     def print_stats(self):
         """
         Print cache statistics.
         """
-        print(f"Total memory accesses: {self.total_accesses}")
-        print(f"Cache hits: {self.hits}")
-        print(f"Cache misses: {self.misses}")
-        print(f"Hit rate: {self.get_hit_rate():.2f}%")
-        print(f"Miss rate: {self.get_miss_rate():.2f}%")
\ No newline at end of file
+        super().print_stats()
+        if self.victim_entries:
+            share = self.victim_hits / self.misses * 100.0 if self.misses else 0.0
+            print(f"{self.victim_mode.capitalize()} buffer hits: {self.victim_hits} ({share:.2f}% of misses, "
+                  f"{self.victim_entries} entries)")
+            print(f"Memory fetches: {self.misses - self.victim_hits}")
\ No newline at end of file
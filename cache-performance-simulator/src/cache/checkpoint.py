@@ -0,0 +1,191 @@
+"""
+Checkpoint and restore of simulator state.
+
+A checkpoint holds everything needed to continue a run exactly where it
+stopped: the cache contents (tags, valid bits and any victim buffer, or
+the browser cache's URLs in LRU order), the hit/miss counters and the
+offset of the next unprocessed access in the trace. It is a compressed
+NumPy archive with one small integer header and a few packed arrays,
+written to a temporary file and renamed into place so an interrupted save
+never leaves a torn file.
+
+Loading a checkpoint always builds a new simulator, so one warmed-up state
+can be loaded several times to fork independent experiments.
+"""
+import os
+import time
+
+import numpy as np
+
+from .browser_cache_simulator import BrowserLRUCache
+from .cache_simulator import VICTIM_MODES, CacheSimulator
+
+CHECKPOINT_VERSION = 1
+
+# Header layout: version, kind, trace offset, counters, geometry
+KIND_CACHE, KIND_BROWSER = 0, 1
+_HEADER_FIELDS = ('version', 'kind', 'trace_offset', 'total_accesses', 'hits', 'misses', 'size', 'block_size')
+
+# How often a time-based run looks at the clock
+_CLOCK_CHECK_INTERVAL = 4096
+
+
+def _kind_of(simulator):
+    if isinstance(simulator, CacheSimulator):
+        return KIND_CACHE
+    if isinstance(simulator, BrowserLRUCache):
+        return KIND_BROWSER
+    raise TypeError(f"Cannot checkpoint a {type(simulator).__name__}")
+
+
+def save_checkpoint(simulator, path, trace_offset=0):
+    """
+    Write a simulator's state to a checkpoint file.
+
+    Args:
+        simulator (CacheSimulator or BrowserLRUCache): Simulator to save
+        path (str): Checkpoint file to write (replaced atomically)
+        trace_offset (int): Index of the next trace access to process on resume
+    """
+    kind = _kind_of(simulator)
+    state = simulator.get_state()
+
+    if kind == KIND_CACHE:
+        size, block_size = state['cache_size'], state['block_size']
+        tags = np.asarray(state['tags'], dtype=np.uint64)
+        arrays = {
+            # Tags are stored in the smallest unsigned type that holds them
+            'tags': tags.astype(np.min_scalar_type(int(tags.max()) if len(tags) else 0)),
+            'valid_bits': np.packbits(np.asarray(state['valid_bits'], dtype=bool)),
+        }
+        if simulator.victim_entries:
+            # Buffered blocks from least to most recently used
+            arrays['victim_blocks'] = np.asarray(state['victim_blocks'], dtype=np.int64)
+            arrays['victim_header'] = np.array([simulator.victim_entries, VICTIM_MODES.index(simulator.victim_mode),
+                                                state['victim_hits']], dtype=np.int64)
+    else:
+        size, block_size = state['capacity'], 0
+        # URLs never contain newlines, so one joined UTF-8 buffer is enough
+        arrays = {'urls': np.frombuffer("\n".join(state['urls']).encode('utf-8'), dtype=np.uint8)}
+
+    arrays['header'] = np.array([CHECKPOINT_VERSION, kind, trace_offset, state['total_accesses'],
+                                 state['hits'], state['misses'], size, block_size], dtype=np.int64)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path, instrumentation=None):
+    """
+    Build a new simulator from a checkpoint file.
+
+    Args:
+        path (str): Checkpoint written by save_checkpoint
+        instrumentation (CacheInstrumentation): Optional instrumentation for the
+            restored simulator; it only sees accesses made after the restore
+
+    Returns:
+        tuple: (simulator, trace_offset)
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        header = dict(zip(_HEADER_FIELDS, archive['header'].tolist()))
+        if header['version'] != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {header['version']}")
+
+        counters = {name: header[name] for name in ('total_accesses', 'hits', 'misses')}
+        if header['kind'] == KIND_CACHE:
+            size = header['size']
+            victim_entries, victim_mode, victim_hits = archive['victim_header'].tolist() \
+                if 'victim_header' in archive.files else (0, 0, 0)
+            simulator = CacheSimulator(cache_size=size, block_size=header['block_size'],
+                                       instrumentation=instrumentation, victim_entries=victim_entries,
+                                       victim_mode=VICTIM_MODES[victim_mode])
+            simulator.set_state(dict(
+                counters, cache_size=size, block_size=header['block_size'],
+                tags=archive['tags'].tolist(),
+                valid_bits=np.unpackbits(archive['valid_bits'], count=size).tolist(),
+                victim_blocks=archive['victim_blocks'].tolist() if victim_entries else [],
+                victim_hits=victim_hits))
+        elif header['kind'] == KIND_BROWSER:
+            data = archive['urls'].tobytes().decode('utf-8')
+            simulator = BrowserLRUCache(header['size'], instrumentation=instrumentation)
+            simulator.set_state(dict(counters, capacity=header['size'], urls=data.split("\n") if data else []))
+        else:
+            raise ValueError(f"Unknown checkpoint kind: {header['kind']}")
+
+    return simulator, header['trace_offset']
+
+
+def run_with_checkpoints(simulator, trace, path, every_accesses=None, every_seconds=None, start=0):
+    """
+    Feed a trace through a simulator, checkpointing as it goes.
+
+    A checkpoint is written every every_accesses accesses and/or whenever
+    every_seconds have passed since the last one, and once more at the
+    end of the trace.
+
+    Args:
+        simulator (CacheSimulator or BrowserLRUCache): Simulator to drive
+        trace (list or np.ndarray): Addresses or URLs in trace order
+        path (str): Checkpoint file
+        every_accesses (int): Checkpoint interval in accesses
+        every_seconds (float): Checkpoint interval in seconds
+        start (int): Trace offset to start from
+
+    Returns:
+        int: Number of checkpoints written
+    """
+    access = simulator.access_memory if _kind_of(simulator) == KIND_CACHE else simulator.access_page
+    if isinstance(trace, np.ndarray):
+        trace = trace.tolist()
+
+    # Work in chunks so the loop only checks the clock between chunks
+    chunk = every_accesses or _CLOCK_CHECK_INTERVAL
+    if every_seconds is not None:
+        chunk = min(chunk, _CLOCK_CHECK_INTERVAL)
+
+    checkpoints = 0
+    since_checkpoint = 0
+    last_save = time.monotonic()
+    offset = start
+    while offset < len(trace):
+        end = min(offset + chunk, len(trace))
+        for item in trace[offset:end]:
+            access(item)
+        since_checkpoint += end - offset
+        offset = end
+
+        due = every_accesses is not None and since_checkpoint >= every_accesses
+        if every_seconds is not None and time.monotonic() - last_save >= every_seconds:
+            due = True
+        if due and offset < len(trace):
+            save_checkpoint(simulator, path, offset)
+            checkpoints += 1
+            since_checkpoint = 0
+            last_save = time.monotonic()
+
+    save_checkpoint(simulator, path, offset)
+    return checkpoints + 1
+
+
+def resume(path, trace, every_accesses=None, every_seconds=None, instrumentation=None):
+    """
+    Continue a checkpointed run from its last checkpoint.
+
+    Args:
+        path (str): Checkpoint file of the interrupted run
+        trace (list or np.ndarray): The same trace the run was started on
+        every_accesses (int): Checkpoint interval in accesses
+        every_seconds (float): Checkpoint interval in seconds
+        instrumentation (CacheInstrumentation): Optional instrumentation for the resumed part
+
+    Returns:
+        CacheSimulator or BrowserLRUCache: The simulator after the whole trace
+    """
+    simulator, offset = load_checkpoint(path, instrumentation=instrumentation)
+    run_with_checkpoints(simulator, trace, path, every_accesses, every_seconds, start=offset)
+    return simulator
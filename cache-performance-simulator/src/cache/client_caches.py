@@ -0,0 +1,178 @@
+from array import array
+
+import numpy as np
+
+
+class SharedClientCaches:
+    """
+    One LRU (or FIFO) browser cache per client, for hundreds of thousands
+    of clients.
+
+    Behaves like a separate BrowserLRUCache(capacity) per client, but all
+    caches live in one flat array of interned URL ids: client c owns slots
+    [c * capacity, (c + 1) * capacity), ordered from least to most recently
+    used. URLs and client names are interned once in shared dictionaries,
+    and the per-client counters are flat arrays too, so a client costs a
+    few bytes per slot instead of a whole OrderedDict.
+    """
+    def __init__(self, capacity, policy='lru'):
+        """
+        Args:
+            capacity (int): Pages cached per client
+            policy (str): 'lru', or 'fifo' to evict in insertion order regardless of hits
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if policy not in ('lru', 'fifo'):
+            raise ValueError(f"Unknown client cache policy: {policy}")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.client_ids = {}
+        self.url_ids = {}
+        self.urls = []
+
+        self.slots = array('i')
+        self.sizes = array('i')
+        self.client_accesses = array('q')
+        self.client_hits = array('q')
+        self._empty_row = array('i', [0]) * capacity
+
+        self.total_accesses = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _add_client(self, client):
+        client_id = len(self.client_ids)
+        self.client_ids[client] = client_id
+        self.slots.extend(self._empty_row)
+        self.sizes.append(0)
+        self.client_accesses.append(0)
+        self.client_hits.append(0)
+        return client_id
+
+    def access_page(self, client, url):
+        """
+        Access a page in one client's cache.
+
+        Args:
+            client (str): Client identifier (IP, user or cookie)
+            url (str): Requested URL
+
+        Returns:
+            bool: True for hit, False for miss
+        """
+        client_id = self.client_ids.get(client)
+        if client_id is None:
+            client_id = self._add_client(client)
+        url_id = self.url_ids.get(url)
+        if url_id is None:
+            url_id = self.url_ids[url] = len(self.urls)
+            self.urls.append(url)
+
+        slots = self.slots
+        start = client_id * self.capacity
+        end = start + self.sizes[client_id]
+        self.total_accesses += 1
+        self.client_accesses[client_id] += 1
+
+        try:
+            position = slots.index(url_id, start, end)
+        except ValueError:
+            self.misses += 1
+            if end - start == self.capacity:
+                # Full: drop the oldest slot
+                slots[start:end - 1] = slots[start + 1:end]
+                slots[end - 1] = url_id
+            else:
+                slots[end] = url_id
+                self.sizes[client_id] += 1
+            return False
+
+        self.hits += 1
+        self.client_hits[client_id] += 1
+        if position != end - 1 and self.policy == 'lru':
+            # Move to the most recently used end
+            slots[position:end - 1] = slots[position + 1:end]
+            slots[end - 1] = url_id
+        return True
+
+    def simulate(self, requests):
+        """
+        Replay (client, url) pairs, e.g. from an AccessLogReader.
+        """
+        access = self.access_page
+        for client, url in requests:
+            access(client, url)
+
+    def get_client_contents(self, client):
+        """
+        URLs in a client's cache, from least to most recently used.
+        """
+        client_id = self.client_ids[client]
+        start = client_id * self.capacity
+        return [self.urls[url_id] for url_id in self.slots[start:start + self.sizes[client_id]]]
+
+    def client_hit_rates(self, min_accesses=1):
+        """
+        Per-client hit rates in percent, for clients with at least min_accesses.
+
+        Returns:
+            np.ndarray: One hit rate per qualifying client
+        """
+        accesses = np.frombuffer(self.client_accesses, dtype=np.int64)
+        hits = np.frombuffer(self.client_hits, dtype=np.int64)
+        selected = accesses >= max(min_accesses, 1)
+        return hits[selected] / accesses[selected] * 100.0
+
+    def get_hit_rate(self):
+        if self.total_accesses == 0:
+            return 0.0
+        return (self.hits / self.total_accesses) * 100.0
+
+    def memory_bytes(self):
+        """
+        Size of the shared arrays (the interned strings are not counted).
+        """
+        return sum(values.itemsize * len(values) for values in
+                   (self.slots, self.sizes, self.client_accesses, self.client_hits))
+
+    def report(self, percentiles=(10, 25, 50, 75, 90, 99), min_accesses=1):
+        """
+        Aggregate and per-client statistics.
+
+        Args:
+            percentiles (tuple): Percentiles of the per-client hit rate to report
+            min_accesses (int): Clients with fewer accesses are left out of the distribution
+
+        Returns:
+            dict: Aggregate counters and hit rate, client counts and hit-rate percentiles
+        """
+        rates = self.client_hit_rates(min_accesses)
+        return {
+            'clients': len(self.client_ids),
+            'clients_in_distribution': len(rates),
+            'distinct_urls': len(self.urls),
+            'total_accesses': self.total_accesses,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.get_hit_rate(),
+            'client_hit_rate_percentiles': {
+                f"{p:g}": float(value) for p, value in
+                zip(percentiles, np.percentile(rates, percentiles) if len(rates) else [0.0] * len(percentiles))
+            },
+            'mean_client_hit_rate': float(rates.mean()) if len(rates) else 0.0,
+            'memory_bytes': self.memory_bytes(),
+        }
+
+    def print_stats(self, percentiles=(10, 25, 50, 75, 90, 99), min_accesses=1):
+        """
+        Print aggregate statistics and the per-client hit-rate distribution.
+        """
+        report = self.report(percentiles, min_accesses)
+        print(f"Clients: {report['clients']}, distinct URLs: {report['distinct_urls']}")
+        print(f"Total accesses: {report['total_accesses']}")
+        print(f"Aggregate hit rate: {report['hit_rate']:.2f}%")
+        print(f"Per-client hit rate (clients with >= {min_accesses} accesses):")
+        for p, value in report['client_hit_rate_percentiles'].items():
+            print(f"  p{p}: {value:.2f}%")
@@ -0,0 +1,242 @@
+from .cache_simulator import CacheSimulator
+
+# Line states
+INVALID, SHARED, EXCLUSIVE, MODIFIED = 0, 1, 2, 3
+STATE_NAMES = {INVALID: 'I', SHARED: 'S', EXCLUSIVE: 'E', MODIFIED: 'M'}
+
+
+class CoherentCacheSystem:
+    """
+    Multi-core simulator: one private direct-mapped CacheSimulator per core,
+    kept coherent by a snooping MESI (or MSI) protocol on a shared bus.
+
+    Besides the usual hits and misses it counts, per core, coherence misses
+    (misses on a block this core lost to another core's write),
+    invalidations sent and received, and bus transactions. Per cache line it
+    records which cores touched which bytes, to find false sharing.
+    """
+    def __init__(self, num_cores, cache_size=16, block_size=4, protocol='MESI'):
+        """
+        Initialize the multi-core system.
+
+        Args:
+            num_cores (int): Number of cores, each with a private cache
+            cache_size (int): Number of lines in each private cache
+            block_size (int): Size of each block in bytes
+            protocol (str): 'MESI' or 'MSI'
+        """
+        protocol = protocol.upper()
+        if protocol not in ('MESI', 'MSI'):
+            raise ValueError(f"Unknown coherence protocol: {protocol}")
+
+        self.num_cores = num_cores
+        self.block_size = block_size
+        self.protocol = protocol
+        self.caches = [CacheSimulator(cache_size=cache_size, block_size=block_size) for _ in range(num_cores)]
+        self.states = [[INVALID] * cache_size for _ in range(num_cores)]
+
+        self.core_stats = [{
+            'coherence_misses': 0,
+            'invalidations_sent': 0,
+            'invalidations_received': 0,
+            'bus_reads': 0,
+            'bus_read_exclusives': 0,
+            'bus_upgrades': 0,
+            'writebacks': 0,
+            'interventions': 0,
+        } for _ in range(num_cores)]
+
+        # Blocks each core lost to an invalidation and has not refetched yet
+        self._invalidated = [set() for _ in range(num_cores)]
+        # block -> {'invalidations': n, 'writers': set, 'offsets': {core: byte bitmask}}
+        self.line_activity = {}
+
+    def _holders(self, requester, index, tag):
+        """
+        Cores other than requester holding the block in a valid state.
+        """
+        holders = []
+        for core in range(self.num_cores):
+            if core == requester:
+                continue
+            cache = self.caches[core]
+            if self.states[core][index] != INVALID and cache.tags[index] == tag:
+                holders.append(core)
+        return holders
+
+    def _evict(self, core, index):
+        """
+        Make room in core's line for a new block, writing back a dirty victim.
+        """
+        if self.states[core][index] == MODIFIED:
+            self.core_stats[core]['writebacks'] += 1
+        self.states[core][index] = INVALID
+
+    def _invalidate_others(self, requester, index, tag, block):
+        activity = self.line_activity[block]
+        for core in self._holders(requester, index, tag):
+            if self.states[core][index] == MODIFIED:
+                # The dirty copy is flushed before it is invalidated
+                self.core_stats[core]['interventions'] += 1
+                self.core_stats[core]['writebacks'] += 1
+            self.states[core][index] = INVALID
+            self.caches[core].valid_bits[index] = 0
+            self._invalidated[core].add(block)
+            self.core_stats[core]['invalidations_received'] += 1
+            self.core_stats[requester]['invalidations_sent'] += 1
+            activity['invalidations'] += 1
+
+    def access(self, core, address, is_write=False):
+        """
+        Simulate one memory access by a core.
+
+        Args:
+            core (int): Core issuing the access
+            address (int): Memory address
+            is_write (bool): True for a store, False for a load
+
+        Returns:
+            bool: True for a hit in the core's private cache, False for a miss
+        """
+        cache = self.caches[core]
+        stats = self.core_stats[core]
+        index, tag = cache.calculate_index_and_tag(address)
+        block = address // self.block_size
+
+        activity = self.line_activity.get(block)
+        if activity is None:
+            activity = self.line_activity[block] = {'invalidations': 0, 'writers': set(), 'offsets': {}}
+        activity['offsets'][core] = activity['offsets'].get(core, 0) | (1 << (address % self.block_size))
+        if is_write:
+            activity['writers'].add(core)
+
+        cache.total_accesses += 1
+        state = self.states[core][index]
+        resident = state != INVALID and cache.tags[index] == tag
+
+        if resident:
+            cache.hits += 1
+            if is_write:
+                if state == SHARED:
+                    # Upgrade: invalidate the other copies without refetching the data
+                    stats['bus_upgrades'] += 1
+                    self._invalidate_others(core, index, tag, block)
+                self.states[core][index] = MODIFIED
+            return True
+
+        # Miss: classify, evict the current line and fetch over the bus
+        cache.misses += 1
+        if block in self._invalidated[core]:
+            stats['coherence_misses'] += 1
+            self._invalidated[core].discard(block)
+        self._evict(core, index)
+
+        if is_write:
+            stats['bus_read_exclusives'] += 1
+            self._invalidate_others(core, index, tag, block)
+            new_state = MODIFIED
+        else:
+            stats['bus_reads'] += 1
+            holders = self._holders(core, index, tag)
+            for holder in holders:
+                holder_state = self.states[holder][index]
+                if holder_state in (MODIFIED, EXCLUSIVE):
+                    if holder_state == MODIFIED:
+                        self.core_stats[holder]['interventions'] += 1
+                        self.core_stats[holder]['writebacks'] += 1
+                    self.states[holder][index] = SHARED
+            new_state = SHARED if holders or self.protocol == 'MSI' else EXCLUSIVE
+
+        cache.valid_bits[index] = 1
+        cache.tags[index] = tag
+        self.states[core][index] = new_state
+        return False
+
+    def simulate(self, records):
+        """
+        Run a core-tagged trace through the system.
+
+        Args:
+            records (iterable): (core, is_write, address) tuples, e.g. from load_core_trace
+
+        Raises:
+            ValueError: If a record names a core the system does not have
+        """
+        for position, (core, is_write, address) in enumerate(records):
+            if not 0 <= core < self.num_cores:
+                raise ValueError(f"Record {position}: core {core} out of range (the system has "
+                                 f"{self.num_cores} cores)")
+            self.access(core, address, is_write)
+
+    def report(self):
+        """
+        Per-core statistics.
+
+        Returns:
+            list: One dict per core with hits, misses, rates and coherence counters
+        """
+        report = []
+        for core, (cache, stats) in enumerate(zip(self.caches, self.core_stats)):
+            row = {
+                'core': core,
+                'accesses': cache.total_accesses,
+                'hits': cache.hits,
+                'misses': cache.misses,
+                'hit_rate': cache.get_hit_rate(),
+                'miss_rate': cache.get_miss_rate(),
+            }
+            row.update(stats)
+            row['bus_transactions'] = stats['bus_reads'] + stats['bus_read_exclusives'] + stats['bus_upgrades']
+            report.append(row)
+        return report
+
+    def sharing_hotspots(self, top_n=10):
+        """
+        Cache lines with the most coherence invalidations.
+
+        A line is flagged as false sharing when it was invalidated but no
+        byte in it was touched by more than one core: the cores only share
+        the line, not the data.
+
+        Returns:
+            list: Dicts with the block address, invalidations, cores, writers
+                  and false_sharing flag, most invalidated first
+        """
+        hotspots = []
+        for block, activity in self.line_activity.items():
+            if not activity['invalidations']:
+                continue
+
+            masks = list(activity['offsets'].values())
+            overlapping = any(masks[i] & masks[j] for i in range(len(masks)) for j in range(i + 1, len(masks)))
+            hotspots.append({
+                'address': block * self.block_size,
+                'invalidations': activity['invalidations'],
+                'cores': sorted(activity['offsets']),
+                'writers': sorted(activity['writers']),
+                'false_sharing': not overlapping,
+            })
+
+        hotspots.sort(key=lambda hotspot: hotspot['invalidations'], reverse=True)
+        return hotspots[:top_n]
+
+    def print_stats(self):
+        """
+        Print per-core statistics and the top sharing hotspots.
+        """
+        for row in self.report():
+            print(f"Core {row['core']}: {row['accesses']} accesses, {row['hits']} hits, {row['misses']} misses "
+                  f"({row['miss_rate']:.2f}% miss rate)")
+            print(f"  Coherence misses: {row['coherence_misses']}, "
+                  f"invalidations sent/received: {row['invalidations_sent']}/{row['invalidations_received']}")
+            print(f"  Bus transactions: {row['bus_transactions']} "
+                  f"(BusRd {row['bus_reads']}, BusRdX {row['bus_read_exclusives']}, BusUpgr {row['bus_upgrades']}), "
+                  f"writebacks: {row['writebacks']}")
+
+        hotspots = self.sharing_hotspots()
+        if hotspots:
+            print("\nSharing hotspots:")
+            for hotspot in hotspots:
+                label = " (false sharing)" if hotspot['false_sharing'] else ""
+                print(f"  {hotspot['address']:#x}: {hotspot['invalidations']} invalidations, "
+                      f"cores {hotspot['cores']}, writers {hotspot['writers']}{label}")
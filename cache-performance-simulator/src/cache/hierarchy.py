@@ -0,0 +1,247 @@
+import hashlib
+from bisect import bisect
+from collections import OrderedDict
+
+from .client_caches import SharedClientCaches
+
+POLICIES = ('lru', 'fifo', 'lfu')
+
+
+class KeyCache:
+    """
+    A key cache with a fixed number of entries and a replacement policy.
+
+    Policies:
+        lru   evict the least recently used key
+        fifo  evict the oldest inserted key
+        lfu   evict the least frequently used key (oldest first among ties)
+    """
+    def __init__(self, capacity, policy='lru'):
+        """
+        Args:
+            capacity (int): Number of keys held
+            policy (str): One of POLICIES
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown cache policy: {policy}")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.entries = OrderedDict()
+
+        # LFU: key -> use count, and count -> keys in insertion order
+        self.counts = {}
+        self.buckets = {}
+        self.min_count = 0
+
+        self.total_accesses = 0
+        self.hits = 0
+        self.misses = 0
+
+        if policy == 'lfu':
+            self.access = self._access_lfu
+
+    def access(self, key):
+        """
+        Look up a key, inserting it on a miss.
+
+        Returns:
+            bool: True for hit, False for miss
+        """
+        self.total_accesses += 1
+        entries = self.entries
+
+        if key in entries:
+            if self.policy == 'lru':
+                entries.move_to_end(key)
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        if self.capacity <= 0:
+            return False
+        if len(entries) >= self.capacity:
+            entries.popitem(last=False)
+        entries[key] = True
+        return False
+
+    def _access_lfu(self, key):
+        self.total_accesses += 1
+        count = self.counts.get(key)
+
+        if count is not None:
+            self.hits += 1
+            bucket = self.buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self.buckets[count]
+                if self.min_count == count:
+                    self.min_count = count + 1
+            self.counts[key] = count + 1
+            self.buckets.setdefault(count + 1, OrderedDict())[key] = True
+            return True
+
+        self.misses += 1
+        if self.capacity <= 0:
+            return False
+        if len(self.counts) >= self.capacity:
+            bucket = self.buckets[self.min_count]
+            evicted, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_count]
+            del self.counts[evicted]
+        self.counts[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = True
+        self.min_count = 1
+        return False
+
+    def __len__(self):
+        return len(self.counts) if self.policy == 'lfu' else len(self.entries)
+
+    def get_hit_rate(self):
+        if self.total_accesses == 0:
+            return 0.0
+        return (self.hits / self.total_accesses) * 100.0
+
+
+def _hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class ConsistentHashRing:
+    """
+    Maps keys to nodes by consistent hashing with virtual nodes.
+
+    Each node is placed on the ring at virtual_nodes hashed points; a key
+    belongs to the first point clockwise from its own hash. Adding or
+    removing a node only moves the keys of that node.
+    """
+    def __init__(self, nodes, virtual_nodes=100):
+        """
+        Args:
+            nodes (int): Number of nodes
+            virtual_nodes (int): Ring points per node; more points spread load more evenly
+        """
+        points = sorted((_hash(f"node{node}#{replica}"), node)
+                        for node in range(nodes) for replica in range(virtual_nodes))
+        self.points = [point for point, _ in points]
+        self.owners = [node for _, node in points]
+        self.nodes = nodes
+
+    def node_for(self, key):
+        if self.nodes == 1:
+            return 0
+        position = bisect(self.points, _hash(key))
+        return self.owners[position % len(self.points)]
+
+
+class CacheHierarchy:
+    """
+    Browser -> proxy -> origin cache hierarchy, driven by (client, url) requests.
+
+    Each client has its own browser cache. Browser misses go to a shared
+    proxy tier, which can be sharded across several nodes by consistent
+    hashing on the URL, and proxy misses go to the origin. Either cache
+    tier can be left out by giving it zero capacity.
+    """
+    def __init__(self, browser_capacity=10, proxy_capacity=1000, proxy_nodes=1,
+                 browser_policy='lru', proxy_policy='lru', virtual_nodes=100):
+        """
+        Args:
+            browser_capacity (int): Pages per client browser cache (0 for no browser tier)
+            proxy_capacity (int): Pages per proxy node (0 for no proxy tier)
+            proxy_nodes (int): Number of proxy nodes sharing the proxy tier
+            browser_policy (str): 'lru' or 'fifo'
+            proxy_policy (str): One of POLICIES
+            virtual_nodes (int): Consistent-hashing points per proxy node
+        """
+        self.browsers = SharedClientCaches(browser_capacity, browser_policy) if browser_capacity > 0 else None
+        self.proxies = [KeyCache(proxy_capacity, proxy_policy) for _ in range(proxy_nodes)] \
+            if proxy_capacity > 0 else []
+        self.ring = ConsistentHashRing(proxy_nodes, virtual_nodes) if self.proxies else None
+
+        self.total_requests = 0
+        self.browser_hits = 0
+        self.proxy_hits = 0
+        self.origin_requests = 0
+
+    def request(self, client, url):
+        """
+        Serve one request.
+
+        Returns:
+            str: The tier that served it: 'browser', 'proxy' or 'origin'
+        """
+        self.total_requests += 1
+        if self.browsers is not None and self.browsers.access_page(client, url):
+            self.browser_hits += 1
+            return 'browser'
+        if self.proxies and self.proxies[self.ring.node_for(url)].access(url):
+            self.proxy_hits += 1
+            return 'proxy'
+        self.origin_requests += 1
+        return 'origin'
+
+    def simulate(self, requests):
+        """
+        Serve a stream of (client, url) pairs in one pass, e.g. from an AccessLogReader.
+        """
+        request = self.request
+        for client, url in requests:
+            request(client, url)
+
+    def report(self):
+        """
+        Per-tier hit rates, origin offload and per-node load.
+
+        Returns:
+            dict: Request counts per tier, hit rates (percent of the requests
+                  reaching each tier), origin offload and per-node statistics
+        """
+        total = self.total_requests
+        proxy_requests = total - self.browser_hits
+
+        nodes = []
+        for node, proxy in enumerate(self.proxies):
+            nodes.append({
+                'node': node,
+                'requests': proxy.total_accesses,
+                'hits': proxy.hits,
+                'hit_rate': proxy.get_hit_rate(),
+                'load_share': proxy.total_accesses / proxy_requests * 100.0 if proxy_requests else 0.0,
+            })
+
+        loads = [row['requests'] for row in nodes]
+        mean_load = sum(loads) / len(loads) if loads else 0.0
+
+        return {
+            'total_requests': total,
+            'browser_hits': self.browser_hits,
+            'browser_hit_rate': self.browser_hits / total * 100.0 if total else 0.0,
+            'proxy_requests': proxy_requests,
+            'proxy_hits': self.proxy_hits,
+            'proxy_hit_rate': self.proxy_hits / proxy_requests * 100.0 if proxy_requests else 0.0,
+            'origin_requests': self.origin_requests,
+            'origin_offload': (1 - self.origin_requests / total) * 100.0 if total else 0.0,
+            'clients': len(self.browsers.client_ids) if self.browsers is not None else 0,
+            'nodes': nodes,
+            # Busiest node relative to a perfectly even split (1.0 is perfect balance)
+            'load_imbalance': max(loads) / mean_load if mean_load else 0.0,
+        }
+
+    def print_stats(self):
+        """
+        Print per-tier and per-node statistics.
+        """
+        report = self.report()
+        print(f"Total requests: {report['total_requests']}")
+        print(f"Browser tier: {report['browser_hits']} hits ({report['browser_hit_rate']:.2f}%) "
+              f"across {report['clients']} clients")
+        print(f"Proxy tier: {report['proxy_hits']} hits of {report['proxy_requests']} requests "
+              f"({report['proxy_hit_rate']:.2f}%)")
+        print(f"Origin: {report['origin_requests']} requests, offload {report['origin_offload']:.2f}%")
+        if len(report['nodes']) > 1:
+            for row in report['nodes']:
+                print(f"  Node {row['node']}: {row['requests']} requests ({row['load_share']:.1f}%), "
+                      f"hit rate {row['hit_rate']:.2f}%")
+            print(f"  Load imbalance (max/mean): {report['load_imbalance']:.2f}")
@@ -0,0 +1,333 @@
+from array import array
+
+import numpy as np
+
+
+class CacheInstrumentation:
+    """
+    Built-in instrumentation for the cache simulators.
+
+    Keeps per-set hit/miss/eviction counters and samples the cumulative
+    hit/miss totals every sample_interval accesses into preallocated arrays.
+    Optional hooks are called on every hit, miss or eviction. Simulators
+    can register extra series (e.g. a set-dueling policy selector) that are
+    sampled along with the totals. With a region
+    map, every hit, miss and eviction is also attributed to the region of
+    its address; addresses are buffered and resolved in batches.
+
+    A simulator created without instrumentation never touches this class,
+    so disabled instrumentation costs nothing.
+    """
+    def __init__(self, sample_interval=1000, expected_accesses=0, on_hit=None, on_miss=None, on_evict=None,
+                 region_map=None, region_batch=1 << 16):
+        """
+        Initialize the instrumentation.
+
+        Args:
+            sample_interval (int): Take a time-series sample every K accesses
+            expected_accesses (int): Expected trace length, used to preallocate the sample arrays
+            on_hit (callable): Called as on_hit(address, set_index)
+            on_miss (callable): Called as on_miss(address, set_index)
+            on_evict (callable): Called as on_evict(evicted_address, address, set_index)
+            region_map (RegionMap): Named address ranges to attribute events to
+            region_batch (int): Buffered addresses resolved per region lookup
+        """
+        if sample_interval < 1:
+            raise ValueError("sample_interval must be at least 1")
+
+        self.sample_interval = sample_interval
+        self.on_hit = on_hit
+        self.on_miss = on_miss
+        self.on_evict = on_evict
+
+        self.accesses = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._countdown = sample_interval
+
+        capacity = max(64, expected_accesses // sample_interval + 1)
+        self._sample_accesses = np.zeros(capacity, dtype=np.int64)
+        self._sample_hits = np.zeros(capacity, dtype=np.int64)
+        self._sample_misses = np.zeros(capacity, dtype=np.int64)
+        self.num_samples = 0
+        self._series_reads = {}
+        self._series_samples = {}
+
+        self.num_sets = 0
+        self.set_hits = []
+        self.set_misses = []
+        self.set_evictions = []
+
+        # Only instrumentation with a region map pays for the attribution:
+        # the recording methods are replaced on this instance
+        self.region_map = region_map
+        if region_map is not None:
+            self.region_batch = region_batch
+            self._region_hits = array('q')
+            self._region_hit_counts = array('q')
+            self._region_misses = array('q')
+            self._region_evictions = array('q')
+            slots = len(region_map) + 1
+            self.region_hits = np.zeros(slots, dtype=np.int64)
+            self.region_misses = np.zeros(slots, dtype=np.int64)
+            self.region_evictions = np.zeros(slots, dtype=np.int64)
+            self.record_hit = self._record_hit_regions
+            self.record_miss = self._record_miss_regions
+            self.record_hits = self._record_hits_regions
+
+    def attach(self, num_sets):
+        """
+        Size the per-set counters for the simulator being instrumented.
+
+        Args:
+            num_sets (int): Number of sets in the simulator
+        """
+        self.num_sets = num_sets
+        self.set_hits = [0] * num_sets
+        self.set_misses = [0] * num_sets
+        self.set_evictions = [0] * num_sets
+
+    def add_series(self, name, read):
+        """
+        Sample an extra value every sample_interval accesses, alongside the
+        hit/miss totals. Register series before the simulation starts.
+
+        Args:
+            name (str): Key of the series in samples() and to_chart_data()
+            read (callable): Returns the current (integer) value
+        """
+        if name in ('accesses', 'hits', 'misses'):
+            raise ValueError(f"Series name {name} is reserved")
+        self._series_reads[name] = read
+        self._series_samples[name] = np.zeros(len(self._sample_accesses), dtype=np.int64)
+
+    def record_hit(self, set_index, address):
+        """
+        Record a cache hit.
+        """
+        self.accesses += 1
+        self.hits += 1
+        self.set_hits[set_index] += 1
+        if self.on_hit is not None:
+            self.on_hit(address, set_index)
+
+        self._countdown -= 1
+        if not self._countdown:
+            self._sample()
+
+    def record_miss(self, set_index, address, evicted_address=None):
+        """
+        Record a cache miss and, if a valid line was replaced, the eviction.
+        """
+        self.accesses += 1
+        self.misses += 1
+        self.set_misses[set_index] += 1
+        if self.on_miss is not None:
+            self.on_miss(address, set_index)
+
+        if evicted_address is not None:
+            self.evictions += 1
+            self.set_evictions[set_index] += 1
+            if self.on_evict is not None:
+                self.on_evict(evicted_address, address, set_index)
+
+        self._countdown -= 1
+        if not self._countdown:
+            self._sample()
+
+    def record_hits(self, set_index, count, address=None):
+        """
+        Record count consecutive hits to the same set without a per-hit call.
+
+        Hooks are still called once per hit so their view of the stream is
+        unchanged.
+        """
+        if self.on_hit is not None:
+            for _ in range(count):
+                self.on_hit(address, set_index)
+
+        self.set_hits[set_index] += count
+        while count:
+            step = min(count, self._countdown)
+            self.accesses += step
+            self.hits += step
+            self._countdown -= step
+            count -= step
+            if not self._countdown:
+                self._sample()
+
+    def _record_hit_regions(self, set_index, address):
+        self._region_hits.append(address)
+        if len(self._region_hits) >= self.region_batch:
+            self.flush_regions()
+        CacheInstrumentation.record_hit(self, set_index, address)
+
+    def _record_miss_regions(self, set_index, address, evicted_address=None):
+        self._region_misses.append(address)
+        if evicted_address is not None:
+            self._region_evictions.append(evicted_address)
+        if len(self._region_misses) >= self.region_batch:
+            self.flush_regions()
+        CacheInstrumentation.record_miss(self, set_index, address, evicted_address)
+
+    def _record_hits_regions(self, set_index, count, address=None):
+        if address is not None:
+            self._region_hit_counts.append(address)
+            self._region_hit_counts.append(count)
+            if len(self._region_hit_counts) >= 2 * self.region_batch:
+                self.flush_regions()
+        CacheInstrumentation.record_hits(self, set_index, count, address)
+
+    def flush_regions(self):
+        """
+        Resolve the buffered addresses to regions and add them to the per-region counters.
+        """
+        region_map = self.region_map
+        slots = len(self.region_hits)
+        for buffer, counters in ((self._region_hits, self.region_hits),
+                                 (self._region_misses, self.region_misses),
+                                 (self._region_evictions, self.region_evictions)):
+            if buffer:
+                counters += np.bincount(region_map.lookup(np.frombuffer(buffer, dtype=np.int64)), minlength=slots)
+                del buffer[:]
+        if self._region_hit_counts:
+            runs = np.array(self._region_hit_counts, dtype=np.int64).reshape(-1, 2)
+            self.region_hits += np.bincount(region_map.lookup(runs[:, 0]), weights=runs[:, 1],
+                                            minlength=slots).astype(np.int64)
+            del self._region_hit_counts[:]
+
+    def region_table(self):
+        """
+        Per-region miss table, most misses first.
+
+        Addresses outside every region are reported under '(unmapped)' if
+        there are any.
+
+        Returns:
+            list: One dict per region with its name, bounds, accesses, hits,
+                  misses, miss rate, share of all misses (percent) and the
+                  evictions of its blocks
+        """
+        if self.region_map is None:
+            raise ValueError("Instrumentation has no region map")
+        self.flush_regions()
+
+        bounds = [(start, end) for _, start, end in self.region_map] + [(None, None)]
+        total_misses = int(self.region_misses.sum())
+        rows = []
+        for index, name in enumerate(self.region_map.labels()):
+            hits, misses = int(self.region_hits[index]), int(self.region_misses[index])
+            evictions = int(self.region_evictions[index])
+            accesses = hits + misses
+            if index == len(self.region_map) and not (accesses or evictions):
+                continue
+            start, end = bounds[index]
+            rows.append({
+                'region': name,
+                'start': hex(start) if start is not None else None,
+                'end': hex(end) if end is not None else None,
+                'accesses': accesses,
+                'hits': hits,
+                'misses': misses,
+                'miss_rate': misses / accesses * 100.0 if accesses else 0.0,
+                'miss_share': misses / total_misses * 100.0 if total_misses else 0.0,
+                'evictions': evictions,
+            })
+        rows.sort(key=lambda row: -row['misses'])
+        return rows
+
+    def _sample(self):
+        if self.num_samples == len(self._sample_accesses):
+            # Grow geometrically if the trace is longer than expected
+            new_capacity = 2 * len(self._sample_accesses)
+            self._sample_accesses = np.resize(self._sample_accesses, new_capacity)
+            self._sample_hits = np.resize(self._sample_hits, new_capacity)
+            self._sample_misses = np.resize(self._sample_misses, new_capacity)
+            for name, values in self._series_samples.items():
+                self._series_samples[name] = np.resize(values, new_capacity)
+
+        i = self.num_samples
+        self._sample_accesses[i] = self.accesses
+        self._sample_hits[i] = self.hits
+        self._sample_misses[i] = self.misses
+        for name, read in self._series_reads.items():
+            self._series_samples[name][i] = read()
+        self.num_samples += 1
+        self._countdown = self.sample_interval
+
+    def samples(self, include_partial=True):
+        """
+        Return the sampled time series.
+
+        Args:
+            include_partial (bool): Append the current totals if the last window is incomplete
+
+        Returns:
+            dict: 'accesses', 'hits' and 'misses' arrays of cumulative counts,
+                  plus one array per series added with add_series
+        """
+        series = {
+            'accesses': self._sample_accesses[:self.num_samples],
+            'hits': self._sample_hits[:self.num_samples],
+            'misses': self._sample_misses[:self.num_samples],
+        }
+        for name, values in self._series_samples.items():
+            series[name] = values[:self.num_samples]
+
+        accesses = series['accesses']
+        if include_partial and self.accesses > (accesses[-1] if len(accesses) else 0):
+            current = {'accesses': self.accesses, 'hits': self.hits, 'misses': self.misses}
+            for name, read in self._series_reads.items():
+                current[name] = read()
+            series = {name: np.append(values, current[name]) for name, values in series.items()}
+
+        return series
+
+    def window_hit_rates(self, window=None):
+        """
+        Hit rate over a rolling window ending at each sample.
+
+        Args:
+            window (int): Window length in accesses, a multiple of sample_interval
+                          (defaults to sample_interval)
+
+        Returns:
+            tuple: (accesses, hit_rates) arrays; hit rates are percentages
+        """
+        window = window or self.sample_interval
+        if window % self.sample_interval:
+            raise ValueError("window must be a multiple of sample_interval")
+        lag = window // self.sample_interval
+
+        series = self.samples(include_partial=False)
+        accesses = np.concatenate(([0], series['accesses']))
+        hits = np.concatenate(([0], series['hits']))
+
+        start = np.maximum(np.arange(1, len(accesses)) - lag, 0)
+        window_accesses = accesses[1:] - accesses[start]
+        window_hits = hits[1:] - hits[start]
+        return series['accesses'], 100.0 * window_hits / np.maximum(window_accesses, 1)
+
+    def per_set_counters(self):
+        """
+        Return the per-set counters as NumPy arrays.
+
+        Returns:
+            dict: 'hits', 'misses' and 'evictions' arrays indexed by set
+        """
+        return {
+            'hits': np.array(self.set_hits, dtype=np.int64),
+            'misses': np.array(self.set_misses, dtype=np.int64),
+            'evictions': np.array(self.set_evictions, dtype=np.int64),
+        }
+
+    def to_chart_data(self):
+        """
+        Return the time series in the format expected by generate_chart.
+
+        Returns:
+            dict: 'accesses', 'hits' and 'misses' lists, plus the added series
+        """
+        series = self.samples()
+        return {key: values.tolist() for key, values in series.items()}
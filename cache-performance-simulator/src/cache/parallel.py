@@ -0,0 +1,127 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .cache_simulator import CacheSimulator
+
+
+def partition_by_set(addresses, num_sets, block_size, num_partitions):
+    """
+    Reorder a trace by set index and split the sets into balanced partitions.
+
+    The sort is stable, so each set still sees its accesses in trace order.
+    Because sets never interact, simulating the reordered trace gives the
+    same per-set results as the original order.
+
+    Args:
+        addresses (np.ndarray): Memory addresses in trace order
+        num_sets (int): Number of cache sets
+        block_size (int): Block size in bytes
+        num_partitions (int): Number of partitions to create
+
+    Returns:
+        tuple: (sorted_addresses, partitions) where partitions is a list of
+               (first_set, last_set_exclusive, start, end) ranges into sorted_addresses
+    """
+    set_index = (addresses // block_size) % num_sets
+    order = np.argsort(set_index, kind='stable')
+    sorted_addresses = addresses[order]
+
+    set_counts = np.bincount(set_index, minlength=num_sets)
+    set_offsets = np.concatenate(([0], np.cumsum(set_counts)))
+
+    # Cut the sets where the running access count crosses each 1/num_partitions share
+    targets = np.arange(1, num_partitions) * (len(addresses) / num_partitions)
+    cuts = np.searchsorted(set_offsets[1:], targets, side='left') + 1
+    set_bounds = np.unique(np.concatenate(([0], np.minimum(cuts, num_sets), [num_sets])))
+
+    partitions = []
+    for first_set, last_set in zip(set_bounds[:-1].tolist(), set_bounds[1:].tolist()):
+        partitions.append((first_set, last_set, int(set_offsets[first_set]), int(set_offsets[last_set])))
+    return sorted_addresses, partitions
+
+
+def _simulate_partition(addresses, first_set, last_set, cache_size, block_size):
+    cache = CacheSimulator(cache_size=cache_size, block_size=block_size)
+    for address in addresses.tolist():
+        cache.access_memory(address)
+
+    return {
+        'first_set': first_set,
+        'last_set': last_set,
+        'total_accesses': cache.total_accesses,
+        'hits': cache.hits,
+        'misses': cache.misses,
+        'tags': cache.tags[first_set:last_set],
+        'valid_bits': cache.valid_bits[first_set:last_set],
+    }
+
+
+def _simulate_shared_partition(shm_name, length, dtype, partition, cache_size, block_size):
+    """
+    Worker entry point: attach to the shared trace and simulate one partition.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        addresses = np.ndarray((length,), dtype=dtype, buffer=shm.buf)
+        first_set, last_set, start, end = partition
+        result = _simulate_partition(addresses[start:end], first_set, last_set, cache_size, block_size)
+        # The view must be released before the shared block can be closed
+        del addresses
+        return result
+    finally:
+        shm.close()
+
+
+def simulate_partitioned(addresses, cache_size=16, block_size=4, workers=None):
+    """
+    Simulate a trace on several cores by partitioning it on set index.
+
+    The results are exactly those of feeding the trace through a single
+    CacheSimulator: the returned simulator has the same counters and the
+    same final tags and valid bits.
+
+    Args:
+        addresses (list or np.ndarray): Memory addresses in trace order
+        cache_size (int): Number of cache lines
+        block_size (int): Size of each block in bytes
+        workers (int): Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        CacheSimulator: A simulator holding the merged counters and final state
+    """
+    addresses = np.ascontiguousarray(addresses, dtype=np.int64)
+    workers = max(1, min(workers or os.cpu_count() or 1, cache_size))
+
+    merged = CacheSimulator(cache_size=cache_size, block_size=block_size)
+
+    if workers == 1:
+        # Nothing to scatter: skip the partitioning pre-pass
+        results = [_simulate_partition(addresses, 0, merged.num_sets, cache_size, block_size)]
+    else:
+        sorted_addresses, partitions = partition_by_set(addresses, merged.num_sets, block_size, workers)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(sorted_addresses.nbytes, 1))
+        try:
+            shared = np.ndarray(sorted_addresses.shape, dtype=sorted_addresses.dtype, buffer=shm.buf)
+            shared[:] = sorted_addresses
+            del shared
+            with ProcessPoolExecutor(max_workers=len(partitions)) as pool:
+                futures = [pool.submit(_simulate_shared_partition, shm.name, len(sorted_addresses),
+                                       sorted_addresses.dtype, partition, cache_size, block_size)
+                           for partition in partitions]
+                results = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    for result in results:
+        merged.total_accesses += result['total_accesses']
+        merged.hits += result['hits']
+        merged.misses += result['misses']
+        merged.tags[result['first_set']:result['last_set']] = result['tags']
+        merged.valid_bits[result['first_set']:result['last_set']] = result['valid_bits']
+
+    return merged
@@ -0,0 +1,421 @@
+"""
+Columnar results of many simulation runs.
+
+A ResultsTable is a NumPy structured array with one row per simulated
+configuration (geometry columns such as cache_size and block_size plus
+the statistics), so ranking, filtering, Pareto fronts and run-to-run
+diffs are vectorized over all rows. A RunStore appends rows to a CSV or
+JSON-lines file as they are produced, one line per row, and loads the
+whole file back as a ResultsTable.
+"""
+import csv
+import io
+import json
+import os
+
+import numpy as np
+
+
+def _column_dtype(values):
+    """
+    Smallest common NumPy type of a column of Python values (None for missing).
+    """
+    present = [value for value in values if value is not None and value != '']
+    if not present:
+        return np.dtype(np.float64)
+    if all(isinstance(value, (bool, np.bool_)) for value in present):
+        return np.dtype(bool)
+    numbers = [value for value in present if isinstance(value, (int, float, np.integer, np.floating))]
+    if len(numbers) == len(present):
+        if len(present) == len(values) and all(isinstance(value, (int, np.integer)) for value in present):
+            return np.dtype(np.int64)
+        return np.dtype(np.float64)
+    return np.dtype(f"U{max(len(str(value)) for value in present)}")
+
+
+def _parse_dtype(text):
+    """
+    Column type of a CSV field written by RunStore.
+    """
+    for kind, parse in ((np.int64, int), (np.float64, float)):
+        try:
+            parse(text)
+            return np.dtype(kind)
+        except ValueError:
+            pass
+    return None
+
+
+class ResultsTable:
+    """
+    One row per run configuration, stored as a NumPy structured array.
+    """
+    def __init__(self, data):
+        """
+        Initialize the table.
+
+        Args:
+            data (np.ndarray): Structured array with one field per column
+        """
+        self.data = data
+
+    @classmethod
+    def from_rows(cls, rows, columns=None):
+        """
+        Build a table from result dictionaries (e.g. the runs of a sweep).
+
+        Args:
+            rows (list): Dicts of column name to value; missing values become NaN or ''
+            columns (list): Column order (default: order of first appearance)
+
+        Returns:
+            ResultsTable: The table
+        """
+        if columns is None:
+            columns = list(dict.fromkeys(name for row in rows for name in row))
+        arrays = []
+        for name in columns:
+            values = [row.get(name) for row in rows]
+            array = np.array(values)
+            if array.dtype.kind not in 'biufU' or len(array) == 0:
+                # Missing values or mixed types
+                dtype = _column_dtype(values)
+                missing = np.nan if dtype.kind == 'f' else ('' if dtype.kind == 'U' else 0)
+                array = np.array([missing if value is None or value == '' else value for value in values], dtype=dtype)
+            elif array.dtype.kind in 'iu':
+                array = array.astype(np.int64)
+            arrays.append(array)
+
+        data = np.empty(len(rows), dtype=[(name, array.dtype) for name, array in zip(columns, arrays)])
+        for name, array in zip(columns, arrays):
+            data[name] = array
+        return cls(data)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load a CSV or JSON-lines (.jsonl) results file.
+
+        CSV is the faster format to load: its numeric columns are parsed by
+        NumPy in one pass.
+
+        Returns:
+            ResultsTable: The table, or None if the file does not exist
+        """
+        if not os.path.exists(file_path):
+            print(f"Error: The file {file_path} was not found.")
+            return None
+        if file_path.endswith('.jsonl'):
+            with open(file_path, 'r') as file:
+                lines = [line for line in file.read().split('\n') if line.strip()]
+            # One json.loads call for the whole file instead of one per line
+            return cls.from_rows(json.loads('[' + ','.join(lines) + ']'))
+        return cls._load_csv(file_path)
+
+    @classmethod
+    def _load_csv(cls, file_path):
+        with open(file_path, 'r', newline='') as file:
+            reader = csv.reader(file)
+            columns = next(reader, None)
+            first = next(reader, None)
+        if columns is None:
+            return cls(np.empty(0, dtype=[]))
+        if first is None:
+            return cls(np.empty(0, dtype=[(name, np.float64) for name in columns]))
+        if '' in first:
+            # The first row predates a column added later: its type cannot be read from it
+            return cls._load_csv_rows(file_path, columns)
+
+        # Numeric columns are parsed in one vectorized pass; text columns in another
+        kinds = [_parse_dtype(value) for value in first]
+        numeric = [index for index, kind in enumerate(kinds) if kind is not None]
+        text = [index for index, kind in enumerate(kinds) if kind is None]
+        try:
+            values = np.loadtxt(file_path, delimiter=',', skiprows=1, ndmin=1, usecols=numeric,
+                                dtype=[(columns[index], kinds[index]) for index in numeric]) if numeric else None
+            strings = np.loadtxt(file_path, delimiter=',', skiprows=1, ndmin=2, usecols=text, dtype=str) \
+                if text else None
+        except ValueError:
+            # Missing values or quoted fields: parse row by row
+            return cls._load_csv_rows(file_path, columns)
+
+        length = len(values) if values is not None else len(strings)
+        dtype = []
+        for index, name in enumerate(columns):
+            if index in numeric:
+                dtype.append((name, kinds[index]))
+            else:
+                dtype.append((name, strings[:, text.index(index)].dtype))
+        data = np.empty(length, dtype=dtype)
+        for index in numeric:
+            data[columns[index]] = values[columns[index]]
+        for position, index in enumerate(text):
+            data[columns[index]] = strings[:, position]
+        return cls(data)
+
+    @classmethod
+    def _load_csv_rows(cls, file_path, columns):
+        with open(file_path, 'r', newline='') as file:
+            rows = list(csv.DictReader(file))
+        return cls.from_rows([{name: _convert(value) for name, value in row.items()} for row in rows], columns)
+
+    def save(self, file_path):
+        """
+        Write the whole table as CSV or JSON lines (.jsonl).
+        """
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        RunStore(file_path).extend(self.rows())
+
+    @property
+    def columns(self):
+        return list(self.data.dtype.names or ())
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, column):
+        return self.data[column]
+
+    def rows(self):
+        """
+        The rows as a list of dicts of Python values (for JSON output).
+        """
+        columns = self.columns
+        return [dict(zip(columns, values)) for values in self.data.tolist()]
+
+    def select(self, mask):
+        """
+        Rows where mask (a boolean array or index array) selects them.
+        """
+        return ResultsTable(self.data[mask])
+
+    def where(self, **equals):
+        """
+        Rows whose columns equal the given values, e.g. where(block_size=64, run='baseline').
+        """
+        mask = np.ones(len(self.data), dtype=bool)
+        for name, value in equals.items():
+            mask &= self.data[name] == value
+        return self.select(mask)
+
+    def rank(self, by='miss_rate', descending=False, top=None):
+        """
+        Rows sorted by a column (ties keep their order).
+
+        Args:
+            by (str): Column to sort by
+            descending (bool): Largest first
+            top (int): Keep only the first top rows
+
+        Returns:
+            ResultsTable: The sorted rows
+        """
+        values = self.data[by]
+        order = np.argsort(-values if descending else values, kind='stable')
+        return self.select(order[:top] if top else order)
+
+    def pareto_front(self, cost='cache_bytes', metric='miss_rate'):
+        """
+        Rows no other row beats on both cost and metric (both lower is better).
+
+        Args:
+            cost (str): Cost column, e.g. cache_bytes or capacity
+            metric (str): Metric column, e.g. miss_rate
+
+        Returns:
+            ResultsTable: The front, by increasing cost
+        """
+        if len(self.data) == 0:
+            return self
+        costs = self.data[cost]
+        values = self.data[metric]
+        order = np.lexsort((values, costs))
+        ordered = values[order]
+        # A row is on the front if it beats every cheaper (or equally cheap, earlier) row
+        best_before = np.concatenate(([np.inf], np.minimum.accumulate(ordered)[:-1]))
+        return self.select(order[ordered < best_before])
+
+    def diff(self, other, keys=('cache_size', 'block_size'), metrics=('hit_rate', 'miss_rate')):
+        """
+        Join two runs on their configuration columns and compare metrics.
+
+        Args:
+            other (ResultsTable): The run to compare against (the "after" run)
+            keys (tuple): Columns identifying a configuration
+            metrics (tuple): Columns to compare
+
+        Returns:
+            dict: 'table', a ResultsTable with the key columns and for each
+                  metric its value in both runs and the change (other - self),
+                  plus the number of configurations only in self or only in
+                  other. A configuration repeated within a run is compared by
+                  its last row.
+        """
+        keys = [key for key in keys if key in self.columns and key in other.columns]
+        left = self._key_ids(self.data, other.data, keys)
+        right = left[len(self.data):]
+        left = left[:len(self.data)]
+
+        # Last occurrence wins when a configuration repeats within a run, on both sides
+        slots = int(max(left.max(initial=-1), right.max(initial=-1))) + 1
+        last_left = np.full(slots, -1, dtype=np.int64)
+        last_left[left] = np.arange(len(left))
+        unique_left = np.flatnonzero(last_left[left] == np.arange(len(left)))
+        data = self.data[unique_left]
+        left = left[unique_left]
+
+        positions = np.full(slots, -1, dtype=np.int64)
+        positions[right] = np.arange(len(right))
+        matched = positions[left]
+        in_both = matched >= 0
+
+        dtype = [(key, data.dtype[key]) for key in keys]
+        for metric in metrics:
+            dtype += [(f"{metric}_a", np.float64), (f"{metric}_b", np.float64), (f"{metric}_change", np.float64)]
+        table = np.empty(int(in_both.sum()), dtype=dtype)
+        for key in keys:
+            table[key] = data[key][in_both]
+        for metric in metrics:
+            before = data[metric][in_both].astype(np.float64)
+            after = other.data[metric][matched[in_both]].astype(np.float64)
+            table[f"{metric}_a"] = before
+            table[f"{metric}_b"] = after
+            table[f"{metric}_change"] = after - before
+
+        # Count configurations, not rows: a repeated configuration only in other counts once
+        only_right = np.ones(slots, dtype=bool)
+        only_right[left] = False
+        return {
+            'table': ResultsTable(table),
+            'only_a': int((~in_both).sum()),
+            'only_b': int(only_right[np.unique(right)].sum()),
+        }
+
+    @staticmethod
+    def _key_ids(left, right, keys):
+        """
+        Dense id of each row's key-column combination, over both tables.
+        """
+        ids = np.zeros(len(left) + len(right), dtype=np.int64)
+        for key in keys:
+            values, inverse = np.unique(np.concatenate((left[key], right[key])), return_inverse=True)
+            _, ids = np.unique(ids * len(values) + inverse.ravel(), return_inverse=True)
+            ids = ids.ravel()
+        return ids
+
+    def format(self, columns=None, top=None):
+        """
+        Format rows as an aligned text table.
+        """
+        columns = columns or self.columns
+        data = self.data[:top] if top else self.data
+        cells = [[f"{value:.2f}" if isinstance(value, float) else str(value) for value in row]
+                 for row in data[columns].tolist()]
+        widths = [max([len(name)] + [len(row[index]) for row in cells]) for index, name in enumerate(columns)]
+        lines = ["  ".join(name.rjust(width) for name, width in zip(columns, widths))]
+        lines += ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in cells]
+        return "\n".join(lines)
+
+
+def _convert(text):
+    if text is None or text == '':
+        return None
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _plain(value):
+    """
+    Python value of a NumPy scalar, so json and repr write it as a number.
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class RunStore:
+    """
+    Append-only results file in CSV or JSON-lines (.jsonl) format.
+
+    Rows are written and flushed one at a time, so a long sweep can be
+    followed (or loaded) while it runs. A CSV store takes its columns from
+    the header of the existing file, or from the first rows appended; when
+    rows with new columns arrive the header is widened and earlier rows are
+    left blank (missing) in them, so sweeps of different kinds can share
+    one store.
+    """
+    def __init__(self, file_path):
+        """
+        Args:
+            file_path (str): Store file; .jsonl for JSON lines, anything else for CSV
+        """
+        self.file_path = file_path
+        self.jsonl = file_path.endswith('.jsonl')
+        self.columns = None
+        if not self.jsonl and os.path.exists(file_path):
+            with open(file_path, 'r', newline='') as file:
+                self.columns = next(csv.reader(file), None)
+
+    def append(self, row):
+        """
+        Append one result row (a dict of column name to value).
+        """
+        self.extend([row])
+
+    def extend(self, rows):
+        """
+        Append several result rows.
+        """
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        rows = [{name: _plain(value) for name, value in row.items()} for row in rows]
+        if self.jsonl:
+            with open(self.file_path, 'a') as file:
+                for row in rows:
+                    file.write(json.dumps(row) + "\n")
+            return
+
+        known = set(self.columns or ())
+        added = list(dict.fromkeys(name for row in rows for name in row if name not in known))
+        if self.columns is not None and added:
+            self._widen(added)
+
+        with open(self.file_path, 'a', newline='') as file:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            if self.columns is None:
+                self.columns = added
+                writer.writerow(self.columns)
+            for row in rows:
+                writer.writerow([repr(float(value)) if isinstance(value, float) else ('' if value is None else value)
+                                 for value in (row.get(name) for name in self.columns)])
+            file.write(buffer.getvalue())
+
+    def _widen(self, added):
+        """
+        Add columns to the CSV header, leaving them blank in the rows already written.
+        """
+        with open(self.file_path, 'r', newline='') as file:
+            rows = list(csv.reader(file))[1:]
+        self.columns = self.columns + added
+        padding = [''] * len(added)
+        temporary = self.file_path + '.tmp'
+        with open(temporary, 'w', newline='') as file:
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(self.columns)
+            writer.writerows(row + padding for row in rows)
+        os.replace(temporary, self.file_path)
+
+    def load(self):
+        """
+        Load the whole store.
+
+        Returns:
+            ResultsTable: All rows appended so far, or None if nothing was written yet
+        """
+        return ResultsTable.load(self.file_path)
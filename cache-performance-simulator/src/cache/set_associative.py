@@ -0,0 +1,346 @@
+"""
+Set-associative cache with adaptive insertion policies.
+
+Besides LRU, the simulator implements the insertion policies designed for
+workloads that thrash LRU (working sets larger than the cache, scans):
+
+    lru     insert at the MRU position
+    lip     LRU insertion: insert at the LRU position, promote on a hit
+    bip     bimodal insertion: LIP, but insert at MRU with probability 1/32
+    dip     dynamic insertion: LRU or BIP, chosen by set dueling
+    srrip   static re-reference interval prediction: insert with a long
+            re-reference interval (RRPV max - 1), evict the first line
+            with a distant one (RRPV max), aging the set when there is none
+    brrip   bimodal RRIP: insert distant (RRPV max), long with probability 1/32
+    drrip   dynamic RRIP: SRRIP or BRRIP, chosen by set dueling
+
+Set dueling dedicates a few leader sets to each of the two policies; a
+miss in a leader set moves a saturating policy selector (PSEL) towards the
+other policy, and every other (follower) set inserts with the policy
+whose leaders currently miss less.
+"""
+import random
+
+from .cache_simulator import CacheStatsMixin
+
+POLICIES = ('lru', 'lip', 'bip', 'dip', 'srrip', 'brrip', 'drrip')
+
+# The two policies each dueling policy chooses between
+DUELING_POLICIES = {'dip': ('lru', 'bip'), 'drrip': ('srrip', 'brrip')}
+
+RRIP_POLICIES = ('srrip', 'brrip', 'drrip')
+
+FOLLOWER, LEADER_A, LEADER_B = 0, 1, 2
+
+# Tag of a way that has never been filled
+INVALID = -1
+
+
+class SetAssociativeCache(CacheStatsMixin):
+    """
+    A set-associative cache simulator with a choice of replacement policy.
+
+    Each set of the LRU-family policies (lru, lip, bip, dip) is a list of
+    its tags in recency order, most recently used first. The RRIP policies
+    keep each set's tags in fixed ways, with the re-reference prediction
+    value (RRPV) of every line in one flat bytearray, associativity bytes
+    per set.
+    """
+    def __init__(self, cache_size=16, block_size=4, associativity=4, policy='lru', instrumentation=None,
+                 bimodal_throttle=1 / 32, rrpv_bits=2, leader_sets=32, psel_bits=10, seed=0):
+        """
+        Initialize the cache simulator.
+
+        Args:
+            cache_size (int): Number of cache lines
+            block_size (int): Size of each block in bytes
+            associativity (int): Lines per set (cache_size for a fully associative cache)
+            policy (str): One of POLICIES
+            instrumentation (CacheInstrumentation): Optional per-set counters,
+                time-series sampling and event hooks
+            bimodal_throttle (float): Probability that BIP/BRRIP insert like LRU/SRRIP
+            rrpv_bits (int): Bits per RRPV counter (RRIP policies)
+            leader_sets (int): Leader sets per policy (DIP/DRRIP)
+            psel_bits (int): Width of the saturating policy selector (DIP/DRRIP)
+            seed (int): Seed for the bimodal insertion choices
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        if associativity < 1 or cache_size % associativity:
+            raise ValueError("cache_size must be a multiple of associativity")
+        if not 1 <= rrpv_bits <= 8:
+            raise ValueError("rrpv_bits must be between 1 and 8")
+
+        self.cache_size = cache_size
+        self.block_size = block_size
+        self.associativity = associativity
+        self.num_sets = cache_size // associativity
+        self.policy = policy
+
+        self.total_accesses = 0
+        self.hits = 0
+        self.misses = 0
+
+        self.bimodal_throttle = bimodal_throttle
+        self._random = random.Random(seed).random
+
+        if policy in RRIP_POLICIES:
+            self.sets = [[INVALID] * associativity for _ in range(self.num_sets)]
+            self.rrpv_max = (1 << rrpv_bits) - 1
+            self.rrpv = bytearray([self.rrpv_max]) * cache_size
+            # Aging a set adds the same amount to each of its RRPVs: one
+            # translate call with a precomputed table per amount
+            self._aging = [bytes(min(value + amount, 255) for value in range(256))
+                           for amount in range(self.rrpv_max + 1)]
+            self._aging_order = range(self.rrpv_max - 1, -1, -1)
+            self.access_memory = self._access_memory_rrip
+            self._insert_rrpv = {'srrip': self._insert_rrpv_long, 'brrip': self._insert_rrpv_bimodal,
+                                 'drrip': self._insert_rrpv_dueling}[policy]
+        else:
+            self.sets = [[] for _ in range(self.num_sets)]
+            self._insert_mru = {'lru': self._insert_mru_always, 'lip': self._insert_mru_never,
+                                'bip': self._insert_mru_bimodal, 'dip': self._insert_mru_dueling}[policy]
+
+        self.dueling = DUELING_POLICIES.get(policy)
+        if self.dueling is not None:
+            self._setup_dueling(leader_sets, psel_bits)
+
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self.num_sets)
+            if self.dueling is not None:
+                # The selector and the policy the followers use, sampled with the hit/miss totals
+                instrumentation.add_series('psel', lambda: self.psel)
+                instrumentation.add_series('duel_winner', lambda: int(self.psel > self.psel_mid))
+
+    def _setup_dueling(self, leader_sets, psel_bits):
+        """
+        Pick the leader sets of both policies and reset the selector.
+
+        The sets are split into leader_sets equal constituencies with one
+        leader of each policy in each, at an offset that changes from one
+        constituency to the next so leaders do not line up with strided
+        access patterns.
+        """
+        if self.num_sets < 2:
+            raise ValueError(f"{self.policy} needs at least two sets for set dueling")
+        leaders = max(1, min(leader_sets, self.num_sets // 2))
+        span = self.num_sets // leaders
+
+        self.set_roles = bytearray(self.num_sets)
+        for constituency in range(leaders):
+            base = constituency * span
+            self.set_roles[base + constituency % span] = LEADER_A
+            self.set_roles[base + (constituency + span // 2) % span] = LEADER_B
+        self.leader_sets = leaders
+
+        self.psel_max = (1 << psel_bits) - 1
+        self.psel_mid = self.psel_max // 2
+        self.psel = self.psel_mid
+        self.leader_misses = [0, 0]
+
+    def _duel(self, index):
+        """
+        On a miss in set index, train the selector if it is a leader set and
+        return True if the fill uses the second dueling policy.
+        """
+        role = self.set_roles[index]
+        if role == LEADER_A:
+            self.leader_misses[0] += 1
+            if self.psel < self.psel_max:
+                self.psel += 1
+            return False
+        if role == LEADER_B:
+            self.leader_misses[1] += 1
+            if self.psel > 0:
+                self.psel -= 1
+            return True
+        return self.psel > self.psel_mid
+
+    def _insert_mru_always(self, index):
+        return True
+
+    def _insert_mru_never(self, index):
+        return False
+
+    def _insert_mru_bimodal(self, index):
+        return self._random() < self.bimodal_throttle
+
+    def _insert_mru_dueling(self, index):
+        return self._insert_mru_bimodal(index) if self._duel(index) else True
+
+    def _insert_rrpv_long(self, index):
+        return self.rrpv_max - 1
+
+    def _insert_rrpv_bimodal(self, index):
+        return self.rrpv_max - 1 if self._random() < self.bimodal_throttle else self.rrpv_max
+
+    def _insert_rrpv_dueling(self, index):
+        return self._insert_rrpv_bimodal(index) if self._duel(index) else self.rrpv_max - 1
+
+    def access_memory(self, address):
+        """
+        Simulate a memory access at the given address (LRU-family policies).
+
+        Args:
+            address (int): Memory address to access
+
+        Returns:
+            bool: True for hit, False for miss
+        """
+        self.total_accesses += 1
+
+        num_sets = self.num_sets
+        block = address // self.block_size
+        index = block % num_sets
+        tag = block // num_sets
+        ways = self.sets[index]
+
+        if tag in ways:
+            self.hits += 1
+            if ways[0] != tag:
+                ways.remove(tag)
+                ways.insert(0, tag)
+            if self.instrumentation is not None:
+                self.instrumentation.record_hit(index, address)
+            return True
+
+        self.misses += 1
+        evicted = ways.pop() if len(ways) == self.associativity else INVALID
+        if self._insert_mru(index):
+            ways.insert(0, tag)
+        else:
+            ways.append(tag)
+        if self.instrumentation is not None:
+            self.instrumentation.record_miss(index, address, (evicted * num_sets + index) * self.block_size
+                                             if evicted != INVALID else None)
+        return False
+
+    def _access_memory_rrip(self, address):
+        """
+        access_memory for the RRIP policies.
+        """
+        self.total_accesses += 1
+
+        num_sets = self.num_sets
+        block = address // self.block_size
+        index = block % num_sets
+        tag = block // num_sets
+        ways = self.sets[index]
+        rrpv = self.rrpv
+        base = index * self.associativity
+
+        if tag in ways:
+            self.hits += 1
+            rrpv[base + ways.index(tag)] = 0
+            if self.instrumentation is not None:
+                self.instrumentation.record_hit(index, address)
+            return True
+
+        self.misses += 1
+        end = base + self.associativity
+        line = rrpv.find(self.rrpv_max, base, end)
+        if line < 0:
+            # Age the whole set until its oldest (first oldest) line is predicted distant
+            for oldest in self._aging_order:
+                line = rrpv.find(oldest, base, end)
+                if line >= 0:
+                    break
+            rrpv[base:end] = rrpv[base:end].translate(self._aging[self.rrpv_max - oldest])
+        evicted = ways[line - base]
+        ways[line - base] = tag
+        rrpv[line] = self._insert_rrpv(index)
+        if self.instrumentation is not None:
+            self.instrumentation.record_miss(index, address, (evicted * num_sets + index) * self.block_size
+                                             if evicted != INVALID else None)
+        return False
+
+    def access_block_run(self, block, count=1):
+        """
+        Simulate count consecutive accesses to the same block.
+
+        Only the first access can miss. A miss does not always leave the
+        line MRU or at RRPV 0: LIP, BIP and BRRIP may insert it at the LRU
+        position or with a long or distant RRPV. The second access promotes
+        it like any hit, and the hits after that do not change the
+        replacement state.
+
+        Args:
+            block (int): Block address (address // block_size)
+            count (int): Number of consecutive accesses to the block
+
+        Returns:
+            bool: True if the first access was a hit
+        """
+        address = block * self.block_size
+        hit = self.access_memory(address)
+
+        repeats = count - 1
+        if repeats > 0:
+            if self.policy in RRIP_POLICIES:
+                index = block % self.num_sets
+                self.rrpv[index * self.associativity + self.sets[index].index(block // self.num_sets)] = 0
+            else:
+                ways = self.sets[block % self.num_sets]
+                tag = block // self.num_sets
+                if ways[0] != tag:
+                    ways.remove(tag)
+                    ways.insert(0, tag)
+            self.total_accesses += repeats
+            self.hits += repeats
+            if self.instrumentation is not None:
+                self.instrumentation.record_hits(block % self.num_sets, repeats, address)
+        return hit
+
+    def simulate_block_stream(self, stream):
+        """
+        Simulate a run-length-collapsed block stream (see memory.block_stream).
+
+        Args:
+            stream (BlockStream): Stream built with this simulator's block size
+
+        Raises:
+            ValueError: If the block sizes differ, or a region map has bounds
+                        inside a block (a run does not keep its addresses)
+        """
+        if stream.block_size != self.block_size:
+            raise ValueError(f"Stream block size {stream.block_size} does not match cache block size {self.block_size}")
+        if self.instrumentation is not None and self.instrumentation.region_map is not None:
+            self.instrumentation.region_map.check_aligned(self.block_size)
+
+        access_block_run = self.access_block_run
+        for block, count in zip(stream.blocks.tolist(), stream.counts.tolist()):
+            access_block_run(block, count)
+
+    def dueling_stats(self):
+        """
+        State of the set-dueling monitor.
+
+        Returns:
+            dict: The two policies, leader sets per policy, leader misses
+                  per policy, the selector value and range, and the policy
+                  the follower sets currently use; None if the policy does
+                  not duel
+        """
+        if self.dueling is None:
+            return None
+        return {
+            'policies': list(self.dueling),
+            'leader_sets': self.leader_sets,
+            'leader_misses': dict(zip(self.dueling, self.leader_misses)),
+            'psel': self.psel,
+            'psel_max': self.psel_max,
+            'winner': self.dueling[int(self.psel > self.psel_mid)],
+        }
+
+    def print_stats(self):
+        """
+        Print cache statistics.
+        """
+        super().print_stats()
+        print(f"Policy: {self.policy.upper()}, {self.associativity}-way, {self.num_sets} sets")
+        if self.dueling is not None:
+            stats = self.dueling_stats()
+            misses = ", ".join(f"{name.upper()} {count}" for name, count in stats['leader_misses'].items())
+            print(f"Set dueling: followers use {stats['winner'].upper()} (PSEL {stats['psel']}/{stats['psel_max']}; "
+                  f"leader misses: {misses})")
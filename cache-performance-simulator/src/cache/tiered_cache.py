@@ -0,0 +1,249 @@
+import heapq
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+# Resources fetched as part of the page that requested them
+STATIC_EXTENSIONS = ('.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico',
+                     '.woff', '.woff2', '.ttf', '.mp4', '.json')
+
+TIERS = ('memory', 'disk', 'network')
+
+
+class LatencyModel:
+    """
+    Time to serve an object from each tier.
+
+    Memory and disk hits cost a fixed latency plus size over bandwidth;
+    a network fetch costs a round trip plus size over the link bandwidth.
+    """
+    def __init__(self, memory_hit_ms=0.05, memory_mb_per_s=5000.0, disk_hit_ms=4.0, disk_mb_per_s=200.0,
+                 network_rtt_ms=60.0, network_mbit_per_s=20.0):
+        """
+        Args:
+            memory_hit_ms (float): Fixed cost of a memory-cache hit
+            memory_mb_per_s (float): Memory-cache read bandwidth in MB/s
+            disk_hit_ms (float): Fixed cost of a disk-cache hit (open and seek)
+            disk_mb_per_s (float): Disk read bandwidth in MB/s
+            network_rtt_ms (float): Round trip of a network fetch
+            network_mbit_per_s (float): Network bandwidth in Mbit/s
+        """
+        self.memory_hit_ms = memory_hit_ms
+        self.memory_mb_per_s = memory_mb_per_s
+        self.disk_hit_ms = disk_hit_ms
+        self.disk_mb_per_s = disk_mb_per_s
+        self.network_rtt_ms = network_rtt_ms
+        self.network_mbit_per_s = network_mbit_per_s
+
+    def latency(self, tier, size):
+        """
+        Milliseconds to serve size bytes from tier ('memory', 'disk' or 'network').
+        """
+        if tier == 'memory':
+            return self.memory_hit_ms + size / (self.memory_mb_per_s * 1e3)
+        if tier == 'disk':
+            return self.disk_hit_ms + size / (self.disk_mb_per_s * 1e3)
+        return self.network_rtt_ms + size * 8 / (self.network_mbit_per_s * 1e3)
+
+
+class TwoTierBrowserCache:
+    """
+    Browser cache with a small memory tier in front of a large disk tier.
+
+    Both tiers are LRU with a byte budget and hold disjoint objects: a disk
+    hit promotes the object to memory, and objects evicted from memory are
+    demoted to disk. Objects fetched from the network go to memory, or
+    straight to disk if they exceed the memory budget. Every access is
+    charged a latency from the LatencyModel, and pages loaded with
+    load_page() are timed with a fixed number of parallel fetches.
+    """
+    def __init__(self, memory_budget=32 << 20, disk_budget=512 << 20, latency=None,
+                 parallel_fetches=6, default_size=50_000):
+        """
+        Args:
+            memory_budget (int): Memory tier capacity in bytes
+            disk_budget (int): Disk tier capacity in bytes
+            latency (LatencyModel): Latency model (defaults to LatencyModel())
+            parallel_fetches (int): Resources of a page fetched at the same time
+            default_size (int): Size assumed for objects without a known size
+        """
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.latency = latency or LatencyModel()
+        self.parallel_fetches = parallel_fetches
+        self.default_size = default_size
+
+        # url -> size in bytes, least recently used first
+        self.memory = OrderedDict()
+        self.disk = OrderedDict()
+        self.memory_used = 0
+        self.disk_used = 0
+
+        self.total_accesses = 0
+        self.tier_hits = dict.fromkeys(TIERS, 0)
+        self.tier_bytes = dict.fromkeys(TIERS, 0)
+        self.promotions = 0
+        self.demotions = 0
+        self.page_load_times = array('d')
+
+    def _store_disk(self, url, size):
+        if size > self.disk_budget:
+            return
+        while self.disk_used + size > self.disk_budget:
+            _, evicted_size = self.disk.popitem(last=False)
+            self.disk_used -= evicted_size
+        self.disk[url] = size
+        self.disk_used += size
+
+    def _store_memory(self, url, size):
+        if size > self.memory_budget:
+            self._store_disk(url, size)
+            return
+        while self.memory_used + size > self.memory_budget:
+            evicted, evicted_size = self.memory.popitem(last=False)
+            self.memory_used -= evicted_size
+            self.demotions += 1
+            self._store_disk(evicted, evicted_size)
+        self.memory[url] = size
+        self.memory_used += size
+
+    def access(self, url, size=0):
+        """
+        Request one object.
+
+        Args:
+            url (str): Object URL
+            size (int): Object size in bytes (0 if unknown: the cached size or default_size is used)
+
+        Returns:
+            tuple: (tier that served it, latency in ms)
+        """
+        self.total_accesses += 1
+
+        if url in self.memory:
+            self.memory.move_to_end(url)
+            tier, size = 'memory', self.memory[url]
+        elif url in self.disk:
+            tier, size = 'disk', self.disk.pop(url)
+            self.disk_used -= size
+            if size <= self.memory_budget:
+                self.promotions += 1
+            self._store_memory(url, size)
+        else:
+            tier, size = 'network', size or self.default_size
+            self._store_memory(url, size)
+
+        self.tier_hits[tier] += 1
+        self.tier_bytes[tier] += size
+        return tier, self.latency.latency(tier, size)
+
+    def load_page(self, resources):
+        """
+        Load a page and record its load time.
+
+        Resources are fetched in order over parallel_fetches connections,
+        each starting as soon as a connection is free.
+
+        Args:
+            resources (list): (url, size) pairs; the first is usually the document itself
+
+        Returns:
+            float: Page load time in ms
+        """
+        connections = [0.0] * min(self.parallel_fetches, max(len(resources), 1))
+        finish = 0.0
+        for url, size in resources:
+            start = heapq.heappop(connections)
+            end = start + self.access(url, size)[1]
+            heapq.heappush(connections, end)
+            finish = max(finish, end)
+        self.page_load_times.append(finish)
+        return finish
+
+    def get_hit_rate(self):
+        """
+        Percentage of accesses served by either cache tier.
+        """
+        if self.total_accesses == 0:
+            return 0.0
+        return (1 - self.tier_hits['network'] / self.total_accesses) * 100.0
+
+    def report(self, percentiles=(50, 75, 90, 95, 99)):
+        return tiered_report([self], percentiles)
+
+    def print_stats(self, percentiles=(50, 75, 90, 95, 99)):
+        print_tiered_report(self.report(percentiles))
+
+
+def tiered_report(caches, percentiles=(50, 75, 90, 95, 99)):
+    """
+    Combined statistics of one or more TwoTierBrowserCache instances.
+
+    Returns:
+        dict: Per-tier request and byte hit rates, promotions, demotions and
+              page-load time percentiles in ms
+    """
+    accesses = sum(cache.total_accesses for cache in caches)
+    total_bytes = sum(sum(cache.tier_bytes.values()) for cache in caches)
+    times = np.concatenate([np.frombuffer(cache.page_load_times, dtype=np.float64) for cache in caches]) \
+        if caches else np.zeros(0)
+
+    report = {'total_accesses': accesses, 'pages': len(times)}
+    for tier in TIERS:
+        hits = sum(cache.tier_hits[tier] for cache in caches)
+        served = sum(cache.tier_bytes[tier] for cache in caches)
+        report[f'{tier}_hits'] = hits
+        report[f'{tier}_hit_rate'] = hits / accesses * 100.0 if accesses else 0.0
+        report[f'{tier}_byte_rate'] = served / total_bytes * 100.0 if total_bytes else 0.0
+    report['hit_rate'] = 100.0 - report['network_hit_rate'] if accesses else 0.0
+    report['promotions'] = sum(cache.promotions for cache in caches)
+    report['demotions'] = sum(cache.demotions for cache in caches)
+    report['page_load_ms'] = {
+        'mean': float(times.mean()) if len(times) else 0.0,
+        **{f"p{p:g}": float(value) for p, value in
+           zip(percentiles, np.percentile(times, percentiles) if len(times) else [0.0] * len(percentiles))},
+    }
+    return report
+
+
+def print_tiered_report(report):
+    """
+    Print a tiered_report dictionary.
+    """
+    print(f"Total accesses: {report['total_accesses']} in {report['pages']} page loads")
+    for tier in TIERS:
+        label = 'Network fetches' if tier == 'network' else f"{tier.capitalize()} hits"
+        print(f"{label}: {report[f'{tier}_hits']} ({report[f'{tier}_hit_rate']:.2f}% of requests, "
+              f"{report[f'{tier}_byte_rate']:.2f}% of bytes)")
+    print(f"Promotions: {report['promotions']}, demotions: {report['demotions']}")
+    times = report['page_load_ms']
+    print("Page load time: " + ", ".join(f"{name} {value:.1f} ms" for name, value in times.items()))
+
+
+def split_page_loads(requests):
+    """
+    Group a request stream into page loads per client.
+
+    A request for a static resource (by file extension) belongs to the
+    current page of its client; any other request starts a new page.
+
+    Args:
+        requests (iterable): (client, url, size) tuples in log order
+
+    Yields:
+        tuple: (client, [(url, size), ...]) once each page is complete
+    """
+    open_pages = {}
+    for client, url, size in requests:
+        path = url.split('?', 1)[0].lower()
+        page = open_pages.get(client)
+        if page is not None and path.endswith(STATIC_EXTENSIONS):
+            page.append((url, size))
+            continue
+        if page is not None:
+            yield client, page
+        open_pages[client] = [(url, size)]
+
+    for client, page in open_pages.items():
+        yield client, page
@@ -0,0 +1,852 @@
+"""
+Command-line entry point for batch runs.
+
+Run from the project root:
+
+    python -m src.cli simulate data/traces/sample_trace.txt --cache-size 32 --block-size 16
+    python -m src.cli simulate trace.txt --cache-size 512 --block-size 64 --regions symbols.txt
+    python -m src.cli simulate big_trace.npy --checkpoint run.ckpt --checkpoint-seconds 60 --resume
+    python -m src.cli sweep data/traces/browsing_pattern.txt --kind browser --plot
+    python -m src.cli profile data/traces/browsing_pattern.txt --kind browser --top 5
+    python -m src.cli sweep trace.txt --cache-sizes 64 256 1024 --block-sizes 16 64 --store --run-name baseline
+    python -m src.cli sweep trace.txt --cache-sizes 128 --block-sizes 32 --victim-entries 0 4 8 16
+    python -m src.cli simulate trace.txt --cache-size 1024 --block-size 64 --associativity 16 --policy drrip
+    python -m src.cli sweep trace.txt --cache-sizes 1024 --block-sizes 64 --associativity 16 --policies lru dip drrip
+    python -m src.cli results --diff baseline padded
+    tracer | python -m src.cli stream - --cache-size 512 --interval 5
+    python -m src.cli replay-log access.log.gz --capacity 50 --client-key ip
+    python -m src.cli hierarchy access.log --proxy-capacity 10000 --proxy-nodes 4 --proxy-policy lfu
+    python -m src.cli tiered access.log --log --memory-kb 8192 --disk-mb 256 --rtt-ms 80
+    python -m src.cli coherence cores.txt --protocol MESI
+    python -m src.cli conflicts trace.txt --cache-size 256 --block-size 64 --region matrix=10000-50000
+    python -m src.cli tlb trace.txt --entries 64 --ways 4 --page-size 2M --cache-size 512
+    python -m src.cli convert-trace lackey.out trace.npy
+    python -m src.cli plot data/results/sweep.json
+
+Settings default to the Config class, can be overridden from a JSON file
+with --config and then by command-line arguments. Every command writes its
+results as JSON to the results directory; plots are rendered there with a
+non-interactive backend. Heavy modules (NumPy, matplotlib) are imported
+only by the commands that need them, so startup stays fast.
+"""
+import argparse
+import json
+import os
+import sys
+
+from config import Config
+
+# Policies of cache.set_associative, listed here so building the parser imports nothing
+REPLACEMENT_POLICIES = ['lru', 'lip', 'bip', 'dip', 'srrip', 'brrip', 'drrip']
+
+
+def _headless_pyplot():
+    """
+    Select the non-interactive Agg backend before pyplot is first imported.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _results_path(file_name):
+    os.makedirs(Config.RESULTS_DIR, exist_ok=True)
+    return os.path.join(Config.RESULTS_DIR, file_name)
+
+
+def _write_results(results, output_path, default_name):
+    output_path = output_path or _results_path(default_name)
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output_path}")
+    return output_path
+
+
+def _load_trace(path, kind, trace_format='auto'):
+    if kind == 'browser':
+        from src.memory.trace_loader import load_browsing_pattern
+        return load_browsing_pattern(path)
+
+    if path.endswith('.npy'):
+        import numpy as np
+        return np.load(path).tolist()
+
+    from src.memory.trace_formats import parse_trace
+    trace = parse_trace(path, trace_format)
+    return trace.addresses.tolist() if trace is not None else []
+
+
+def _cache_stats(cache):
+    stats = {
+        'accesses': cache.total_accesses,
+        'hits': cache.hits,
+        'misses': cache.misses,
+        'hit_rate': cache.get_hit_rate(),
+        'miss_rate': cache.get_miss_rate(),
+    }
+    if getattr(cache, 'victim_entries', 0):
+        stats['victim_hits'] = cache.victim_hits
+        stats['memory_fetches'] = cache.misses - cache.victim_hits
+    return stats
+
+
+def run_simulate(args):
+    set_associative = args.associativity > 1 or args.policy != 'lru'
+    if set_associative:
+        unsupported = [flag for flag, value in (('--kind browser', args.kind == 'browser'),
+                                                ('--victim-entries', args.victim_entries),
+                                                ('--workers', args.workers and args.workers > 1),
+                                                ('--checkpoint', args.checkpoint)) if value]
+        if unsupported:
+            raise SystemExit(f"--associativity and --policy are not supported with {', '.join(unsupported)}")
+
+    trace = _load_trace(args.trace, args.kind, args.trace_format)
+
+    region_map = None
+    if args.regions:
+        if args.kind == 'browser':
+            raise SystemExit("--regions needs a memory trace")
+        from src.memory.region_map import RegionMap
+        region_map = RegionMap.load(args.regions)
+        if region_map is None:
+            raise SystemExit(f"Error: The file {args.regions} was not found.")
+
+    instrumentation = None
+    if args.sample_interval or region_map is not None:
+        from src.cache.instrumentation import CacheInstrumentation
+        instrumentation = CacheInstrumentation(args.sample_interval or 1000, expected_accesses=len(trace),
+                                               region_map=region_map)
+
+    if args.checkpoint:
+        if args.workers and args.workers > 1:
+            raise SystemExit("--checkpoint is not supported with --workers")
+        from src.cache import checkpoint
+        if args.resume and os.path.exists(args.checkpoint):
+            cache, offset = checkpoint.load_checkpoint(args.checkpoint, instrumentation=instrumentation)
+            print(f"Resuming from {args.checkpoint} at access {offset}")
+        elif args.kind == 'browser':
+            from src.cache.browser_cache_simulator import BrowserLRUCache
+            cache, offset = BrowserLRUCache(args.capacity, instrumentation=instrumentation), 0
+        else:
+            from src.cache.cache_simulator import CacheSimulator
+            cache = CacheSimulator(cache_size=args.cache_size, block_size=args.block_size,
+                                   instrumentation=instrumentation, victim_entries=args.victim_entries,
+                                   victim_mode=args.victim_mode)
+            offset = 0
+        checkpoint.run_with_checkpoints(cache, trace, args.checkpoint, args.checkpoint_every,
+                                        args.checkpoint_seconds, start=offset)
+        if args.kind == 'browser':
+            config = {'capacity': cache.capacity}
+        else:
+            config = {'cache_size': cache.cache_size, 'block_size': cache.block_size}
+    elif args.kind == 'browser':
+        from src.cache.browser_cache_simulator import BrowserLRUCache
+        cache = BrowserLRUCache(args.capacity, instrumentation=instrumentation)
+        for url in trace:
+            cache.access_page(url)
+        config = {'capacity': args.capacity}
+    elif args.workers and args.workers > 1:
+        if instrumentation is not None:
+            raise SystemExit("--sample-interval and --regions are not supported with --workers")
+        if args.victim_entries:
+            raise SystemExit("--victim-entries is not supported with --workers")
+        from src.cache.parallel import simulate_partitioned
+        cache = simulate_partitioned(trace, args.cache_size, args.block_size, workers=args.workers)
+        config = {'cache_size': args.cache_size, 'block_size': args.block_size}
+    elif set_associative:
+        from src.cache.set_associative import SetAssociativeCache
+        cache = SetAssociativeCache(cache_size=args.cache_size, block_size=args.block_size,
+                                    associativity=args.associativity, policy=args.policy,
+                                    instrumentation=instrumentation)
+        for address in trace:
+            cache.access_memory(address)
+        config = {'cache_size': args.cache_size, 'block_size': args.block_size,
+                  'associativity': args.associativity, 'policy': args.policy}
+    else:
+        from src.cache.cache_simulator import CacheSimulator
+        cache = CacheSimulator(cache_size=args.cache_size, block_size=args.block_size,
+                               instrumentation=instrumentation, victim_entries=args.victim_entries,
+                               victim_mode=args.victim_mode)
+        for address in trace:
+            cache.access_memory(address)
+        config = {'cache_size': args.cache_size, 'block_size': args.block_size}
+
+    if getattr(cache, 'victim_entries', 0):
+        config.update(victim_entries=cache.victim_entries, victim_mode=cache.victim_mode)
+    cache.print_stats()
+
+    results = {'command': 'simulate', 'kind': args.kind, 'trace': args.trace, 'config': config,
+               'stats': _cache_stats(cache)}
+    if getattr(cache, 'dueling', None):
+        results['dueling'] = cache.dueling_stats()
+    if args.sample_interval:
+        results['timeseries'] = instrumentation.to_chart_data()
+        if 'duel_winner' in results['timeseries']:
+            # How many samples each policy was winning at
+            winners = results['timeseries']['duel_winner']
+            results['dueling']['winner_samples'] = {cache.dueling[0]: winners.count(0),
+                                                    cache.dueling[1]: winners.count(1)}
+    if region_map is not None:
+        from src.visualization.stats_display import display_region_stats
+        results['regions'] = instrumentation.region_table()
+        display_region_stats(results['regions'])
+
+    _write_results(results, args.output, 'simulate.json')
+    if args.plot:
+        plot_results(results)
+
+
+def run_sweep(args):
+    trace = _load_trace(args.trace, args.kind, args.trace_format)
+    runs = []
+
+    store = None
+    if args.store:
+        import time
+        from src.cache.results_table import RunStore
+        store = RunStore(_results_path(args.store if args.store != '-' else f"{args.kind}_runs.csv"))
+        run_name = args.run_name or time.strftime('%Y%m%dT%H%M%S')
+
+    if args.kind == 'browser':
+        from src.cache.browser_cache_simulator import BrowserLRUCache
+        for capacity in args.cache_sizes:
+            cache = BrowserLRUCache(capacity)
+            for url in trace:
+                cache.access_page(url)
+            runs.append(dict(capacity=capacity, **_cache_stats(cache)))
+            if store is not None:
+                store.append(dict(run=run_name, **runs[-1]))
+    else:
+        from src.cache.cache_simulator import CacheSimulator
+        from src.memory.block_stream import BlockStreamCache
+        set_associative = args.associativity > 1 or args.policies
+        if set_associative:
+            if args.victim_entries:
+                raise SystemExit("--victim-entries is not supported with --associativity or --policies")
+            from src.cache.set_associative import SetAssociativeCache
+        # Each block size's collapsed stream is built once and shared by every cache size
+        streams = BlockStreamCache(trace)
+        for block_size in args.block_sizes:
+            for cache_size in args.cache_sizes:
+                if set_associative:
+                    for policy in args.policies or ['lru']:
+                        cache = SetAssociativeCache(cache_size=cache_size, block_size=block_size,
+                                                    associativity=args.associativity, policy=policy)
+                        cache.simulate_block_stream(streams.get(block_size))
+                        runs.append(dict(cache_size=cache_size, block_size=block_size,
+                                         associativity=args.associativity, policy=policy, **_cache_stats(cache)))
+                        if store is not None:
+                            store.append(dict(run=run_name, cache_bytes=cache_size * block_size, **runs[-1]))
+                    continue
+                for victim_entries in args.victim_entries or [0]:
+                    cache = CacheSimulator(cache_size=cache_size, block_size=block_size,
+                                           victim_entries=victim_entries, victim_mode=args.victim_mode)
+                    cache.simulate_block_stream(streams.get(block_size))
+                    run = dict(cache_size=cache_size, block_size=block_size, **_cache_stats(cache))
+                    if args.victim_entries:
+                        # Same columns for every row, with or without a buffer
+                        run.update(victim_entries=victim_entries, victim_hits=cache.victim_hits,
+                                   memory_fetches=cache.misses - cache.victim_hits)
+                    runs.append(run)
+                    if store is not None:
+                        store.append(dict(run=run_name, cache_bytes=cache_size * block_size, **runs[-1]))
+
+    for run in runs:
+        geometry = {key: value for key, value in run.items()
+                    if key in ('capacity', 'cache_size', 'block_size', 'victim_entries', 'associativity', 'policy')}
+        line = f"{geometry}: hit rate {run['hit_rate']:.2f}%, miss rate {run['miss_rate']:.2f}%"
+        if 'victim_hits' in run:
+            line += f", victim hits {run['victim_hits']}"
+        print(line)
+
+    results = {'command': 'sweep', 'kind': args.kind, 'trace': args.trace, 'runs': runs}
+    if store is not None:
+        print(f"Runs appended to {store.file_path} as run {run_name}")
+        results['store'] = {'path': store.file_path, 'run': run_name}
+    _write_results(results, args.output, 'sweep.json')
+    if args.plot:
+        plot_results(results)
+
+
+def run_results(args):
+    import numpy as np
+    from src.cache.results_table import ResultsTable
+
+    path = args.store or _results_path('memory_runs.csv')
+    table = ResultsTable.load(path)
+    if table is None:
+        raise SystemExit(f"Error: The file {path} was not found.")
+    if (args.run or args.diff) and 'run' not in table.columns:
+        raise SystemExit(f"Error: {path} has no run column.")
+    runs = table.select(np.isin(table['run'], args.run)) if args.run else table
+    print(f"{len(runs)} of {len(table)} rows in {path}")
+
+    results = {'command': 'results', 'store': path, 'rows': len(runs)}
+    if args.diff:
+        run_a, run_b = args.diff
+        keys = args.keys or [key for key in ('capacity', 'cache_size', 'block_size', 'victim_entries',
+                                             'associativity', 'policy') if key in table.columns]
+        diff = table.where(run=run_a).diff(table.where(run=run_b), keys=keys, metrics=[args.metric])
+        changes = diff['table'].rank(f"{args.metric}_change", top=args.top)
+        print(f"\n{run_b} vs {run_a}: {len(diff['table'])} common configurations, "
+              f"{diff['only_a']} only in {run_a}, {diff['only_b']} only in {run_b}")
+        print(changes.format())
+        results['diff'] = {'run_a': run_a, 'run_b': run_b, 'only_a': diff['only_a'], 'only_b': diff['only_b'],
+                           'rows': diff['table'].rows()}
+    else:
+        columns = [name for name in runs.columns if name not in ('trace', 'kind')]
+        ranked = runs.rank(args.rank, descending=args.descending, top=args.top)
+        print(f"\nTop {len(ranked)} by {args.rank}:")
+        print(ranked.format(columns))
+        results['ranked'] = ranked.rows()
+
+        cost = args.cost or ('cache_bytes' if 'cache_bytes' in table.columns else 'capacity')
+        front = runs.pareto_front(cost, args.metric)
+        print(f"\nPareto front ({args.metric} vs {cost}):")
+        print(front.format(columns))
+        results['pareto'] = {'cost': cost, 'metric': args.metric, 'rows': front.rows()}
+
+    _write_results(results, args.output, 'results.json')
+
+
+def run_coherence(args):
+    from src.cache.coherence import CoherentCacheSystem
+    from src.memory.trace_loader import load_core_trace
+
+    try:
+        records = load_core_trace(args.trace, args.cores)
+    except ValueError as error:
+        raise SystemExit(f"Error: {error}")
+    num_cores = args.cores or (max(core for core, _, _ in records) + 1 if records else 1)
+
+    system = CoherentCacheSystem(num_cores, cache_size=args.cache_size, block_size=args.block_size,
+                                 protocol=args.protocol)
+    system.simulate(records)
+    system.print_stats()
+
+    results = {
+        'command': 'coherence',
+        'trace': args.trace,
+        'config': {'cores': num_cores, 'cache_size': args.cache_size, 'block_size': args.block_size,
+                   'protocol': system.protocol},
+        'cores': system.report(),
+        'hotspots': system.sharing_hotspots(args.top),
+    }
+    _write_results(results, args.output, 'coherence.json')
+
+
+def _parse_huge_region(text):
+    """
+    Parse START-END:SIZE (addresses in hex), e.g. 7f0000000000-7f0040000000:2M.
+    """
+    try:
+        span, size = text.rsplit(':', 1)
+        start, end = span.split('-')
+        return int(start, 16), int(end, 16), size
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected START-END:SIZE, got {text!r}")
+
+
+def run_tlb(args):
+    from src.memory.tlb import MMU, PageTable, TLB
+
+    trace = _load_trace(args.trace, 'memory', args.trace_format)
+
+    data_cache = None
+    if args.cache_size:
+        from src.cache.cache_simulator import CacheSimulator
+        data_cache = CacheSimulator(cache_size=args.cache_size, block_size=args.block_size)
+
+    mmu = MMU(TLB(args.entries, args.ways), PageTable(args.page_size, args.huge_region), data_cache,
+              walk_cycles_per_level=args.walk_cycles)
+    mmu.simulate(trace)
+    mmu.print_stats()
+
+    results = {
+        'command': 'tlb',
+        'trace': args.trace,
+        'config': {'entries': args.entries, 'ways': args.ways, 'page_size': args.page_size,
+                   'huge_regions': [[hex(start), hex(end), size] for start, end, size in args.huge_region],
+                   'walk_cycles_per_level': args.walk_cycles},
+        'tlb': mmu.report(),
+    }
+    if data_cache is not None:
+        print("\nData cache (physical addresses):")
+        data_cache.print_stats()
+        results['data_cache'] = _cache_stats(data_cache)
+    _write_results(results, args.output, 'tlb.json')
+
+
+def _parse_region(text):
+    """
+    Parse NAME=START-END (addresses in hex), e.g. matrix=10000-50000.
+    """
+    try:
+        name, span = text.split('=', 1)
+        start, end = span.split('-')
+        return name, int(start, 16), int(end, 16)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected NAME=START-END, got {text!r}")
+
+
+def run_conflicts(args):
+    from src.cache.cache_simulator import CacheSimulator
+    from src.optimization.conflict_analyzer import ConflictAnalyzer, print_conflict_report
+
+    regions = list(args.region)
+    if args.regions:
+        from src.memory.region_map import RegionMap
+        region_map = RegionMap.load(args.regions)
+        if region_map is None:
+            raise SystemExit(f"Error: The file {args.regions} was not found.")
+        regions += list(region_map)
+
+    trace = _load_trace(args.trace, 'memory', args.trace_format)
+    analyzer = ConflictAnalyzer(CacheSimulator(cache_size=args.cache_size, block_size=args.block_size),
+                                regions=regions or None, region_gap=args.region_gap)
+    analyzer.analyze(trace)
+    report = analyzer.report(args.top, args.suggestions)
+    print_conflict_report(report)
+
+    results = {'command': 'conflicts', 'trace': args.trace,
+               'config': {'cache_size': args.cache_size, 'block_size': args.block_size}, 'conflicts': report}
+    _write_results(results, args.output, 'conflicts.json')
+
+
+def run_stream(args):
+    from src.memory.live_stream import ingest
+
+    if args.kind == 'browser':
+        from src.cache.browser_cache_simulator import BrowserLRUCache
+        cache = BrowserLRUCache(args.capacity)
+        config = {'capacity': args.capacity}
+    else:
+        from src.cache.cache_simulator import CacheSimulator
+        cache = CacheSimulator(cache_size=args.cache_size, block_size=args.block_size)
+        config = {'cache_size': args.cache_size, 'block_size': args.block_size}
+
+    snapshot = ingest(cache, args.source, kind=args.kind, connections=args.connections,
+                      batch_size=args.batch_size, max_pending=args.max_pending,
+                      report_interval=args.interval, window=args.window)
+
+    results = {'command': 'stream', 'kind': args.kind, 'source': args.source, 'config': config,
+               'stats': _cache_stats(cache), 'rolling': snapshot}
+    _write_results(results, args.output, 'stream.json')
+
+
+def run_replay_log(args):
+    from src.cache.client_caches import SharedClientCaches
+    from src.memory.access_log import AccessLogReader
+
+    if not os.path.exists(args.log):
+        raise SystemExit(f"Error: The file {args.log} was not found.")
+    reader = AccessLogReader(args.log, client_key=args.client_key, cookie_name=args.cookie_name,
+                             methods=tuple(args.methods))
+    caches = SharedClientCaches(args.capacity)
+    caches.simulate(reader)
+    caches.print_stats(args.percentiles, args.min_accesses)
+
+    results = {
+        'command': 'replay-log',
+        'log': args.log,
+        'config': {'capacity': args.capacity, 'client_key': args.client_key, 'cookie_name': args.cookie_name},
+        'log_lines': {'lines': reader.lines, 'requests': reader.requests, 'filtered': reader.filtered,
+                      'malformed': reader.malformed},
+        'stats': caches.report(args.percentiles, args.min_accesses),
+    }
+    _write_results(results, args.output, 'replay_log.json')
+
+
+def run_hierarchy(args):
+    from src.cache.hierarchy import CacheHierarchy
+    from src.memory.access_log import AccessLogReader
+
+    if not os.path.exists(args.log):
+        raise SystemExit(f"Error: The file {args.log} was not found.")
+    reader = AccessLogReader(args.log, client_key=args.client_key, cookie_name=args.cookie_name)
+    hierarchy = CacheHierarchy(browser_capacity=args.browser_capacity, proxy_capacity=args.proxy_capacity,
+                               proxy_nodes=args.proxy_nodes, browser_policy=args.browser_policy,
+                               proxy_policy=args.proxy_policy, virtual_nodes=args.virtual_nodes)
+    hierarchy.simulate(reader)
+    hierarchy.print_stats()
+
+    config = {name: getattr(args, name) for name in ('browser_capacity', 'browser_policy', 'proxy_capacity',
+                                                     'proxy_policy', 'proxy_nodes', 'virtual_nodes', 'client_key')}
+    results = {'command': 'hierarchy', 'log': args.log, 'config': config, 'stats': hierarchy.report()}
+    _write_results(results, args.output, 'hierarchy.json')
+
+
+def _browsing_requests(path):
+    """
+    (client, url, size) requests of a single browser from a browsing pattern,
+    whose lines are "url" or "url size".
+    """
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if fields:
+                yield None, fields[0], int(fields[1]) if len(fields) > 1 else 0
+
+
+def run_tiered(args):
+    from src.cache.tiered_cache import LatencyModel, TwoTierBrowserCache, print_tiered_report, \
+        split_page_loads, tiered_report
+
+    if not os.path.exists(args.trace):
+        raise SystemExit(f"Error: The file {args.trace} was not found.")
+    if args.log:
+        from src.memory.access_log import AccessLogReader
+        requests = AccessLogReader(args.trace, with_sizes=True)
+    else:
+        requests = _browsing_requests(args.trace)
+
+    latency = LatencyModel(memory_hit_ms=args.memory_hit_ms, disk_hit_ms=args.disk_hit_ms,
+                           disk_mb_per_s=args.disk_mb_per_s, network_rtt_ms=args.rtt_ms,
+                           network_mbit_per_s=args.bandwidth_mbit)
+    caches = {}
+    for client, page in split_page_loads(requests):
+        cache = caches.get(client)
+        if cache is None:
+            cache = caches[client] = TwoTierBrowserCache(args.memory_kb << 10, args.disk_mb << 20, latency,
+                                                         args.parallel, args.default_size)
+        cache.load_page(page)
+
+    report = tiered_report(list(caches.values()))
+    report['clients'] = len(caches)
+    print_tiered_report(report)
+
+    config = {name: getattr(args, name) for name in ('memory_kb', 'disk_mb', 'parallel', 'default_size')}
+    config['latency'] = vars(latency)
+    results = {'command': 'tiered', 'trace': args.trace, 'config': config, 'stats': report}
+    _write_results(results, args.output, 'tiered.json')
+
+
+def run_profile(args):
+    from src.memory.access_patterns import profile_access_stream, generate_streaming_report
+
+    trace = _load_trace(args.trace, args.kind, args.trace_format)
+    profile = profile_access_stream(trace, hll_precision=args.precision, cms_epsilon=args.epsilon,
+                                    cms_delta=args.delta, top_k=args.top_k)
+    print(generate_streaming_report(profile, top_n=args.top))
+
+    results = {
+        'command': 'profile',
+        'kind': args.kind,
+        'trace': args.trace,
+        'total': profile.total,
+        'distinct': profile.distinct_count(),
+        'error_bounds': profile.error_bounds(),
+        'heavy_hitters': [[key, estimate, lower_bound]
+                          for key, estimate, lower_bound in profile.heavy_hitters(args.top_k)],
+    }
+    _write_results(results, args.output, 'profile.json')
+    if args.plot:
+        plot_results(results)
+
+
+def run_convert_trace(args):
+    import numpy as np
+    from src.memory.workloads import write_memory_trace
+
+    input_format = args.input_format or ('npy' if args.input.endswith('.npy') else 'auto')
+    output_format = args.output_format or ('npy' if args.output.endswith('.npy') else 'hex')
+
+    if input_format == 'npy':
+        addresses = np.load(args.input)
+    else:
+        from src.memory.trace_formats import parse_trace
+        trace = parse_trace(args.input, input_format)
+        if trace is None:
+            raise SystemExit(1)
+        addresses, input_format = trace.addresses, trace.trace_format
+        for line_number, line in trace.errors:
+            print(f"  line {line_number}: {line}")
+
+    if output_format == 'npy':
+        np.save(args.output, addresses)
+    else:
+        write_memory_trace(addresses, args.output)
+    print(f"Converted {len(addresses)} addresses from {args.input} ({input_format}) "
+          f"to {args.output} ({output_format})")
+
+
+def plot_results(results):
+    """
+    Render the chart(s) for a results dictionary into the results directory.
+
+    Args:
+        results (dict): Results written by the simulate, sweep or profile commands
+
+    Returns:
+        list: Paths of the files written
+    """
+    _headless_pyplot()
+    written = []
+
+    if results['command'] == 'simulate':
+        if 'timeseries' not in results:
+            print("No time series in these results; rerun simulate with --sample-interval.")
+            return written
+        from src.visualization.chart_generator import generate_chart
+        path = _results_path('simulate_timeseries.png')
+        generate_chart(results['timeseries'], title=f"Cache Performance: {results['trace']}",
+                       output_path=path, show=False)
+        written.append(path)
+
+    elif results['command'] == 'sweep':
+        from src.cache.browser_cache_simulator import plot_performance_comparison
+        if results['kind'] == 'browser':
+            groups = {None: results['runs']}
+            size_key, xlabel = 'capacity', 'Cache Size (number of pages)'
+        else:
+            groups = {}
+            for run in results['runs']:
+                # One chart per block size, and per policy when several were compared
+                name = f"block{run['block_size']}" + (f"_{run['policy']}" if 'policy' in run else '')
+                groups.setdefault(name, []).append(run)
+            size_key, xlabel = 'cache_size', 'Cache Size (number of lines)'
+
+        for group, runs in groups.items():
+            series = {
+                'cache_sizes': [run[size_key] for run in runs],
+                'hit_rates': [run['hit_rate'] for run in runs],
+                'miss_rates': [run['miss_rate'] for run in runs],
+            }
+            name = 'sweep.png' if group is None else f"sweep_{group}.png"
+            path = _results_path(name)
+            plot_performance_comparison(series, output_path=path, show=False, xlabel=xlabel)
+            written.append(path)
+
+    elif results['command'] == 'profile':
+        from src.visualization.chart_generator import plot_frequency_distribution
+        path = _results_path('frequency.png')
+        site_counts = [(key, estimate) for key, estimate, _ in results['heavy_hitters']]
+        plot_frequency_distribution(site_counts, output_path=path, show=False)
+        written.append(path)
+
+    for path in written:
+        print(f"Plot saved to {path}")
+    return written
+
+
+def run_plot(args):
+    with open(args.results) as f:
+        plot_results(json.load(f))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description="Cache performance simulator")
+    parser.add_argument('--config', help="JSON file overriding the Config settings")
+    parser.add_argument('--results-dir', help="Directory for results and plots (default: Config.RESULTS_DIR)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_trace_arguments(subparser):
+        subparser.add_argument('trace', nargs='?', help="Trace file (default: Config.TRACE_FILE_PATH)")
+        subparser.add_argument('--kind', choices=['memory', 'browser'], default='memory',
+                               help="Memory address trace or browsing (URL) trace")
+        subparser.add_argument('--trace-format', choices=['auto', 'lackey', 'din', 'csv', 'hex', 'dec'],
+                               default='auto', help="Memory trace format (default: detected)")
+        subparser.add_argument('--output', help="Results JSON file (default: in the results directory)")
+        subparser.add_argument('--plot', action='store_true', help="Render plots to the results directory")
+
+    simulate = subparsers.add_parser('simulate', help="Simulate one cache configuration")
+    add_trace_arguments(simulate)
+    simulate.add_argument('--cache-size', type=int, help="Number of cache lines (default: Config.CACHE_SIZE)")
+    simulate.add_argument('--block-size', type=int, help="Block size in bytes (default: Config.BLOCK_SIZE)")
+    simulate.add_argument('--capacity', type=int, help="Browser cache capacity in pages (default: Config.CACHE_SIZE)")
+    simulate.add_argument('--victim-entries', type=int, default=0,
+                          help="Lines in a fully associative victim/miss buffer next to the cache")
+    simulate.add_argument('--victim-mode', choices=['victim', 'miss'], default='victim',
+                          help="Victim cache (evicted lines) or miss cache (fetched lines)")
+    simulate.add_argument('--associativity', type=int, default=1, help="Lines per set (default: direct-mapped)")
+    simulate.add_argument('--policy', choices=REPLACEMENT_POLICIES, default='lru',
+                          help="Replacement/insertion policy of a set-associative cache")
+    simulate.add_argument('--sample-interval', type=int, help="Record a hit/miss time series every N accesses")
+    simulate.add_argument('--regions', help="Region map file ('name start end' lines or nm -S output): "
+                                            "attribute misses and evictions to regions")
+    simulate.add_argument('--workers', type=int, help="Simulate a memory trace on N processes, partitioned by set")
+    simulate.add_argument('--checkpoint', help="Checkpoint file to save the simulation state to")
+    simulate.add_argument('--checkpoint-every', type=int, help="Checkpoint every N accesses")
+    simulate.add_argument('--checkpoint-seconds', type=float, help="Checkpoint every T seconds")
+    simulate.add_argument('--resume', action='store_true', help="Continue from the checkpoint file if it exists")
+    simulate.set_defaults(handler=run_simulate)
+
+    sweep = subparsers.add_parser('sweep', help="Simulate a range of cache configurations")
+    add_trace_arguments(sweep)
+    sweep.add_argument('--cache-sizes', type=int, nargs='+', default=[4, 8, 16, 32, 64])
+    sweep.add_argument('--block-sizes', type=int, nargs='+', help="Block sizes (default: Config.BLOCK_SIZE)")
+    sweep.add_argument('--victim-entries', type=int, nargs='+',
+                       help="Victim/miss buffer sizes to sweep for each memory cache (0 for none)")
+    sweep.add_argument('--victim-mode', choices=['victim', 'miss'], default='victim',
+                       help="Victim cache (evicted lines) or miss cache (fetched lines)")
+    sweep.add_argument('--associativity', type=int, default=1, help="Lines per set of every swept cache")
+    sweep.add_argument('--policies', nargs='+', choices=REPLACEMENT_POLICIES,
+                       help="Replacement/insertion policies to compare (set-associative caches)")
+    sweep.add_argument('--store', nargs='?', const='-',
+                       help="Append each configuration to a run store in the results directory "
+                            "(.csv or .jsonl; default: <kind>_runs.csv)")
+    sweep.add_argument('--run-name', help="Name of this run in the store (default: a timestamp)")
+    sweep.set_defaults(handler=run_sweep)
+
+    results = subparsers.add_parser('results', help="Rank, Pareto-filter or diff the runs in a run store")
+    results.add_argument('store', nargs='?', help="Run store file (default: memory_runs.csv in the results directory)")
+    results.add_argument('--output', help="Results JSON file (default: in the results directory)")
+    results.add_argument('--run', nargs='+', help="Only these runs")
+    results.add_argument('--rank', default='miss_rate', help="Column to rank by")
+    results.add_argument('--descending', action='store_true', help="Rank largest first")
+    results.add_argument('--top', type=int, default=10, help="Rows to list")
+    results.add_argument('--metric', default='miss_rate', help="Metric for the Pareto front and diffs (lower is better)")
+    results.add_argument('--cost', help="Cost column for the Pareto front (default: cache_bytes, or capacity)")
+    results.add_argument('--diff', nargs=2, metavar=('RUN_A', 'RUN_B'), help="Compare two runs configuration by configuration")
+    results.add_argument('--keys', nargs='+', help="Columns identifying a configuration in --diff")
+    results.set_defaults(handler=run_results)
+
+    coherence = subparsers.add_parser('coherence', help="Multi-core MESI/MSI simulation of a core-tagged trace")
+    coherence.add_argument('trace', nargs='?', help="Trace of '<core> <R|W> <hex address>' lines")
+    coherence.add_argument('--output', help="Results JSON file (default: in the results directory)")
+    coherence.add_argument('--cores', type=int, help="Number of cores (default: highest core ID in the trace + 1)")
+    coherence.add_argument('--protocol', choices=['MESI', 'MSI'], default='MESI')
+    coherence.add_argument('--cache-size', type=int, help="Lines per private cache (default: Config.CACHE_SIZE)")
+    coherence.add_argument('--block-size', type=int, help="Block size in bytes (default: Config.BLOCK_SIZE)")
+    coherence.add_argument('--top', type=int, default=10, help="Sharing hotspots to report")
+    coherence.set_defaults(handler=run_coherence)
+
+    tlb = subparsers.add_parser('tlb', help="TLB and page-walk simulation in front of the data cache")
+    tlb.add_argument('trace', nargs='?', help="Virtual address trace (default: Config.TRACE_FILE_PATH)")
+    tlb.add_argument('--trace-format', choices=['auto', 'lackey', 'din', 'csv', 'hex', 'dec'], default='auto',
+                     help="Trace format (default: detected)")
+    tlb.add_argument('--output', help="Results JSON file (default: in the results directory)")
+    tlb.add_argument('--entries', type=int, default=64, help="TLB entries")
+    tlb.add_argument('--ways', type=int, default=4, help="TLB associativity")
+    tlb.add_argument('--page-size', choices=['4K', '2M', '1G'], default='4K', help="Default page size")
+    tlb.add_argument('--huge-region', type=_parse_huge_region, action='append', default=[],
+                     help="Virtual range backed by huge pages, START-END:SIZE in hex (repeatable)")
+    tlb.add_argument('--walk-cycles', type=int, default=20, help="Cycles per page-table level")
+    tlb.add_argument('--cache-size', type=int, default=0,
+                     help="Also simulate a data cache with this many lines on the physical addresses")
+    tlb.add_argument('--block-size', type=int, help="Data cache block size (default: Config.BLOCK_SIZE)")
+    tlb.set_defaults(handler=run_tlb)
+
+    conflicts = subparsers.add_parser('conflicts', help="Find conflict-miss hotspots and measure padding fixes")
+    conflicts.add_argument('trace', nargs='?', help="Memory address trace (default: Config.TRACE_FILE_PATH)")
+    conflicts.add_argument('--trace-format', choices=['auto', 'lackey', 'din', 'csv', 'hex', 'dec'], default='auto',
+                           help="Trace format (default: detected)")
+    conflicts.add_argument('--output', help="Results JSON file (default: in the results directory)")
+    conflicts.add_argument('--cache-size', type=int, help="Number of cache lines (default: Config.CACHE_SIZE)")
+    conflicts.add_argument('--block-size', type=int, help="Block size in bytes (default: Config.BLOCK_SIZE)")
+    conflicts.add_argument('--region', type=_parse_region, action='append', default=[],
+                           help="Named address range NAME=START-END in hex (repeatable; default: found from gaps)")
+    conflicts.add_argument('--regions', help="Region map file ('name start end' lines or nm -S output)")
+    conflicts.add_argument('--region-gap', type=int, help="Gap in bytes separating found regions (default: cache size)")
+    conflicts.add_argument('--top', type=int, default=10, help="Hot sets and pairs to report")
+    conflicts.add_argument('--suggestions', type=int, default=5, help="Regions to propose and measure fixes for")
+    conflicts.set_defaults(handler=run_conflicts)
+
+    stream = subparsers.add_parser('stream', help="Simulate a live stream with rolling statistics")
+    stream.add_argument('source', nargs='?', default='-',
+                        help="'-' for stdin, a FIFO or file path, tcp://host:port or unix:///path (default: stdin)")
+    stream.add_argument('--kind', choices=['memory', 'browser'], default='memory',
+                        help="Hex addresses or URLs, one per line")
+    stream.add_argument('--output', help="Results JSON file (default: in the results directory)")
+    stream.add_argument('--cache-size', type=int, help="Number of cache lines (default: Config.CACHE_SIZE)")
+    stream.add_argument('--block-size', type=int, help="Block size in bytes (default: Config.BLOCK_SIZE)")
+    stream.add_argument('--capacity', type=int, help="Browser cache capacity in pages (default: Config.CACHE_SIZE)")
+    stream.add_argument('--interval', type=float, default=1.0, help="Seconds between rolling reports")
+    stream.add_argument('--window', type=float, default=10.0, help="Rolling window in seconds")
+    stream.add_argument('--batch-size', type=int, default=4096, help="Maximum lines per batch")
+    stream.add_argument('--max-pending', type=int, default=8, help="Batches buffered before reading pauses")
+    stream.add_argument('--connections', type=int, default=1,
+                        help="For socket sources, stop after this many producers disconnect")
+    stream.set_defaults(handler=run_stream)
+
+    replay = subparsers.add_parser('replay-log', help="Replay an HTTP access log with one browser cache per client")
+    replay.add_argument('log', help="Common/Combined Log Format file (optionally .gz)")
+    replay.add_argument('--output', help="Results JSON file (default: in the results directory)")
+    replay.add_argument('--capacity', type=int, help="Pages cached per client (default: Config.CACHE_SIZE)")
+    replay.add_argument('--client-key', choices=['ip', 'user', 'cookie'], default='ip',
+                        help="What identifies a client")
+    replay.add_argument('--cookie-name', help="Cookie identifying the client for --client-key cookie")
+    replay.add_argument('--methods', nargs='+', default=['GET'], help="Request methods to replay")
+    replay.add_argument('--percentiles', type=float, nargs='+', default=[10, 25, 50, 75, 90, 99],
+                        help="Per-client hit-rate percentiles to report")
+    replay.add_argument('--min-accesses', type=int, default=1,
+                        help="Leave clients with fewer accesses out of the distribution")
+    replay.set_defaults(handler=run_replay_log)
+
+    hierarchy = subparsers.add_parser('hierarchy', help="Browser -> proxy -> origin hierarchy over an access log")
+    hierarchy.add_argument('log', help="Common/Combined Log Format file (optionally .gz)")
+    hierarchy.add_argument('--output', help="Results JSON file (default: in the results directory)")
+    hierarchy.add_argument('--browser-capacity', type=int, default=10, help="Pages per browser (0: no browser tier)")
+    hierarchy.add_argument('--browser-policy', choices=['lru', 'fifo'], default='lru')
+    hierarchy.add_argument('--proxy-capacity', type=int, default=1000, help="Pages per proxy node (0: no proxy tier)")
+    hierarchy.add_argument('--proxy-policy', choices=['lru', 'fifo', 'lfu'], default='lru')
+    hierarchy.add_argument('--proxy-nodes', type=int, default=1, help="Proxy nodes, sharded by consistent hashing")
+    hierarchy.add_argument('--virtual-nodes', type=int, default=100, help="Hash ring points per proxy node")
+    hierarchy.add_argument('--client-key', choices=['ip', 'user', 'cookie'], default='ip',
+                           help="What identifies a client")
+    hierarchy.add_argument('--cookie-name', help="Cookie identifying the client for --client-key cookie")
+    hierarchy.set_defaults(handler=run_hierarchy)
+
+    tiered = subparsers.add_parser('tiered', help="Two-tier memory + disk browser cache with page-load times")
+    tiered.add_argument('trace', help="Browsing pattern ('url [size]' lines) or, with --log, an access log")
+    tiered.add_argument('--log', action='store_true', help="Trace is a Common/Combined Log Format file")
+    tiered.add_argument('--output', help="Results JSON file (default: in the results directory)")
+    tiered.add_argument('--memory-kb', type=int, default=32 << 10, help="Memory tier budget in KB")
+    tiered.add_argument('--disk-mb', type=int, default=512, help="Disk tier budget in MB")
+    tiered.add_argument('--parallel', type=int, default=6, help="Parallel fetches per page")
+    tiered.add_argument('--default-size', type=int, default=50_000, help="Bytes assumed for objects of unknown size")
+    tiered.add_argument('--memory-hit-ms', type=float, default=0.05)
+    tiered.add_argument('--disk-hit-ms', type=float, default=4.0)
+    tiered.add_argument('--disk-mb-per-s', type=float, default=200.0)
+    tiered.add_argument('--rtt-ms', type=float, default=60.0, help="Network round trip")
+    tiered.add_argument('--bandwidth-mbit', type=float, default=20.0, help="Network bandwidth in Mbit/s")
+    tiered.set_defaults(handler=run_tiered)
+
+    profile = subparsers.add_parser('profile', help="Fixed-memory streaming profile of a trace")
+    add_trace_arguments(profile)
+    profile.add_argument('--precision', type=int, default=14, help="HyperLogLog index bits")
+    profile.add_argument('--epsilon', type=float, default=0.001, help="Count-Min error fraction")
+    profile.add_argument('--delta', type=float, default=0.01, help="Count-Min failure probability")
+    profile.add_argument('--top-k', type=int, default=100, help="Heavy-hitter counters")
+    profile.add_argument('--top', type=int, default=5, help="Heavy hitters to print")
+    profile.set_defaults(handler=run_profile)
+
+    convert = subparsers.add_parser('convert-trace', help="Convert a memory trace between formats")
+    convert.add_argument('input')
+    convert.add_argument('output')
+    convert.add_argument('--input-format', choices=['auto', 'lackey', 'din', 'csv', 'hex', 'dec', 'npy'],
+                         help="Input format (default: npy by extension, otherwise detected)")
+    convert.add_argument('--output-format', choices=['hex', 'npy'])
+    convert.set_defaults(handler=run_convert_trace)
+
+    plot = subparsers.add_parser('plot', help="Render plots from a saved results file")
+    plot.add_argument('results', help="JSON written by simulate, sweep or profile")
+    plot.set_defaults(handler=run_plot)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.config:
+        Config.load_file(args.config)
+    Config.update(results_dir=args.results_dir)
+
+    # Fill unset arguments from the configuration
+    defaults = {
+        'trace': Config.TRACE_FILE_PATH,
+        'cache_size': Config.CACHE_SIZE,
+        'block_size': Config.BLOCK_SIZE,
+        'capacity': Config.CACHE_SIZE,
+        'block_sizes': [Config.BLOCK_SIZE],
+    }
+    for name, default in defaults.items():
+        if hasattr(args, name) and getattr(args, name) is None:
+            setattr(args, name, default)
+
+    args.handler(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
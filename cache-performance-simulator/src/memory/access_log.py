@@ -0,0 +1,105 @@
+"""
+Streaming reader for HTTP access logs in Common or Combined Log Format.
+
+    127.0.0.1 - frank [10/Oct/2000:13:55:36 -0700] "GET /a.gif HTTP/1.0" 200 2326 "http://ref/" "Mozilla/4.08"
+
+Each request is turned into a (client, url) pair. The client is the remote
+host, the authenticated user, or the value of a cookie logged anywhere on
+the line (e.g. with a trailing "%{Cookie}i" field).
+"""
+import gzip
+import re
+
+_LOG_LINE = re.compile(
+    r'^(?P<host>\S+) \S+ (?P<user>\S+) \[[^\]]*\] '
+    r'"(?P<method>[A-Z]+) (?P<url>\S+)[^"]*" (?P<status>\d{3}) (?P<bytes>\d+|-)'
+)
+
+CLIENT_KEYS = ('ip', 'user', 'cookie')
+
+
+class AccessLogReader:
+    """
+    Iterates over the cacheable requests of an access log, line by line.
+
+    Malformed lines are counted and the first few are kept for reporting;
+    requests filtered out by method or status are counted separately.
+    """
+    def __init__(self, file_path, client_key='ip', cookie_name=None, methods=('GET',),
+                 statuses=(200, 203, 206, 304), with_sizes=False, max_errors=20):
+        """
+        Args:
+            file_path (str): Log file, optionally gzip-compressed (.gz)
+            client_key (str): 'ip', 'user' or 'cookie'
+            cookie_name (str): Cookie identifying the client for client_key='cookie';
+                requests without it fall back to the remote host
+            methods (tuple): Request methods to replay
+            statuses (tuple): Response statuses to replay (None for all)
+            with_sizes (bool): Yield (client, url, size) with the logged response
+                size in bytes (0 when not logged, e.g. for 304 responses)
+            max_errors (int): Malformed lines kept in errors
+        """
+        if client_key not in CLIENT_KEYS:
+            raise ValueError(f"Unknown client key: {client_key}")
+        if client_key == 'cookie' and not cookie_name:
+            raise ValueError("client_key='cookie' needs a cookie_name")
+
+        self.file_path = file_path
+        self.client_key = client_key
+        self.cookie = re.compile(re.escape(cookie_name) + r'=([^;"\s]+)') if cookie_name else None
+        self.methods = set(methods)
+        self.statuses = {str(status) for status in statuses} if statuses else None
+        self.with_sizes = with_sizes
+        self.max_errors = max_errors
+
+        self.lines = 0
+        self.requests = 0
+        self.filtered = 0
+        self.malformed = 0
+        self.errors = []
+
+    def _open(self):
+        if self.file_path.endswith('.gz'):
+            return gzip.open(self.file_path, 'rt', encoding='utf-8', errors='replace')
+        return open(self.file_path, 'r', encoding='utf-8', errors='replace')
+
+    def __iter__(self):
+        match_line = _LOG_LINE.match
+        methods = self.methods
+        statuses = self.statuses
+        client_key = self.client_key
+
+        with self._open() as file:
+            for line_number, line in enumerate(file, 1):
+                self.lines = line_number
+                match = match_line(line)
+                if match is None:
+                    if line.strip():
+                        self.malformed += 1
+                        if len(self.errors) < self.max_errors:
+                            self.errors.append((line_number, line.strip()))
+                    continue
+
+                method, url, status, host, user = match.group('method', 'url', 'status', 'host', 'user')
+                if method not in methods or (statuses is not None and status not in statuses):
+                    self.filtered += 1
+                    continue
+
+                if client_key == 'ip':
+                    client = host
+                elif client_key == 'user':
+                    client = user
+                else:
+                    cookie = self.cookie.search(line, match.end())
+                    client = cookie.group(1) if cookie else host
+
+                self.requests += 1
+                if self.with_sizes:
+                    size = match.group('bytes')
+                    yield client, url, int(size) if size != '-' else 0
+                else:
+                    yield client, url
+
+        if self.malformed:
+            print(f"Warning: skipped {self.malformed} malformed line(s) in {self.file_path}, "
+                  f"first on line {self.errors[0][0]}")
@@ -36,4 +36,58 @@ def generate_access_pattern_report(access_count):
     for address, count in access_count.items():
         report_lines.append(f"{address:<15} {count:<10}")
         
-    return "\n".join(report_lines)
\ No newline at end of file
+    return "\n".join(report_lines)
+
+def profile_access_stream(memory_addresses, hll_precision=14, cms_epsilon=0.001, cms_delta=0.01, top_k=100):
+    """
+    Profile an access stream in fixed memory.
+
+    Unlike analyze_access_patterns, memory use does not grow with the number
+    of distinct addresses, so this works on traces that do not fit in RAM
+    when the addresses are fed in chunks.
+
+    Args:
+        memory_addresses (list, np.ndarray or iterable): Addresses (or URLs) accessed
+        hll_precision (int): HyperLogLog index bits (2**p one-byte registers)
+        cms_epsilon (float): Count-Min error as a fraction of the stream length
+        cms_delta (float): Count-Min failure probability
+        top_k (int): Number of heavy-hitter counters
+
+    Returns:
+        StreamProfile: The populated profile
+    """
+    from .sketches import StreamProfile
+
+    profile = StreamProfile(hll_precision=hll_precision, cms_epsilon=cms_epsilon,
+                            cms_delta=cms_delta, top_k=top_k)
+    profile.update_many(memory_addresses)
+    return profile
+
+
+def generate_streaming_report(profile, top_n=10):
+    """
+    Generate a report from a streaming profile, including its error bounds.
+
+    Args:
+        profile (StreamProfile): Profile built by profile_access_stream
+        top_n (int): Number of heavy hitters to list
+
+    Returns:
+        str: A formatted string report of access patterns.
+    """
+    bounds = profile.error_bounds()
+
+    report_lines = ["Streaming Access Pattern Report:"]
+    report_lines.append(f"Total accesses: {profile.total}")
+    report_lines.append(f"Distinct addresses (est.): {profile.distinct_count()} "
+                        f"(±{bounds['distinct_relative_error'] * 100:.2f}% std. error)")
+    report_lines.append(f"Frequency error: at most +{bounds['frequency_error']:.0f} accesses "
+                        f"with {bounds['frequency_confidence'] * 100:.0f}% confidence")
+    report_lines.append(f"Sketch memory: {profile.memory_bytes()} bytes")
+    report_lines.append(f"{'Address':<15} {'Count':<10} {'Lower bound':<12}")
+    report_lines.append("-" * 37)
+
+    for address, estimate, lower_bound in profile.heavy_hitters(top_n):
+        report_lines.append(f"{address:<15} {estimate:<10} {lower_bound:<12}")
+
+    return "\n".join(report_lines)
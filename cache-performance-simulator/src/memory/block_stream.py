@@ -0,0 +1,81 @@
+import numpy as np
+
+
+class BlockStream:
+    """
+    A trace converted to block addresses with consecutive repeats collapsed.
+
+    Each run is a (block, count) pair: count consecutive accesses to the same
+    block. After the first access of a run the block is always resident, so
+    a simulator only has to look up the first access and can count the rest
+    as hits.
+    """
+    def __init__(self, blocks, counts, block_size):
+        """
+        Args:
+            blocks (np.ndarray): Block address of each run
+            counts (np.ndarray): Number of accesses in each run
+            block_size (int): Block size the addresses were divided by
+        """
+        self.blocks = blocks
+        self.counts = counts
+        self.block_size = block_size
+
+    def __len__(self):
+        return len(self.blocks)
+
+    @property
+    def total_accesses(self):
+        return int(self.counts.sum())
+
+    def compression_ratio(self):
+        """
+        Accesses per run; how much work collapsing saves.
+        """
+        return self.total_accesses / len(self.blocks) if len(self.blocks) else 1.0
+
+
+def build_block_stream(addresses, block_size):
+    """
+    Convert a trace to a run-length-collapsed block-address stream.
+
+    Args:
+        addresses (list or np.ndarray): Memory addresses in trace order
+        block_size (int): Block size in bytes
+
+    Returns:
+        BlockStream: The collapsed stream
+    """
+    blocks = np.asarray(addresses, dtype=np.int64) // block_size
+    if len(blocks) == 0:
+        return BlockStream(blocks, np.zeros(0, dtype=np.int64), block_size)
+
+    # A run starts wherever the block differs from the previous access
+    starts = np.flatnonzero(np.concatenate(([True], blocks[1:] != blocks[:-1])))
+    counts = np.diff(np.append(starts, len(blocks)))
+    return BlockStream(blocks[starts], counts, block_size)
+
+
+class BlockStreamCache:
+    """
+    Builds each block-size stream of a trace once and shares it between
+    every cache configuration with that block size.
+    """
+    def __init__(self, addresses):
+        """
+        Args:
+            addresses (list or np.ndarray): Memory addresses in trace order
+        """
+        self.addresses = np.asarray(addresses, dtype=np.int64)
+        self._streams = {}
+
+    def get(self, block_size):
+        """
+        Return the collapsed stream for block_size, building it on first use.
+        """
+        if block_size not in self._streams:
+            self._streams[block_size] = build_block_stream(self.addresses, block_size)
+        return self._streams[block_size]
+
+    def clear(self):
+        self._streams.clear()
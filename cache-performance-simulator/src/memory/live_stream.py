@@ -0,0 +1,307 @@
+"""
+Live ingest of address or URL streams.
+
+Reads a stream that is still being written (stdin, a FIFO, or producers
+connecting to a local TCP or Unix socket) with asyncio, parses it in batches and feeds a simulator incrementally. Only a
+bounded number of batches is ever held: when the simulator falls behind,
+the reader stops reading, so the producer is slowed down by the pipe or
+socket buffer filling up.
+
+Sources:
+    '-'                     standard input
+    'tcp://host:port'       listen for producers on a TCP port
+    'unix:///path/to/sock'  listen for producers on a Unix socket
+    any other path          a FIFO, or a regular file read to its end
+
+A regular file is read once up to its current end; to follow a file that
+is still being appended to, pipe it in: ``tail -f trace.txt | ... stream -``.
+"""
+import asyncio
+import os
+import stat
+import sys
+import time
+from collections import deque
+
+# Bytes requested from the source per read
+_READ_SIZE = 1 << 16
+
+
+class RollingStats:
+    """
+    Cumulative and rolling-window hit rate and throughput of a live run.
+    """
+    def __init__(self, window=10.0):
+        """
+        Args:
+            window (float): Length of the rolling window in seconds
+        """
+        self.window = window
+        self.started = time.monotonic()
+        self.total_accesses = 0
+        self.hits = 0
+        self.parse_errors = 0
+        # (timestamp, accesses, hits) per batch inside the window
+        self._batches = deque()
+
+    def record(self, accesses, hits, now=None):
+        now = time.monotonic() if now is None else now
+        self.total_accesses += accesses
+        self.hits += hits
+        self._batches.append((now, accesses, hits))
+        self._expire(now)
+
+    def _expire(self, now):
+        while self._batches and self._batches[0][0] < now - self.window:
+            self._batches.popleft()
+
+    def snapshot(self, now=None):
+        """
+        Current statistics.
+
+        Returns:
+            dict: Totals, cumulative and window hit rates (percent) and
+                  window throughput in accesses per second
+        """
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        window_accesses = sum(batch[1] for batch in self._batches)
+        window_hits = sum(batch[2] for batch in self._batches)
+        span = min(self.window, now - self.started)
+        return {
+            'elapsed': now - self.started,
+            'total_accesses': self.total_accesses,
+            'hits': self.hits,
+            'misses': self.total_accesses - self.hits,
+            'hit_rate': self.hits / self.total_accesses * 100.0 if self.total_accesses else 0.0,
+            'window_hit_rate': window_hits / window_accesses * 100.0 if window_accesses else 0.0,
+            'throughput': window_accesses / span if span > 0 else 0.0,
+            'parse_errors': self.parse_errors,
+        }
+
+
+def format_snapshot(snapshot):
+    return (f"[{snapshot['elapsed']:7.1f}s] {snapshot['total_accesses']} accesses, "
+            f"hit rate {snapshot['hit_rate']:.2f}% (window {snapshot['window_hit_rate']:.2f}%), "
+            f"{snapshot['throughput']:.0f} accesses/s")
+
+
+class LiveIngest:
+    """
+    Feeds a live stream into a CacheSimulator or BrowserLRUCache.
+    """
+    def __init__(self, simulator, kind='memory', batch_size=4096, max_pending=8,
+                 report_interval=1.0, window=10.0, on_report=None):
+        """
+        Args:
+            simulator: CacheSimulator (kind 'memory') or BrowserLRUCache (kind 'browser')
+            kind (str): 'memory' for hex addresses, 'browser' for URLs, one per line
+            batch_size (int): Maximum lines per batch
+            max_pending (int): Batches buffered between reader and simulator
+            report_interval (float): Seconds between rolling reports
+            window (float): Rolling window in seconds
+            on_report (callable): Called with each snapshot dict (defaults to printing it)
+        """
+        if kind not in ('memory', 'browser'):
+            raise ValueError(f"Unknown stream kind: {kind}")
+
+        self.simulator = simulator
+        self.kind = kind
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.report_interval = report_interval
+        self.stats = RollingStats(window)
+        self.on_report = on_report or (lambda snapshot: print(format_snapshot(snapshot)))
+        self.reports = 0
+
+    def parse_batch(self, lines):
+        """
+        Parse raw lines, skipping blank ones and counting malformed ones.
+
+        Returns:
+            list: Addresses (memory) or URLs (browser)
+        """
+        if self.kind == 'browser':
+            items = []
+            for line in lines:
+                line = line.strip()
+                if line:
+                    try:
+                        items.append(line.decode('utf-8'))
+                    except UnicodeDecodeError:
+                        self.stats.parse_errors += 1
+            return items
+
+        lines = [line for line in lines if line.strip()]
+        try:
+            return [int(line, 16) for line in lines]
+        except ValueError:
+            # Rare path: find the bad lines one by one
+            items = []
+            for line in lines:
+                try:
+                    items.append(int(line, 16))
+                except ValueError:
+                    self.stats.parse_errors += 1
+            return items
+
+    def process_batch(self, items):
+        """
+        Feed one parsed batch through the simulator and record it.
+        """
+        hits_before = self.simulator.hits
+        access = self.simulator.access_page if self.kind == 'browser' else self.simulator.access_memory
+        for item in items:
+            access(item)
+        self.stats.record(len(items), self.simulator.hits - hits_before)
+
+    async def _read_batches(self, reader, queue):
+        """
+        Split the byte stream into line batches. Waiting on a full queue
+        stops reading, which is what pushes back on the producer.
+        """
+        pending = b''
+        while True:
+            chunk = await reader.read(_READ_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for start in range(0, len(lines), self.batch_size):
+                await queue.put(lines[start:start + self.batch_size])
+        if pending:
+            await queue.put([pending])
+
+    async def _consume(self, queue):
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            self.process_batch(self.parse_batch(batch))
+            # Let the reader and reporter run between batches
+            await asyncio.sleep(0)
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.reports += 1
+            self.on_report(self.stats.snapshot())
+
+    async def _ingest_readers(self, readers):
+        """
+        Consume every reader yielded by the async iterator readers.
+        """
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        consumer = asyncio.create_task(self._consume(queue))
+        reporter = asyncio.create_task(self._report())
+        try:
+            readers_done = []
+            async for reader in readers:
+                readers_done.append(asyncio.create_task(self._read_batches(reader, queue)))
+            await asyncio.gather(*readers_done)
+            await queue.put(None)
+            await consumer
+        finally:
+            reporter.cancel()
+            consumer.cancel()
+        self.on_report(self.stats.snapshot())
+        return self.stats.snapshot()
+
+    async def run(self, source, connections=1):
+        """
+        Ingest a source until it ends.
+
+        Args:
+            source (str): '-', 'tcp://host:port', 'unix:///path' or a FIFO/file path
+            connections (int): For socket sources, stop after this many producers disconnect
+
+        Returns:
+            dict: Final statistics snapshot
+        """
+        return await self._ingest_readers(_open_source(source, connections))
+
+
+async def _open_source(source, connections):
+    """
+    Async iterator of StreamReaders for a source.
+    """
+    loop = asyncio.get_running_loop()
+
+    if source.startswith(('tcp://', 'unix://')):
+        accepted = asyncio.Queue()
+
+        async def on_connect(reader, writer):
+            await accepted.put(_ConnectionReader(reader, writer))
+
+        if source.startswith('tcp://'):
+            host, port = source[len('tcp://'):].rsplit(':', 1)
+            server = await asyncio.start_server(on_connect, host, int(port))
+        else:
+            server = await asyncio.start_unix_server(on_connect, source[len('unix://'):])
+        try:
+            for _ in range(connections):
+                yield await accepted.get()
+        finally:
+            server.close()
+            if source.startswith('unix://') and os.path.exists(source[len('unix://'):]):
+                os.unlink(source[len('unix://'):])
+        return
+
+    if source == '-':
+        pipe = sys.stdin.buffer
+    else:
+        pipe = open(source, 'rb')
+
+    mode = os.fstat(pipe.fileno()).st_mode
+    if stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode):
+        reader = asyncio.StreamReader(limit=_READ_SIZE * 4)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        yield reader
+    else:
+        # Regular files cannot be polled; read them in a worker thread
+        yield _FileReader(pipe, loop)
+
+
+class _FileReader:
+    """
+    Minimal StreamReader stand-in for regular files.
+    """
+    def __init__(self, file, loop):
+        self.file = file
+        self.loop = loop
+
+    async def read(self, size):
+        chunk = await self.loop.run_in_executor(None, self.file.read, size)
+        if not chunk:
+            self.file.close()
+        return chunk
+
+
+class _ConnectionReader:
+    """
+    StreamReader of an accepted connection that closes the connection once
+    the producer's data has been read to its end.
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def read(self, size):
+        chunk = await self.reader.read(size)
+        if not chunk:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        return chunk
+
+
+def ingest(simulator, source, kind='memory', connections=1, **options):
+    """
+    Run a live ingest to completion (see LiveIngest for the options).
+
+    Returns:
+        dict: Final statistics snapshot
+    """
+    return asyncio.run(LiveIngest(simulator, kind, **options).run(source, connections))
@@ -0,0 +1,159 @@
+"""
+Named address ranges (data structures, heap arenas, stacks) with a sorted
+interval index for attributing cache events to the data they touch.
+
+A region map file has one region per line, either
+
+    name start end         matrix 0x601040 0x641040   (end exclusive)
+
+or the output of `nm -S` (hex address and size without a 0x prefix):
+
+    0000000000601040 0000000000040000 B matrix
+
+Blank lines and lines starting with '#' are ignored.
+"""
+import numpy as np
+
+UNMAPPED = '(unmapped)'
+
+
+class RegionMap:
+    """
+    Non-overlapping named address ranges, kept sorted by start address so
+    a whole batch of addresses is resolved with one searchsorted call.
+    """
+    def __init__(self, regions=()):
+        """
+        Initialize the region map.
+
+        Args:
+            regions (iterable): (name, start, end) tuples, end exclusive, in any order
+
+        Raises:
+            ValueError: If a range is empty or two ranges overlap
+        """
+        regions = list(regions)
+        names = [name for name, _, _ in regions]
+        starts = np.array([start for _, start, _ in regions], dtype=np.int64)
+        ends = np.array([end for _, _, end in regions], dtype=np.int64)
+
+        order = np.argsort(starts, kind='stable')
+        self.names = [names[index] for index in order.tolist()]
+        self.starts = starts[order]
+        self.ends = ends[order]
+
+        empty = np.flatnonzero(self.ends <= self.starts)
+        if len(empty):
+            index = int(empty[0])
+            raise ValueError(f"Region {self.names[index]} is empty: {self.starts[index]:#x}-{self.ends[index]:#x}")
+        overlapping = np.flatnonzero(self.ends[:-1] > self.starts[1:])
+        if len(overlapping):
+            index = int(overlapping[0])
+            raise ValueError(f"Region {self.names[index + 1]} ({self.starts[index + 1]:#x}-{self.ends[index + 1]:#x}) "
+                             f"overlaps region {self.names[index]}")
+
+    def add(self, name, start, end):
+        """
+        Add a region, keeping the index sorted. Regions must be added before
+        the map is given to a CacheInstrumentation.
+
+        Raises:
+            ValueError: If the range is empty or overlaps an existing region
+        """
+        if end <= start:
+            raise ValueError(f"Region {name} is empty: {start:#x}-{end:#x}")
+        position = int(np.searchsorted(self.starts, start))
+        if (position > 0 and self.ends[position - 1] > start) or \
+                (position < len(self.starts) and self.starts[position] < end):
+            raise ValueError(f"Region {name} ({start:#x}-{end:#x}) overlaps another region")
+        self.names.insert(position, name)
+        self.starts = np.insert(self.starts, position, start)
+        self.ends = np.insert(self.ends, position, end)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Read a region map file.
+
+        Args:
+            file_path (str): 'name start end' lines or `nm -S` output
+
+        Returns:
+            RegionMap: The regions, or None if the file does not exist
+        """
+        try:
+            with open(file_path, 'r') as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            print(f"Error: The file {file_path} was not found.")
+            return None
+
+        regions = []
+        for line_number, line in enumerate(lines, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            try:
+                if len(fields) == 4:
+                    start, size = int(fields[0], 16), int(fields[1], 16)
+                    regions.append((fields[3], start, start + size))
+                elif len(fields) == 3:
+                    regions.append((fields[0], int(fields[1], 0), int(fields[2], 0)))
+                else:
+                    raise ValueError(f"expected 3 or 4 fields, got {len(fields)}")
+            except ValueError as error:
+                raise ValueError(f"{file_path}:{line_number}: {error}") from None
+        return cls(regions)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return zip(self.names, self.starts.tolist(), self.ends.tolist())
+
+    def lookup(self, addresses):
+        """
+        Region index of each address.
+
+        Args:
+            addresses (array-like): Addresses to resolve
+
+        Returns:
+            np.ndarray: Index into names for each address, len(self) for
+                        addresses outside every region
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        position = np.searchsorted(self.starts, addresses, side='right') - 1
+        inside = position >= 0
+        inside[inside] = addresses[inside] < self.ends[position[inside]]
+        return np.where(inside, position, len(self.names))
+
+    def check_aligned(self, block_size):
+        """
+        Check that every region starts and ends on a block boundary, so the
+        region of a block is the region of each address in it.
+
+        Args:
+            block_size (int): Block size in bytes
+
+        Raises:
+            ValueError: Naming the first region with an unaligned bound
+        """
+        unaligned = np.flatnonzero((self.starts % block_size != 0) | (self.ends % block_size != 0))
+        if len(unaligned):
+            index = int(unaligned[0])
+            raise ValueError(f"Region {self.names[index]} ({self.starts[index]:#x}-{self.ends[index]:#x}) "
+                             f"is not aligned to {block_size}-byte blocks")
+
+    def region_of(self, address):
+        """
+        Name of the region containing one address, or None.
+        """
+        index = int(self.lookup([address])[0])
+        return self.names[index] if index < len(self.names) else None
+
+    def labels(self):
+        """
+        Region names followed by the label used for unmapped addresses, in lookup() index order.
+        """
+        return self.names + [UNMAPPED]
@@ -0,0 +1,395 @@
+import hashlib
+import heapq
+import math
+from collections import Counter
+
+import numpy as np
+
+_MASK64 = (1 << 64) - 1
+
+
+def _splitmix64(values):
+    """
+    Mix a NumPy array of integers into well-distributed 64-bit hashes.
+
+    Args:
+        values (np.ndarray): Integer keys (any integer dtype)
+
+    Returns:
+        np.ndarray: uint64 hashes, one per key
+    """
+    z = np.asarray(values).astype(np.uint64, copy=True)
+    with np.errstate(over='ignore'):
+        z += np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return z
+
+
+def _hash_string(key):
+    """
+    Hash a string key to a stable 64-bit integer.
+
+    Python's built-in hash() is salted per process, so it cannot be used
+    for reproducible sketches.
+    """
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def hash_keys(keys):
+    """
+    Hash a batch of keys (integers or strings) to 64-bit values.
+
+    Args:
+        keys (np.ndarray or iterable): Integer addresses or string keys such as URLs
+
+    Returns:
+        np.ndarray: uint64 hashes, one per key
+    """
+    if isinstance(keys, np.ndarray) and keys.dtype.kind in 'iu':
+        return _splitmix64(keys)
+
+    keys = list(keys)
+    if keys and isinstance(keys[0], str):
+        hashes = np.fromiter((_hash_string(key) for key in keys), dtype=np.uint64, count=len(keys))
+        return hashes
+    return _splitmix64(np.asarray(keys, dtype=np.int64))
+
+
+def _bit_length(values):
+    """
+    Exact vectorized bit length of uint64 values (0 has bit length 0).
+    """
+    x = values.copy()
+    length = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        wide = x >= np.uint64(1 << shift)
+        length += shift * wide
+        x = np.where(wide, x >> np.uint64(shift), x)
+    length += (x > 0)
+    return length
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count estimator with a fixed number of registers.
+    """
+    def __init__(self, precision=14):
+        """
+        Initialize the estimator.
+
+        Args:
+            precision (int): Number of index bits p; the sketch keeps 2**p one-byte registers
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = np.zeros(self.num_registers, dtype=np.uint8)
+
+        if self.num_registers >= 128:
+            self.alpha = 0.7213 / (1 + 1.079 / self.num_registers)
+        else:
+            self.alpha = {16: 0.673, 32: 0.697, 64: 0.709}[self.num_registers]
+
+    def add_hashes(self, hashes):
+        """
+        Add a batch of 64-bit hashes to the sketch.
+
+        Args:
+            hashes (np.ndarray): uint64 hashes
+        """
+        if len(hashes) == 0:
+            return
+
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        # Position of the leftmost 1-bit in the remaining bits (1-based)
+        rho = (remaining_bits - _bit_length(rest) + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rho)
+
+    def estimate(self):
+        """
+        Estimate the number of distinct keys seen so far.
+
+        Returns:
+            float: Estimated distinct count
+        """
+        m = self.num_registers
+        raw = self.alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def relative_error(self):
+        """
+        Standard error of the estimate, relative to the true count.
+        """
+        return 1.04 / math.sqrt(self.num_registers)
+
+    def memory_bytes(self):
+        return self.registers.nbytes
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch giving over-estimates of per-key frequencies.
+    """
+    def __init__(self, epsilon=0.001, delta=0.01):
+        """
+        Initialize the sketch.
+
+        With probability at least 1 - delta, every estimate exceeds the true
+        count by at most epsilon * total.
+
+        Args:
+            epsilon (float): Additive error as a fraction of the stream length
+            delta (float): Probability that the error bound is exceeded
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1.0 / delta)))
+        self.counts = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    def _indices(self, hashes):
+        # Kirsch-Mitzenmacher: derive every row's hash from two halves of one hash
+        h1 = (hashes & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        h2 = (hashes >> np.uint64(32)).astype(np.int64)
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add_hashes(self, hashes, weights=None):
+        """
+        Add a batch of hashed keys to the sketch.
+
+        Args:
+            hashes (np.ndarray): uint64 hashes
+            weights (np.ndarray): Optional count for each hash (defaults to 1)
+        """
+        if len(hashes) == 0:
+            return
+
+        for row, index in enumerate(self._indices(hashes)):
+            self.counts[row] += np.bincount(index, weights=weights, minlength=self.width).astype(np.int64)
+        self.total += int(len(hashes) if weights is None else np.sum(weights))
+
+    def estimate_hashes(self, hashes):
+        """
+        Estimate the frequency of a batch of hashed keys.
+
+        Returns:
+            np.ndarray: Over-estimated counts, one per hash
+        """
+        rows = [self.counts[row][index] for row, index in enumerate(self._indices(hashes))]
+        return np.min(rows, axis=0)
+
+    def estimate(self, key):
+        return int(self.estimate_hashes(hash_keys([key]))[0])
+
+    def error_bound(self):
+        """
+        Maximum over-estimate (in accesses) that holds with probability 1 - delta.
+        """
+        return self.epsilon * self.total
+
+    def memory_bytes(self):
+        return self.counts.nbytes
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k tracker that keeps at most k counters.
+
+    Each monitored key stores its count and the maximum amount by which
+    that count may be over-estimated.
+    """
+    def __init__(self, k=100):
+        """
+        Initialize the tracker.
+
+        Args:
+            k (int): Number of counters to keep
+        """
+        if k < 1:
+            raise ValueError("Space-Saving needs at least one counter")
+
+        self.k = k
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # Lazy min-heap of (count, key); stale entries are skipped on pop
+        self._heap = []
+
+    def update(self, key, weight=1):
+        """
+        Count weight occurrences of key.
+        """
+        self.total += weight
+
+        if key in self.counts:
+            self.counts[key] += weight
+        elif len(self.counts) < self.k:
+            self.counts[key] = weight
+            self.errors[key] = 0
+        else:
+            # Replace the key with the smallest count and inherit its count as error
+            min_count, min_key = self._pop_min()
+            del self.counts[min_key]
+            del self.errors[min_key]
+            self.counts[key] = min_count + weight
+            self.errors[key] = min_count
+
+        heapq.heappush(self._heap, (self.counts[key], key))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(count, k) for k, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return count, key
+
+    def update_counts(self, counts):
+        """
+        Apply a batch of pre-aggregated (key, count) pairs.
+        """
+        for key, weight in counts:
+            self.update(key, weight)
+
+    def top(self, n):
+        """
+        Return the n keys with the highest counts.
+
+        Returns:
+            list: (key, count, error) tuples, highest count first
+        """
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+    def error_bound(self):
+        """
+        Maximum over-estimate of any monitored count.
+        """
+        return self.total / self.k
+
+
+class StreamProfile:
+    """
+    Fixed-memory profile of an access stream.
+
+    Combines HyperLogLog for the distinct count with a Count-Min sketch and
+    a Space-Saving tracker for the heavy hitters, so memory does not grow
+    with the number of distinct keys.
+    """
+    def __init__(self, hll_precision=14, cms_epsilon=0.001, cms_delta=0.01, top_k=100, batch_size=65536):
+        """
+        Initialize the profile.
+
+        Args:
+            hll_precision (int): HyperLogLog index bits (2**p registers)
+            cms_epsilon (float): Count-Min additive error as a fraction of the stream length
+            cms_delta (float): Count-Min failure probability
+            top_k (int): Number of Space-Saving counters
+            batch_size (int): Keys processed per vectorized batch
+        """
+        self.hll = HyperLogLog(hll_precision)
+        self.cms = CountMinSketch(cms_epsilon, cms_delta)
+        self.space_saving = SpaceSaving(top_k)
+        self.batch_size = batch_size
+        self.total = 0
+
+    def update(self, key):
+        """
+        Add a single key to the profile.
+        """
+        self.update_many([key])
+
+    def update_many(self, keys):
+        """
+        Add a batch of keys (integer addresses or string URLs) to the profile.
+
+        Args:
+            keys (np.ndarray or iterable): Keys in stream order
+        """
+        if isinstance(keys, np.ndarray):
+            for start in range(0, len(keys), self.batch_size):
+                self._add_batch(keys[start:start + self.batch_size])
+            return
+
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= self.batch_size:
+                self._add_batch(batch)
+                batch = []
+        if batch:
+            self._add_batch(batch)
+
+    def _add_batch(self, batch):
+        hashes = hash_keys(batch)
+        self.hll.add_hashes(hashes)
+        self.cms.add_hashes(hashes)
+
+        if isinstance(batch, np.ndarray):
+            unique, counts = np.unique(batch, return_counts=True)
+            self.space_saving.update_counts(zip(unique.tolist(), counts.tolist()))
+        else:
+            self.space_saving.update_counts(Counter(batch).items())
+
+        self.total += len(batch)
+
+    def distinct_count(self):
+        """
+        Estimated number of distinct keys.
+        """
+        return int(round(self.hll.estimate()))
+
+    def heavy_hitters(self, n=10):
+        """
+        Return the n most frequent keys.
+
+        Returns:
+            list: (key, estimate, lower_bound) tuples, most frequent first.
+                  The true count lies between lower_bound and estimate.
+        """
+        top = self.space_saving.top(n)
+        if not top:
+            return []
+
+        cms_estimates = self.cms.estimate_hashes(hash_keys([key for key, _, _ in top]))
+        hitters = []
+        for (key, count, error), cms_count in zip(top, cms_estimates.tolist()):
+            hitters.append((key, min(count, cms_count), count - error))
+        return hitters
+
+    def error_bounds(self):
+        """
+        Error bounds for the estimates in this profile.
+
+        Returns:
+            dict: Relative distinct-count error and absolute frequency errors
+        """
+        return {
+            'distinct_relative_error': self.hll.relative_error(),
+            'frequency_error': min(self.cms.error_bound(), self.space_saving.error_bound()),
+            'frequency_confidence': 1.0 - self.cms.delta,
+        }
+
+    def memory_bytes(self):
+        """
+        Approximate memory used by the sketch tables (excluding the top-k keys).
+        """
+        return self.hll.memory_bytes() + self.cms.memory_bytes() + 16 * self.space_saving.k
@@ -0,0 +1,256 @@
+from collections import OrderedDict
+
+import numpy as np
+
+PAGE_SIZES = {'4K': 4 << 10, '2M': 2 << 20, '1G': 1 << 30}
+
+# Page-table levels walked on a TLB miss (x86-64 four-level paging: huge
+# pages stop the walk early)
+WALK_LEVELS = {PAGE_SIZES['4K']: 4, PAGE_SIZES['2M']: 3, PAGE_SIZES['1G']: 2}
+
+
+def parse_page_size(page_size):
+    """
+    Convert '4K', '2M', '1G' or a byte count to bytes.
+    """
+    if isinstance(page_size, str):
+        if page_size.upper() not in PAGE_SIZES:
+            raise ValueError(f"Unknown page size: {page_size}")
+        return PAGE_SIZES[page_size.upper()]
+    if page_size not in WALK_LEVELS:
+        raise ValueError(f"Unsupported page size: {page_size}")
+    return page_size
+
+
+class PageTable:
+    """
+    Virtual-to-physical mapping with first-touch frame allocation.
+
+    Memory is mapped with the default page size except inside huge-page
+    regions. Physical frames are handed out in first-touch order, aligned
+    to their page size.
+    """
+    def __init__(self, default_page_size='4K', huge_page_regions=None):
+        """
+        Initialize the page table.
+
+        Args:
+            default_page_size (str or int): Page size outside the huge-page regions
+            huge_page_regions (list): (start, end, page_size) virtual ranges backed by larger pages
+        """
+        self.default_page_size = parse_page_size(default_page_size)
+
+        regions = sorted((start, end, parse_page_size(size)) for start, end, size in (huge_page_regions or []))
+        self.region_starts = np.array([start for start, _, _ in regions], dtype=np.int64)
+        self.region_ends = np.array([end for _, end, _ in regions], dtype=np.int64)
+        self.region_sizes = np.array([size for _, _, size in regions], dtype=np.int64)
+
+        self.frames = {}
+        self.next_physical = 0
+
+    def page_sizes_for(self, addresses):
+        """
+        Vectorized page size of each virtual address.
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        sizes = np.full(addresses.shape, self.default_page_size, dtype=np.int64)
+        if len(self.region_starts):
+            region = np.searchsorted(self.region_starts, addresses, side='right') - 1
+            inside = (region >= 0) & (addresses < self.region_ends[np.maximum(region, 0)])
+            sizes[inside] = self.region_sizes[region[inside]]
+        return sizes
+
+    def page_size_for(self, address):
+        return int(self.page_sizes_for([address])[0])
+
+    def frame_for(self, vpn, page_size):
+        """
+        Physical base address of a virtual page, allocating it on first touch.
+        """
+        key = (vpn, page_size)
+        frame = self.frames.get(key)
+        if frame is None:
+            frame = -(-self.next_physical // page_size) * page_size  # Align up
+            self.next_physical = frame + page_size
+            self.frames[key] = frame
+        return frame
+
+    def translate(self, address):
+        page_size = self.page_size_for(address)
+        return self.frame_for(address // page_size, page_size) + address % page_size
+
+
+class TLB:
+    """
+    Set-associative TLB with LRU replacement.
+
+    Entries for all page sizes share the structure; an entry is keyed by
+    (virtual page number, page size).
+    """
+    def __init__(self, entries=64, associativity=4):
+        """
+        Initialize the TLB.
+
+        Args:
+            entries (int): Total number of entries
+            associativity (int): Entries per set (entries for a fully associative TLB)
+        """
+        if entries % associativity:
+            raise ValueError("entries must be a multiple of associativity")
+
+        self.entries = entries
+        self.associativity = associativity
+        self.num_sets = entries // associativity
+        self.sets = [OrderedDict() for _ in range(self.num_sets)]
+
+        self.total_accesses = 0
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, vpn, page_size):
+        """
+        Look up a translation, filling it on a miss.
+
+        Returns:
+            bool: True for a TLB hit
+        """
+        self.total_accesses += 1
+        entries = self.sets[vpn % self.num_sets]
+        key = (vpn, page_size)
+
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        if len(entries) >= self.associativity:
+            entries.popitem(last=False)
+        entries[key] = True
+        return False
+
+    def get_hit_rate(self):
+        if self.total_accesses == 0:
+            return 0.0
+        return (self.hits / self.total_accesses) * 100.0
+
+
+class MMU:
+    """
+    Address translation in front of a data cache.
+
+    Every virtual address goes through the TLB; a miss costs a page walk of
+    one memory reference per page-table level. The translated physical
+    address is then passed to the data cache, if one is attached.
+    """
+    def __init__(self, tlb=None, page_table=None, data_cache=None, walk_cycles_per_level=20):
+        """
+        Initialize the MMU.
+
+        Args:
+            tlb (TLB): TLB to use (defaults to 64 entries, 4-way)
+            page_table (PageTable): Mapping to use (defaults to 4K pages everywhere)
+            data_cache: Optional simulator with access_memory(address), e.g. CacheSimulator
+            walk_cycles_per_level (int): Cost of reading one page-table level
+        """
+        self.tlb = tlb or TLB()
+        self.page_table = page_table or PageTable()
+        self.data_cache = data_cache
+        self.walk_cycles_per_level = walk_cycles_per_level
+
+        self.page_walks = 0
+        self.walk_cycles = 0
+        self.walks_by_page_size = {}
+
+    def _walk(self, page_size):
+        self.page_walks += 1
+        self.walk_cycles += WALK_LEVELS[page_size] * self.walk_cycles_per_level
+        self.walks_by_page_size[page_size] = self.walks_by_page_size.get(page_size, 0) + 1
+
+    def access(self, address):
+        """
+        Translate one virtual address and access the data cache with it.
+
+        Returns:
+            int: The physical address
+        """
+        page_size = self.page_table.page_size_for(address)
+        vpn = address // page_size
+        if not self.tlb.lookup(vpn, page_size):
+            self._walk(page_size)
+
+        physical = self.page_table.frame_for(vpn, page_size) + address % page_size
+        if self.data_cache is not None:
+            self.data_cache.access_memory(physical)
+        return physical
+
+    def simulate(self, addresses):
+        """
+        Translate a whole trace.
+
+        Page sizes are computed in one vectorized pass and consecutive
+        accesses to the same page are collapsed, since only the first can
+        miss in the TLB. Results match calling access() per address.
+
+        Args:
+            addresses (list or np.ndarray): Virtual addresses in trace order
+
+        Returns:
+            np.ndarray: Physical addresses
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        if len(addresses) == 0:
+            return addresses.copy()
+
+        page_sizes = self.page_table.page_sizes_for(addresses)
+        vpns = addresses // page_sizes
+
+        starts = np.flatnonzero(np.concatenate(([True], (vpns[1:] != vpns[:-1]) | (page_sizes[1:] != page_sizes[:-1]))))
+        counts = np.diff(np.append(starts, len(addresses)))
+
+        frames = np.empty(len(starts), dtype=np.int64)
+        for run, (vpn, page_size, count) in enumerate(zip(vpns[starts].tolist(), page_sizes[starts].tolist(),
+                                                          counts.tolist())):
+            if not self.tlb.lookup(vpn, page_size):
+                self._walk(page_size)
+            # The rest of the run hits the entry just filled
+            self.tlb.total_accesses += count - 1
+            self.tlb.hits += count - 1
+            frames[run] = self.page_table.frame_for(vpn, page_size)
+
+        physical = np.repeat(frames, counts) + addresses % page_sizes
+        if self.data_cache is not None:
+            for address in physical.tolist():
+                self.data_cache.access_memory(address)
+        return physical
+
+    def report(self):
+        """
+        TLB and page-walk statistics.
+
+        Returns:
+            dict: TLB hit rate, walks, walk cycles and average walk overhead per access
+        """
+        accesses = self.tlb.total_accesses
+        return {
+            'accesses': accesses,
+            'tlb_hits': self.tlb.hits,
+            'tlb_misses': self.tlb.misses,
+            'tlb_hit_rate': self.tlb.get_hit_rate(),
+            'page_walks': self.page_walks,
+            'walk_cycles': self.walk_cycles,
+            'walk_cycles_per_access': self.walk_cycles / accesses if accesses else 0.0,
+            'walks_by_page_size': dict(self.walks_by_page_size),
+        }
+
+    def print_stats(self):
+        """
+        Print TLB and page-walk statistics.
+        """
+        report = self.report()
+        print(f"Total translations: {report['accesses']}")
+        print(f"TLB hits: {report['tlb_hits']}")
+        print(f"TLB misses: {report['tlb_misses']}")
+        print(f"TLB hit rate: {report['tlb_hit_rate']:.2f}%")
+        print(f"Page walks: {report['page_walks']} ({report['walk_cycles']} cycles, "
+              f"{report['walk_cycles_per_access']:.2f} cycles/access)")
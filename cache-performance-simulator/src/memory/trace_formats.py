@@ -0,0 +1,399 @@
+"""
+Parsers for standard memory trace formats.
+
+Supported formats:
+    lackey  Valgrind Lackey (--trace-mem=yes) output: " L 0421c7f0,8"
+    din     Dinero IV din records: "<label> <hex address>", label 0 read,
+            1 write, 2 instruction fetch, 3 unknown access, 4 cache flush
+    csv     CSV with a header row naming the address column and optionally
+            the op and size columns
+    hex     One hexadecimal address per line (the load_memory_trace format)
+    dec     One decimal address per line
+
+The whole file is tokenized and converted with NumPy, one chunk at a time,
+instead of line by line in Python. Malformed lines are skipped and
+reported with their line numbers rather than ending the parse.
+"""
+import re
+
+import numpy as np
+
+# Access types
+OP_READ, OP_WRITE, OP_IFETCH, OP_MODIFY, OP_OTHER = range(5)
+OP_NAMES = {OP_READ: 'read', OP_WRITE: 'write', OP_IFETCH: 'ifetch', OP_MODIFY: 'modify', OP_OTHER: 'other'}
+
+FORMATS = ('lackey', 'din', 'csv', 'hex', 'dec')
+
+# Column names recognized in CSV headers, in order of preference
+CSV_ADDRESS_COLUMNS = ('address', 'addr', 'vaddr', 'ea')
+CSV_OP_COLUMNS = ('op', 'type', 'access', 'rw', 'kind')
+CSV_SIZE_COLUMNS = ('size', 'bytes', 'len')
+
+_INVALID = 255
+
+
+def _lookup_table(mapping):
+    table = np.full(256, _INVALID, dtype=np.uint8)
+    for chars, value in mapping.items():
+        for char in chars:
+            table[ord(char)] = value
+    return table
+
+
+_LACKEY_OPS = _lookup_table({'I': OP_IFETCH, 'L': OP_READ, 'S': OP_WRITE, 'M': OP_MODIFY})
+_DIN_LABELS = _lookup_table({'0': OP_READ, '1': OP_WRITE, '2': OP_IFETCH, '3': OP_OTHER, '4': OP_OTHER})
+_CSV_OPS = _lookup_table({'rRlL0': OP_READ, 'wWsS1': OP_WRITE, 'iI2': OP_IFETCH, 'mM': OP_MODIFY})
+
+_SNIFF_PATTERNS = {
+    'lackey': re.compile(r'^\s*[ILSM]\s+(0x)?[0-9a-fA-F]+,\d+\s*$'),
+    'din': re.compile(r'^\s*[0-4]\s+(0x)?[0-9a-fA-F]+(\s.*)?$'),
+    'hex': re.compile(r'^\s*(0x)?[0-9a-fA-F]+\s*$'),
+}
+
+
+class ParsedTrace:
+    """
+    A parsed trace as NumPy arrays.
+
+    Attributes:
+        addresses (np.ndarray): int64 addresses in trace order
+        ops (np.ndarray): uint8 access types (OP_READ, OP_WRITE, ...)
+        sizes (np.ndarray): int32 access sizes, 0 where the format has none
+        errors (list): (line_number, line) of the first malformed lines
+        error_count (int): Total number of malformed lines
+        trace_format (str): Format the trace was parsed as
+    """
+    def __init__(self, addresses, ops, sizes, errors, error_count, trace_format):
+        self.addresses = addresses
+        self.ops = ops
+        self.sizes = sizes
+        self.errors = errors
+        self.error_count = error_count
+        self.trace_format = trace_format
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def to_records(self):
+        """
+        The trace as one structured array with address, op and size fields.
+        """
+        records = np.empty(len(self), dtype=[('address', np.int64), ('op', np.uint8), ('size', np.int32)])
+        records['address'] = self.addresses
+        records['op'] = self.ops
+        records['size'] = self.sizes
+        return records
+
+
+def detect_format(sample):
+    """
+    Guess the format of a trace from its first lines.
+
+    Bare numbers are taken as hex, like load_memory_trace does; decimal
+    traces have to be named explicitly.
+
+    Args:
+        sample (str): The beginning of the trace
+
+    Returns:
+        str: One of FORMATS
+    """
+    lines = [line for line in sample.splitlines()[:200]
+             if line.strip() and not line.lstrip().startswith(('==', '#'))]
+    if not lines:
+        return 'hex'
+
+    header = [name.strip().lower() for name in lines[0].split(',')]
+    if any(name in CSV_ADDRESS_COLUMNS for name in header):
+        # 'ea' alone is also a valid hex address
+        if len(header) > 1 or not _SNIFF_PATTERNS['hex'].match(lines[0]):
+            return 'csv'
+
+    for trace_format, pattern in _SNIFF_PATTERNS.items():
+        if sum(1 for line in lines if pattern.match(line)) * 2 > len(lines):
+            return trace_format
+    return 'hex'
+
+
+def _tokenize(buf):
+    """
+    Split a buffer of complete lines into whitespace/comma separated tokens.
+
+    Returns:
+        tuple: (line_starts, token_starts, token_ends, first token index of each line)
+    """
+    line_starts = np.concatenate(([0], np.flatnonzero(buf == ord('\n')) + 1))
+    # Separators are whitespace and control characters (all <= ' ') and commas
+    text = np.zeros(len(buf) + 2, dtype=bool)
+    np.greater(buf, ord(' '), out=text[1:-1])
+    text[1:-1] &= buf != ord(',')
+    # Boundaries alternate between token starts and token ends
+    boundaries = np.flatnonzero(text[1:] != text[:-1])
+    token_starts = boundaries[0::2]
+    token_ends = boundaries[1::2]
+    # Tokens never span lines, so each line's tokens are those starting inside it
+    line_tokens = np.searchsorted(token_starts, line_starts)
+    return line_starts, token_starts, token_ends, line_tokens
+
+
+def _digit_values(chars, base):
+    """
+    Digit values of ASCII characters and a mask of the valid ones.
+    """
+    decimal = chars - np.uint8(ord('0'))
+    valid = decimal < 10
+    if base == 10:
+        return decimal, valid
+    letter = (chars | np.uint8(0x20)) - np.uint8(ord('a'))
+    valid |= letter < 6
+    # '0'-'9' are 0x30-0x39; 'a'-'f' and 'A'-'F' end in 1-6 and have bit 6 set
+    values = chars & np.uint8(0x0F)
+    values += (chars >> 6) * np.uint8(9)
+    return values, valid
+
+
+def _parse_numbers(buf, starts, ends, base, max_digits):
+    """
+    Convert number tokens to integers.
+
+    Tokens are grouped by length (traces usually print fixed-width
+    numbers), so each group is converted as one 2-D array of digits. An
+    optional 0x prefix is accepted for base 16.
+
+    Returns:
+        tuple: (values as uint64, ok mask)
+    """
+    if base == 16:
+        second = buf[np.minimum(starts + 1, len(buf) - 1)]
+        prefixed = (ends - starts >= 2) & (buf[starts] == ord('0')) & ((second | 0x20) == ord('x'))
+        starts = starts + 2 * prefixed
+
+    lengths = ends - starts
+    ok = (lengths > 0) & (lengths <= max_digits)
+    values = np.zeros(len(starts), dtype=np.uint64)
+
+    for length in np.flatnonzero(np.bincount(lengths[ok])).tolist():
+        group = np.flatnonzero(ok & (lengths == length))
+        # One row of length characters per token, copied out in a single gather
+        chars = np.lib.stride_tricks.sliding_window_view(buf, length)[starts[group]]
+        group_digits, valid = _digit_values(chars, base)
+        ok[group[~valid.all(axis=1)]] = False
+
+        if base == 16:
+            # Pack digit pairs into bytes and read 8 of them as one big-endian integer
+            packed = np.zeros((len(group), 16), dtype=np.uint8)
+            packed[:, 16 - length:] = group_digits
+            packed = (packed[:, 0::2] << 4) | packed[:, 1::2]
+            values[group] = packed.view('>u8').ravel()
+        else:
+            powers = np.uint64(base) ** np.arange(length - 1, -1, -1, dtype=np.uint64)
+            values[group] = group_digits.astype(np.uint64) @ powers
+    return values, ok
+
+
+def _parse_addresses(buf, starts, ends, base):
+    if base == 16:
+        values, ok = _parse_numbers(buf, starts, ends, 16, 16)
+    else:
+        values, ok = _parse_numbers(buf, starts, ends, 10, 19)
+    # Addresses are kept as int64 like the rest of the simulator
+    ok &= values < np.uint64(1 << 63)
+    return values.astype(np.int64), ok
+
+
+class _Chunk:
+    """
+    Tokens of one chunk of lines, grouped per line.
+    """
+    def __init__(self, buf):
+        self.buf = buf
+        self.line_starts, self.starts, self.ends, line_tokens = _tokenize(buf)
+        self.num_lines = len(self.line_starts) - 1
+        self.first = line_tokens[:-1]
+        self.counts = np.diff(line_tokens)
+
+    def field(self, lines, index):
+        """
+        Start and end of token index on each of lines.
+        """
+        token = self.first[lines] + index
+        return self.starts[token], self.ends[token]
+
+    def first_char(self, lines):
+        starts, _ = self.field(lines, 0)
+        return self.buf[starts]
+
+    def skipped_lines(self):
+        """
+        Blank lines and comment lines ('#', or Valgrind's '==pid==' banner).
+        """
+        has_tokens = self.counts > 0
+        first = np.zeros(self.num_lines, dtype=np.uint8)
+        first[has_tokens] = self.first_char(np.flatnonzero(has_tokens))
+        return ~has_tokens | (first == ord('#')) | (first == ord('='))
+
+
+def _parse_chunk(chunk, trace_format, columns, base):
+    """
+    Parse one chunk.
+
+    Returns:
+        tuple: (addresses, ops, sizes, good line mask, bad line mask)
+    """
+    lines = np.arange(chunk.num_lines)
+    skipped = chunk.skipped_lines()
+    sizes = None
+
+    if trace_format == 'lackey':
+        candidates = lines[~skipped & (chunk.counts == 3)]
+        op_start, op_end = chunk.field(candidates, 0)
+        ops = _LACKEY_OPS[chunk.buf[op_start]]
+        addresses, ok = _parse_addresses(chunk.buf, *chunk.field(candidates, 1), 16)
+        size_values, size_ok = _parse_numbers(chunk.buf, *chunk.field(candidates, 2), 10, 9)
+        ok &= size_ok & (op_end - op_start == 1) & (ops != _INVALID)
+        sizes = size_values.astype(np.int32)
+    elif trace_format == 'din':
+        # Anything after the address is ignored, as Dinero IV does
+        candidates = lines[~skipped & (chunk.counts >= 2)]
+        label_start, label_end = chunk.field(candidates, 0)
+        ops = _DIN_LABELS[chunk.buf[label_start]]
+        addresses, ok = _parse_addresses(chunk.buf, *chunk.field(candidates, 1), 16)
+        ok &= (label_end - label_start == 1) & (ops != _INVALID)
+        # Label 4 flushes the cache and carries no access; it is skipped, not an error
+        flush = chunk.buf[label_start] == ord('4')
+        skipped[candidates[flush]] = True
+        candidates, ops, addresses, ok = candidates[~flush], ops[~flush], addresses[~flush], ok[~flush]
+    elif trace_format == 'csv':
+        candidates = lines[~skipped & (chunk.counts == columns['count'])]
+        addresses, ok = _parse_addresses(chunk.buf, *chunk.field(candidates, columns['address']), base)
+        if columns['op'] is not None:
+            # Op values are matched on their first character: R/read, W/write, L, S, I, M, 0-2
+            ops = _CSV_OPS[chunk.buf[chunk.field(candidates, columns['op'])[0]]]
+            ok &= ops != _INVALID
+        else:
+            ops = np.full(len(candidates), OP_READ, dtype=np.uint8)
+        if columns['size'] is not None:
+            size_values, size_ok = _parse_numbers(chunk.buf, *chunk.field(candidates, columns['size']),
+                                                  10, 9)
+            ok &= size_ok
+            sizes = size_values.astype(np.int32)
+    else:
+        candidates = lines[~skipped & (chunk.counts == 1)]
+        addresses, ok = _parse_addresses(chunk.buf, *chunk.field(candidates, 0), base)
+        ops = np.full(len(candidates), OP_READ, dtype=np.uint8)
+
+    if sizes is None:
+        sizes = np.zeros(len(candidates), dtype=np.int32)
+
+    good = np.zeros(chunk.num_lines, dtype=bool)
+    good[candidates[ok]] = True
+    return addresses[ok], ops[ok], sizes[ok], good | skipped
+
+
+def _csv_columns(header_line, address_column=None):
+    names = [name.strip().lower() for name in header_line.split(',')]
+
+    def find(candidates, required=False):
+        for name in candidates:
+            if name in names:
+                return names.index(name)
+        if required:
+            raise ValueError(f"CSV header has no address column (looked for {', '.join(candidates)})")
+        return None
+
+    return {
+        'count': len(names),
+        'address': find([address_column.lower()] if address_column else CSV_ADDRESS_COLUMNS, required=True),
+        'op': find(CSV_OP_COLUMNS),
+        'size': find(CSV_SIZE_COLUMNS),
+    }
+
+
+def _csv_radix(sample_lines, address_index):
+    """
+    16 if any sampled address is written in hex (0x prefix or a-f), else 10.
+    """
+    for line in sample_lines:
+        fields = line.split(',')
+        if len(fields) > address_index:
+            value = fields[address_index].strip().lower()
+            if value.startswith('0x') or any(c in 'abcdef' for c in value):
+                return 16
+    return 10
+
+
+def parse_trace(file_path, trace_format='auto', address_column=None, chunk_bytes=1 << 24, max_errors=20):
+    """
+    Parse a trace file into NumPy arrays.
+
+    Args:
+        file_path (str): Path to the trace file
+        trace_format (str): One of FORMATS, or 'auto' to detect it
+        address_column (str): CSV column holding the address (default: first recognized name)
+        chunk_bytes (int): Bytes parsed per vectorized chunk
+        max_errors (int): Malformed lines kept in ParsedTrace.errors (all are counted)
+
+    Returns:
+        ParsedTrace: The parsed records, or None if the file does not exist
+    """
+    try:
+        file = open(file_path, 'rb')
+    except FileNotFoundError:
+        print(f"Error: The file {file_path} was not found.")
+        return None
+
+    with file:
+        head = file.read(1 << 16)
+        sample = head.decode('utf-8', errors='replace')
+        if trace_format == 'auto':
+            trace_format = detect_format(sample)
+        elif trace_format not in FORMATS:
+            raise ValueError(f"Unknown trace format: {trace_format}")
+
+        columns = None
+        base = 10 if trace_format == 'dec' else 16
+        pending = head
+        line_offset = 0
+        if trace_format == 'csv':
+            header_end = head.index(b'\n') + 1 if b'\n' in head else len(head)
+            columns = _csv_columns(head[:header_end].decode('utf-8'), address_column)
+            base = _csv_radix(sample.splitlines()[1:1000], columns['address'])
+            pending = head[header_end:]
+            line_offset = 1
+
+        parts = ([], [], [])
+        errors = []
+        error_count = 0
+        while True:
+            data = file.read(chunk_bytes)
+            if data:
+                pending += data
+                cut = pending.rfind(b'\n') + 1
+                if cut == 0:
+                    continue
+                block, pending = pending[:cut], pending[cut:]
+            else:
+                if not pending:
+                    break
+                block, pending = pending + b'\n', b''
+
+            chunk = _Chunk(np.frombuffer(block, dtype=np.uint8))
+            addresses, ops, sizes, accounted = _parse_chunk(chunk, trace_format, columns, base)
+            for part, values in zip(parts, (addresses, ops, sizes)):
+                part.append(values)
+
+            bad = np.flatnonzero(~accounted)
+            error_count += len(bad)
+            for line in bad[:max(0, max_errors - len(errors))].tolist():
+                text = block[chunk.line_starts[line]:chunk.line_starts[line + 1]].decode('utf-8', errors='replace')
+                errors.append((line_offset + line + 1, text.strip()))
+            line_offset += chunk.num_lines
+
+    if error_count:
+        print(f"Warning: skipped {error_count} malformed line(s) in {file_path}, first on line {errors[0][0]}")
+
+    def join(values, dtype):
+        return np.concatenate(values) if values else np.zeros(0, dtype=dtype)
+
+    return ParsedTrace(join(parts[0], np.int64), join(parts[1], np.uint8), join(parts[2], np.int32),
+                       errors, error_count, trace_format)
@@ -1,24 +1,103 @@
+import os
+
+from .trace_formats import parse_trace
+
+
 def load_memory_trace(file_path):
     """
     Load memory addresses from a trace file into a list.
     
+    The file holds one hexadecimal address per line and is parsed with
+    trace_formats.parse_trace; malformed lines are reported with their line
+    numbers and skipped rather than ending the load.
+    
     Args:
         file_path (str): Path to the memory trace file.
         
     Returns:
         list: A list of memory addresses.
     """
-    addresses = []
+    parsed = parse_trace(file_path, 'hex')
+    if parsed is None:
+        return []
+    for line_number, line in parsed.errors:
+        print(f"Error: Invalid address on line {line_number}: {line}")
+    return parsed.addresses.tolist()
+
+
+def load_core_trace(file_path, num_cores=None):
+    """
+    Load a core-tagged memory trace for multi-core simulation.
+    
+    Each line is "<core> <R|W> <hex address>"; blank lines and lines
+    starting with '#' are ignored. Malformed lines are reported and skipped.
+    
+    Args:
+        file_path (str): Path to the trace file.
+        num_cores (int): If given, core IDs must be below it.
+        
+    Returns:
+        list: (core, is_write, address) tuples.
+        
+    Raises:
+        ValueError: If a core ID is negative or not below num_cores, naming the line.
+    """
+    records = []
     try:
         with open(file_path, 'r') as file:
-            for line in file:
-                # Strip whitespace and convert to integer
-                address = line.strip()
-                if address:
-                    addresses.append(int(address, 16))  # Assuming addresses are in hexadecimal
+            for line_number, line in enumerate(file, 1):
+                fields = line.split()
+                if not fields or fields[0].startswith('#'):
+                    continue
+                try:
+                    core, op, address = fields
+                    if op.upper() not in ('R', 'W'):
+                        raise ValueError(op)
+                    record = (int(core), op.upper() == 'W', int(address, 16))
+                except ValueError:
+                    print(f"Error: Invalid record on line {line_number}: {line.strip()}")
+                    continue
+                if record[0] < 0 or (num_cores is not None and record[0] >= num_cores):
+                    limit = f" (the system has {num_cores} cores)" if num_cores is not None else ""
+                    raise ValueError(f"{file_path}:{line_number}: core {record[0]} out of range{limit}: "
+                                     f"{line.strip()}")
+                records.append(record)
     except FileNotFoundError:
         print(f"Error: The file {file_path} was not found.")
-    except ValueError:
-        print("Error: Invalid address format in the trace file.")
     
-    return addresses
\ No newline at end of file
+    return records
+
+
+def save_browsing_pattern(browsing_pattern, filename):
+    """
+    Save the browsing pattern to a file.
+    
+    Args:
+        browsing_pattern (list): List of URLs
+        filename (str): Path to save the file
+    """
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w') as f:
+        for url in browsing_pattern:
+            f.write(f"{url}\n")
+    print(f"Browsing pattern saved to {filename}")
+
+def load_browsing_pattern(filename):
+    """
+    Load a browsing pattern from a file.
+    
+    Args:
+        filename (str): Path to the file
+        
+    Returns:
+        list: List of URLs
+    """
+    if not os.path.exists(filename):
+        print(f"File {filename} does not exist.")
+        return []
+    
+    with open(filename, 'r') as f:
+        urls = [line.strip() for line in f if line.strip()]
+    
+    print(f"Loaded {len(urls)} URLs from {filename}")
+    return urls
@@ -0,0 +1,183 @@
+import numpy as np
+
+
+def _rng(seed):
+    """
+    Build a NumPy random generator from a seed, or pass a generator through.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def zipf_stream(n, num_blocks=1024, alpha=1.0, base=0, block_size=4, scatter=True, seed=None):
+    """
+    Generate accesses whose block popularity follows a bounded Zipf distribution.
+
+    Args:
+        n (int): Number of accesses
+        num_blocks (int): Number of distinct blocks
+        alpha (float): Skew; block of rank r is accessed with probability ~ 1/r**alpha
+        base (int): Address of the first block
+        block_size (int): Bytes between consecutive blocks
+        scatter (bool): Spread popular blocks over the region instead of packing them at the start
+        seed (int or np.random.Generator): Random seed
+
+    Returns:
+        np.ndarray: int64 addresses
+    """
+    rng = _rng(seed)
+    weights = 1.0 / np.power(np.arange(1, num_blocks + 1, dtype=np.float64), alpha)
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+
+    ranks = np.searchsorted(cdf, rng.random(n), side='right')
+    np.minimum(ranks, num_blocks - 1, out=ranks)
+    if scatter:
+        ranks = rng.permutation(num_blocks)[ranks]
+
+    return base + ranks.astype(np.int64) * block_size
+
+
+def uniform_stream(n, num_blocks=1024, base=0, block_size=4, seed=None):
+    """
+    Generate accesses spread uniformly over num_blocks blocks.
+    """
+    rng = _rng(seed)
+    return base + rng.integers(0, num_blocks, size=n, dtype=np.int64) * block_size
+
+
+def scan_stream(n, base=0, element_size=4, seed=None):
+    """
+    Generate a single sequential pass over n consecutive elements (no reuse).
+    """
+    return base + np.arange(n, dtype=np.int64) * element_size
+
+
+def loop_stream(n, loop_length=256, base=0, element_size=4, seed=None):
+    """
+    Generate repeated sequential passes over a working set of loop_length elements.
+    """
+    return base + (np.arange(n, dtype=np.int64) % loop_length) * element_size
+
+
+def strided_stream(n, stride=64, span=1 << 20, base=0, seed=None):
+    """
+    Generate accesses every stride bytes, wrapping around within span bytes.
+    """
+    return base + (np.arange(n, dtype=np.int64) * stride) % span
+
+
+def pointer_chase_stream(n, num_nodes=1024, node_size=64, base=0, seed=None):
+    """
+    Generate the addresses visited by following a random linked list.
+
+    The nodes form a single random cycle, so every node is visited once per
+    lap and consecutive accesses have no spatial locality.
+    """
+    rng = _rng(seed)
+    # Walking a single cycle that links order[i] -> order[i + 1] visits the
+    # nodes in exactly that order, so no sequential pointer walk is needed.
+    order = rng.permutation(num_nodes).astype(np.int64)
+    return base + order[np.arange(n, dtype=np.int64) % num_nodes] * node_size
+
+
+WORKLOADS = {
+    'zipf': zipf_stream,
+    'uniform': uniform_stream,
+    'scan': scan_stream,
+    'loop': loop_stream,
+    'strided': strided_stream,
+    'pointer_chase': pointer_chase_stream,
+}
+
+
+def generate_workload(name, n, seed=None, **params):
+    """
+    Generate a workload by name.
+
+    Args:
+        name (str): One of the keys of WORKLOADS
+        n (int): Number of accesses
+        seed (int or np.random.Generator): Random seed
+        **params: Parameters for the workload generator
+
+    Returns:
+        np.ndarray: int64 addresses
+    """
+    if name not in WORKLOADS:
+        raise ValueError(f"Unknown workload: {name}")
+
+    return WORKLOADS[name](n, seed=seed, **params)
+
+
+def phase_mixture(phases, n, seed=None, interleave=False):
+    """
+    Combine several workloads into one stream.
+
+    Args:
+        phases (list): (weight, name, params) tuples; params is a dict for the generator
+        n (int): Total number of accesses
+        seed (int): Random seed; each phase gets an independent child stream
+        interleave (bool): If False, the phases run one after another with lengths
+                           proportional to their weights. If True, every access picks
+                           a phase at random with probability proportional to its weight.
+
+    Returns:
+        np.ndarray: int64 addresses
+    """
+    if not phases:
+        raise ValueError("At least one phase is required")
+
+    rng = _rng(seed)
+    weights = np.array([weight for weight, _, _ in phases], dtype=np.float64)
+    weights /= weights.sum()
+    child_rngs = rng.spawn(len(phases))
+
+    if interleave:
+        choice = rng.choice(len(phases), size=n, p=weights)
+        counts = np.bincount(choice, minlength=len(phases))
+        stream = np.empty(n, dtype=np.int64)
+        for i, (_, name, params) in enumerate(phases):
+            stream[choice == i] = generate_workload(name, int(counts[i]), seed=child_rngs[i], **params)
+        return stream
+
+    # Split n proportionally, giving the rounding remainder to the last phase
+    lengths = np.floor(weights * n).astype(np.int64)
+    lengths[-1] += n - lengths.sum()
+    parts = [generate_workload(name, int(length), seed=child_rngs[i], **params)
+             for i, ((_, name, params), length) in enumerate(zip(phases, lengths))]
+    return np.concatenate(parts)
+
+
+def write_memory_trace(addresses, file_path, chunk_size=1 << 20):
+    """
+    Write addresses in the hexadecimal one-per-line format read by load_memory_trace.
+
+    Args:
+        addresses (np.ndarray): Addresses to write
+        file_path (str): Destination trace file
+        chunk_size (int): Number of addresses formatted per write
+    """
+    with open(file_path, 'w') as file:
+        for start in range(0, len(addresses), chunk_size):
+            chunk = addresses[start:start + chunk_size].tolist()
+            file.write("\n".join(map('{:x}'.format, chunk)))
+            file.write("\n")
+
+
+def write_browsing_pattern(keys, file_path, url_format="https://site{}.com", chunk_size=1 << 20):
+    """
+    Write integer keys as URLs in the one-per-line format read by load_browsing_pattern.
+
+    Args:
+        keys (np.ndarray): Site numbers, e.g. from zipf_stream with block_size=1
+        file_path (str): Destination trace file
+        url_format (str): Format string turning a site number into a URL
+        chunk_size (int): Number of URLs formatted per write
+    """
+    with open(file_path, 'w') as file:
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size].tolist()
+            file.write("\n".join(map(url_format.format, chunk)))
+            file.write("\n")
@@ -0,0 +1,433 @@
+"""
+Conflict-miss hotspot analysis for the direct-mapped CacheSimulator.
+
+Every miss of a run is classified as compulsory (first touch of the
+block), capacity (a fully associative LRU cache of the same size misses
+too) or conflict (the fully associative cache would have hit). Each
+conflict miss is charged to the pair of blocks involved: the block that
+missed and the block that last evicted it from its set. Pairs are grouped
+by memory region, and for each hot region the analyzer proposes a layout
+change and re-simulates the trace with the remapped addresses to measure
+what the change is actually worth:
+
+    offset       move the region by a few blocks so its hot sets no longer
+                 overlap the hot sets of the rest of the trace
+    row padding  pad every row of a region that conflicts with itself
+                 (e.g. a column walk over an array whose row size is a
+                 multiple of the cache size) by one block
+"""
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+
+class _Run:
+    """
+    Miss classification and per-set eviction history of one simulation.
+    """
+    def __init__(self, num_sets):
+        self.accesses = 0
+        self.misses = 0
+        self.compulsory = 0
+        self.capacity = 0
+        self.conflict = 0
+        self.set_conflicts = np.zeros(num_sets, dtype=np.int64)
+        self.set_evictions = np.zeros(num_sets, dtype=np.int64)
+        # (lower block, higher block) -> conflict misses between the two
+        self.pairs = Counter()
+
+    @property
+    def conflict_rate(self):
+        return self.conflict / self.accesses * 100.0 if self.accesses else 0.0
+
+
+def find_regions(addresses, gap, block_size=1):
+    """
+    Split the touched address range into regions at gaps larger than gap bytes.
+
+    Args:
+        addresses (np.ndarray): Accessed addresses
+        gap (int): Smallest untouched gap that separates two regions
+        block_size (int): Region bounds are rounded out to whole blocks
+
+    Returns:
+        list: (name, start, end) tuples with end exclusive, in address order
+    """
+    touched = np.unique(addresses // block_size) * block_size
+    if len(touched) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(touched) > gap)
+    starts = np.concatenate(([touched[0]], touched[breaks + 1]))
+    ends = np.concatenate((touched[breaks], [touched[-1]])) + block_size
+    return [(f"{start:#x}-{end:#x}", int(start), int(end)) for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+class ConflictAnalyzer:
+    """
+    Finds conflict-miss hotspots in a trace and measures layout fixes.
+
+    The cache passed in only supplies the geometry and the simulator type:
+    every run, including the re-simulations of the suggestions, uses a
+    fresh simulator of the same type and size.
+    """
+    def __init__(self, cache, regions=None, region_gap=None):
+        """
+        Initialize the analyzer
+
+        Args:
+            cache: Cache simulator whose configuration is analysed (CacheSimulator)
+            regions: (name, start, end) address ranges to group conflicts by, end exclusive
+                (if None, regions are found from the gaps in the trace)
+            region_gap: Gap in bytes that separates automatically found regions
+                (default: the cache capacity in bytes)
+        """
+        self.cache = cache
+        self.cache_size = cache.cache_size
+        self.block_size = cache.block_size
+        self.num_sets = cache.num_sets
+        self.span = self.num_sets * self.block_size
+        self.regions = list(regions) if regions is not None else None
+        self.region_gap = region_gap or self.span
+
+        self.addresses = None
+        self.run = None
+
+    def _new_cache(self):
+        return type(self.cache)(cache_size=self.cache_size, block_size=self.block_size)
+
+    def _simulate(self, addresses):
+        """
+        Simulate addresses on a fresh cache next to a fully associative LRU
+        shadow of the same size, recording the eviction history.
+        """
+        cache = self._new_cache()
+        access = cache.access_memory
+        tags = cache.tags
+        valid_bits = cache.valid_bits
+        num_sets = self.num_sets
+        capacity = self.cache_size
+        run = _Run(num_sets)
+        set_conflicts = run.set_conflicts
+        set_evictions = run.set_evictions
+        pairs = run.pairs
+
+        shadow = OrderedDict()
+        seen = set()
+        evicted_by = {}
+
+        blocks = (addresses // self.block_size).tolist()
+        for address, block in zip(addresses.tolist(), blocks):
+            in_shadow = block in shadow
+            if in_shadow:
+                shadow.move_to_end(block)
+            else:
+                if len(shadow) >= capacity:
+                    shadow.popitem(last=False)
+                shadow[block] = True
+
+            set_index = block % num_sets
+            victim = None
+            if valid_bits[set_index]:
+                victim = tags[set_index] * num_sets + set_index
+            if access(address):
+                continue
+
+            if victim is not None:
+                set_evictions[set_index] += 1
+                evicted_by[victim] = block
+
+            if block not in seen:
+                seen.add(block)
+                run.compulsory += 1
+            elif not in_shadow:
+                run.capacity += 1
+            else:
+                run.conflict += 1
+                set_conflicts[set_index] += 1
+                partner = evicted_by.get(block)
+                if partner is not None:
+                    pairs[(block, partner) if block < partner else (partner, block)] += 1
+
+        run.accesses = cache.total_accesses
+        run.misses = cache.misses
+        return run
+
+    def analyze(self, trace):
+        """
+        Simulate the trace and classify its misses.
+
+        Args:
+            trace: Memory addresses (list or array)
+
+        Returns:
+            dict: The analysis report (see report())
+        """
+        self.addresses = np.asarray(trace, dtype=np.int64)
+        if self.regions is None:
+            self.regions = find_regions(self.addresses, self.region_gap, self.block_size)
+        self.run = self._simulate(self.addresses)
+        return self.report()
+
+    def _region_of(self, addresses):
+        """
+        Index into self.regions of each address, or -1 outside every region.
+        """
+        starts = np.array([start for _, start, _ in self.regions], dtype=np.int64)
+        ends = np.array([end for _, _, end in self.regions], dtype=np.int64)
+        order = np.argsort(starts, kind='stable')
+        position = np.searchsorted(starts[order], addresses, side='right') - 1
+        region = np.where(position >= 0, order[np.maximum(position, 0)], -1)
+        inside = (region >= 0) & (addresses < ends[np.maximum(region, 0)])
+        return np.where(inside, region, -1)
+
+    def hot_pairs(self, top=10):
+        """
+        The block pairs with the most conflict misses between them.
+
+        Returns:
+            list: Dicts with both block addresses, their regions, the set and the conflict count
+        """
+        pairs = self.run.pairs.most_common(top)
+        if not pairs:
+            return []
+        blocks = np.array([pair for pair, _ in pairs], dtype=np.int64)
+        regions = self._region_of(blocks * self.block_size)
+        names = [name for name, _, _ in self.regions]
+        return [{
+            'a': hex(int(a) * self.block_size),
+            'b': hex(int(b) * self.block_size),
+            'region_a': names[ra] if ra >= 0 else None,
+            'region_b': names[rb] if rb >= 0 else None,
+            'set': int(a) % self.num_sets,
+            'conflicts': count,
+        } for (a, b), (ra, rb), (_, count) in zip(blocks.tolist(), regions.tolist(), pairs)]
+
+    def hot_sets(self, top=10):
+        """
+        The sets with the most conflict misses.
+        """
+        run = self.run
+        order = np.argsort(-run.set_conflicts, kind='stable')[:top]
+        return [{'set': int(index), 'conflict_misses': int(run.set_conflicts[index]),
+                 'evictions': int(run.set_evictions[index])}
+                for index in order if run.set_conflicts[index]]
+
+    def region_conflicts(self):
+        """
+        Conflict misses between each pair of regions (a region can conflict with itself).
+
+        Returns:
+            list: Dicts with both region names and the conflict count, most conflicts first
+        """
+        if not self.run.pairs:
+            return []
+        blocks = np.array(list(self.run.pairs.keys()), dtype=np.int64)
+        counts = np.array(list(self.run.pairs.values()), dtype=np.int64)
+        regions = self._region_of(blocks * self.block_size)
+        totals = Counter()
+        for (ra, rb), count in zip(np.sort(regions, axis=1).tolist(), counts.tolist()):
+            totals[(ra, rb)] += count
+        names = [name for name, _, _ in self.regions] + [None]
+        return [{'region_a': names[ra], 'region_b': names[rb], 'conflicts': count}
+                for (ra, rb), count in totals.most_common()]
+
+    def _offset_for(self, region):
+        """
+        Shift in blocks that moves region's accesses onto the sets least used
+        by the rest of the trace (circular cross-correlation of the per-set
+        access histograms).
+        """
+        _, start, end = self.regions[region]
+        sets = (self.addresses // self.block_size) % self.num_sets
+        inside = (self.addresses >= start) & (self.addresses < end)
+        own = np.bincount(sets[inside], minlength=self.num_sets).astype(np.float64)
+        rest = np.bincount(sets[~inside], minlength=self.num_sets).astype(np.float64)
+        # overlap[k] = sum_s rest[s + k] * own[s]: the cost of moving the region by k sets
+        overlap = np.fft.irfft(np.fft.rfft(rest) * np.conj(np.fft.rfft(own)), n=self.num_sets)
+        overlap = np.round(overlap)
+        overlap[0] = np.inf
+        return int(np.argmin(overlap))
+
+    def _row_for(self, region):
+        """
+        Most common distance in blocks between two conflicting blocks of region.
+        """
+        _, start, end = self.regions[region]
+        lo, hi = start // self.block_size, (end - 1) // self.block_size
+        distances = Counter()
+        for (a, b), count in self.run.pairs.items():
+            if lo <= a <= hi and lo <= b <= hi:
+                distances[b - a] += count
+        return distances.most_common(1)[0][0] if distances else 0
+
+    def suggest(self, top=5):
+        """
+        Propose layout changes for the regions with the most conflict misses.
+
+        Regions conflicting with other regions get an offset; regions
+        conflicting with themselves get row padding.
+
+        Args:
+            top: Number of regions to propose changes for
+
+        Returns:
+            list: Suggestion dicts, ready for evaluate()
+        """
+        names = [name for name, _, _ in self.regions]
+        involvement = Counter()
+        self_conflicts = Counter()
+        for row in self.region_conflicts():
+            if row['region_a'] is None or row['region_b'] is None:
+                continue
+            a, b = names.index(row['region_a']), names.index(row['region_b'])
+            involvement[a] += row['conflicts']
+            if a == b:
+                self_conflicts[a] += row['conflicts']
+            else:
+                involvement[b] += row['conflicts']
+
+        suggestions = []
+        for region, conflicts in involvement.most_common(top):
+            if self_conflicts[region] * 2 > conflicts:
+                row_blocks = self._row_for(region)
+                if row_blocks:
+                    suggestions.append({'kind': 'row_padding', 'region': names[region], 'conflicts': conflicts,
+                                        'row_bytes': row_blocks * self.block_size,
+                                        'pad_bytes': self.block_size})
+                    continue
+            suggestions.append({'kind': 'offset', 'region': names[region], 'conflicts': conflicts,
+                                'offset_bytes': self._offset_for(region) * self.block_size})
+        return suggestions
+
+    def remap(self, suggestions):
+        """
+        Addresses of the analysed trace with the suggestions applied.
+
+        Each changed region is moved above every other address, keeping its
+        set alignment, so no two blocks collide and only the set mapping of
+        the region changes.
+
+        Returns:
+            np.ndarray: The remapped addresses
+        """
+        addresses = self.addresses
+        remapped = addresses.copy()
+        base = (int(addresses.max()) // self.span + 1) * self.span if len(addresses) else 0
+        bounds = {name: (start, end) for name, start, end in self.regions}
+
+        for suggestion in suggestions:
+            start, end = bounds[suggestion['region']]
+            inside = (addresses >= start) & (addresses < end)
+            relative = addresses[inside] - start
+            if suggestion['kind'] == 'row_padding':
+                relative = relative + relative // suggestion['row_bytes'] * suggestion['pad_bytes']
+                size = (end - start) + (end - start) // suggestion['row_bytes'] * suggestion['pad_bytes']
+            else:
+                size = end - start
+            offset = start % self.span + suggestion.get('offset_bytes', 0)
+            remapped[inside] = base + offset + relative
+            base += ((offset + size) // self.span + 1) * self.span
+        return remapped
+
+    def evaluate(self, suggestions):
+        """
+        Re-simulate the trace with the suggestions applied together.
+
+        Returns:
+            dict: Misses and conflict misses after the change and the
+                  reduction relative to the original layout, in percent
+        """
+        run = self._simulate(self.remap(suggestions))
+        before = self.run
+        return {
+            'misses': run.misses,
+            'conflict_misses': run.conflict,
+            'miss_reduction': (before.misses - run.misses) / before.misses * 100.0 if before.misses else 0.0,
+            'conflict_reduction': (before.conflict - run.conflict) / before.conflict * 100.0
+            if before.conflict else 0.0,
+        }
+
+    def report(self, top=10, suggestions=5):
+        """
+        Miss classification, hotspots and measured suggestions.
+
+        Args:
+            top: Hot sets and pairs to list
+            suggestions: Regions to propose and measure layout changes for
+
+        Returns:
+            dict: Miss breakdown, hot sets, hot pairs, per-region conflicts,
+                  each suggestion with its re-simulated effect, and the best
+                  combination of the suggestions that helped
+        """
+        run = self.run
+        measured = []
+        for suggestion in self.suggest(suggestions):
+            measured.append({**suggestion, **self.evaluate([suggestion])})
+
+        # Fixes for two regions that conflict with each other can cancel out,
+        # so combine greedily, keeping each one only if it still helps
+        helpful = sorted((suggestion for suggestion in measured if suggestion['conflict_reduction'] > 0),
+                         key=lambda suggestion: suggestion['conflict_misses'])
+        combined = None
+        if len(helpful) > 1:
+            applied = helpful[:1]
+            combined = {key: helpful[0][key] for key in
+                        ('misses', 'conflict_misses', 'miss_reduction', 'conflict_reduction')}
+            for suggestion in helpful[1:]:
+                result = self.evaluate(applied + [suggestion])
+                if result['conflict_misses'] < combined['conflict_misses']:
+                    applied.append(suggestion)
+                    combined = result
+            combined['regions'] = [suggestion['region'] for suggestion in applied]
+        return {
+            'cache_size': self.cache_size,
+            'block_size': self.block_size,
+            'accesses': run.accesses,
+            'misses': run.misses,
+            'compulsory_misses': run.compulsory,
+            'capacity_misses': run.capacity,
+            'conflict_misses': run.conflict,
+            'conflict_rate': run.conflict_rate,
+            'hot_sets': self.hot_sets(top),
+            'hot_pairs': self.hot_pairs(top),
+            'regions': [{'name': name, 'start': hex(start), 'end': hex(end)} for name, start, end in self.regions],
+            'region_conflicts': self.region_conflicts()[:top],
+            'suggestions': measured,
+            'combined': combined,
+        }
+
+
+def print_conflict_report(report):
+    """
+    Print a ConflictAnalyzer report.
+    """
+    print(f"Accesses: {report['accesses']}, misses: {report['misses']} "
+          f"(compulsory {report['compulsory_misses']}, capacity {report['capacity_misses']}, "
+          f"conflict {report['conflict_misses']})")
+    if report['hot_sets']:
+        print("Hot sets:")
+        for row in report['hot_sets']:
+            print(f"  Set {row['set']}: {row['conflict_misses']} conflict misses, {row['evictions']} evictions")
+    if report['hot_pairs']:
+        print("Thrashing pairs:")
+        for row in report['hot_pairs']:
+            print(f"  {row['a']} ({row['region_a']}) <-> {row['b']} ({row['region_b']}) "
+                  f"in set {row['set']}: {row['conflicts']}")
+    if report['region_conflicts']:
+        print("Conflicts by region:")
+        for row in report['region_conflicts']:
+            print(f"  {row['region_a']} <-> {row['region_b']}: {row['conflicts']}")
+    if report['suggestions']:
+        print("Suggestions (re-simulated):")
+        for row in report['suggestions']:
+            if row['kind'] == 'row_padding':
+                change = f"pad every {row['row_bytes']} bytes of {row['region']} by {row['pad_bytes']} bytes"
+            else:
+                change = f"offset {row['region']} by {row['offset_bytes']} bytes"
+            print(f"  {change}: {row['conflict_misses']} conflict misses "
+                  f"({row['conflict_reduction']:.1f}% fewer), misses {row['miss_reduction']:.1f}% fewer")
+    if report['combined']:
+        combined = report['combined']
+        print(f"Best combination ({', '.join(combined['regions'])}): {combined['conflict_misses']} "
+              f"conflict misses ({combined['conflict_reduction']:.1f}% fewer)")
@@ -1,4 +1,16 @@
-def generate_chart(data, title="Cache Performance", xlabel="Accesses", ylabel="Count"):
+def generate_chart(data, title="Cache Performance", xlabel="Accesses", ylabel="Count", output_path=None, show=True):
+    """
+    Plot cumulative hits and misses against accesses.
+
+    Args:
+        data (dict): 'accesses', 'hits' and 'misses' series, e.g. from
+                     CacheInstrumentation.to_chart_data()
+        title (str): Chart title
+        xlabel (str): X-axis label
+        ylabel (str): Y-axis label
+        output_path (str): If given, save the chart to this file
+        show (bool): Open an interactive window
+    """
     import matplotlib.pyplot as plt
 
     plt.figure(figsize=(10, 6))
@@ -11,4 +23,34 @@ def generate_chart(data, title="Cache Performance", xlabel="Accesses", ylabel="C
     plt.legend()
     plt.grid()
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    if output_path:
+        plt.savefig(output_path)
+    if show:
+        plt.show()
+    else:
+        plt.close()
+
+
+def plot_frequency_distribution(site_counts, output_path='website_frequency.png', show=True):
+    """
+    Plot visit counts by popularity rank.
+
+    Args:
+        site_counts (list): (key, count) tuples sorted by count, descending
+        output_path (str): File the chart is saved to
+        show (bool): Open an interactive window after saving
+    """
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    sites, counts = zip(*site_counts)
+    plt.bar(range(len(counts)), counts)
+    plt.title('Website Visit Frequency Distribution')
+    plt.xlabel('Website Rank (by popularity)')
+    plt.ylabel('Number of Visits')
+    plt.tight_layout()
+    plt.savefig(output_path)
+    if show:
+        plt.show()
+    else:
+        plt.close()
\ No newline at end of file
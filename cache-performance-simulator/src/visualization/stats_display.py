@@ -63,6 +63,25 @@ def display_stats(cache_stats, title="Cache Statistics"):
                     print(f"{key}: {value}")
     print()
 
+def display_region_stats(region_stats, title="Misses by Region", top=None):
+    """
+    Display a per-region miss table.
+    
+    Args:
+        region_stats (list or CacheSimulator): Rows from CacheAnalyzer.analyze_region_misses, or a
+            CacheSimulator instrumented with a region map
+        title (str): Title for the statistics display
+        top (int): Only show the regions with the most misses (default: all)
+    """
+    from ..cache.cache_analyzer import CacheAnalyzer
+
+    if hasattr(region_stats, 'instrumentation'):
+        region_stats = region_stats.instrumentation.region_table()
+
+    print(f"\n=== {title} ===")
+    print(CacheAnalyzer.format_region_table(region_stats, top))
+    print()
+
 def compare_stats(before_stats, after_stats, optimization_name="Optimization"):
     """
     Compare and display statistics before and after optimization.
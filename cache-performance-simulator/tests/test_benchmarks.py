@@ -0,0 +1,48 @@
+import unittest
+from benchmarks.run_benchmarks import compare_results, run_benchmarks, run_startup
+
+def _result(benchmark, rate, memory):
+    return {'benchmark': benchmark, 'profile': 'zipf', 'size': 1000,
+            'accesses_per_sec': rate, 'peak_memory_bytes': memory}
+
+class TestBenchmarks(unittest.TestCase):
+    def test_run_records_throughput_and_memory(self):
+        results = run_benchmarks(sizes=[200], profiles=['loop'],
+                                 benchmarks=['CacheSimulator.access_memory', 'load_memory_trace'], repeat=1)
+        self.assertEqual(len(results['results']), 2)
+        for record in results['results']:
+            self.assertEqual(record['accesses'], 200)
+            self.assertGreater(record['accesses_per_sec'], 0)
+            self.assertGreater(record['peak_memory_bytes'], 0)
+
+    def test_startup_times_lazy_and_eager_imports(self):
+        results = run_startup(repeat=1, size=100)
+        self.assertEqual([record['command'] for record in results['results']], ['lazy plotting', 'eager matplotlib'])
+        self.assertTrue(all(record['seconds'] > 0 for record in results['results']))
+
+    def test_compare_flags_slowdown_over_threshold(self):
+        baseline = {'results': [_result('a', 1000.0, 100), _result('b', 1000.0, 100)]}
+        current = {'results': [_result('a', 850.0, 100), _result('b', 950.0, 100)]}
+        comparison = compare_results(baseline, current, threshold=10.0)
+        self.assertEqual([row['regression'] for row in comparison], [True, False])
+        self.assertAlmostEqual(comparison[0]['speed_change'], -15.0)
+
+    def test_compare_flags_memory_growth(self):
+        baseline = {'results': [_result('a', 1000.0, 100)]}
+        current = {'results': [_result('a', 1000.0, 150)]}
+        self.assertTrue(compare_results(baseline, current, threshold=10.0)[0]['regression'])
+
+    def test_compare_skips_benchmarks_missing_from_baseline(self):
+        baseline = {'results': []}
+        current = {'results': [_result('a', 1000.0, 100)]}
+        self.assertEqual(compare_results(baseline, current), [])
+
+    def test_compare_tolerates_missing_baseline_rate(self):
+        baseline = {'results': [_result('a', 0.0, 100), {'benchmark': 'b', 'profile': 'zipf', 'size': 1000}]}
+        current = {'results': [_result('a', 1000.0, 100), _result('b', 1000.0, 100)]}
+        comparison = compare_results(baseline, current)
+        self.assertEqual([row['speed_change'] for row in comparison], [None, None])
+        self.assertEqual([row['regression'] for row in comparison], [False, False])
+
+if __name__ == '__main__':
+    unittest.main()
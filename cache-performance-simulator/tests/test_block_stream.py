@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from src.cache.cache_simulator import CacheSimulator
+from src.cache.instrumentation import CacheInstrumentation
+from src.memory.block_stream import BlockStreamCache, build_block_stream
+from src.memory.workloads import phase_mixture
+
+class TestBlockStream(unittest.TestCase):
+    def test_runs_are_collapsed(self):
+        stream = build_block_stream([0, 1, 2, 3, 4, 8, 9, 0], block_size=4)
+        self.assertEqual(stream.blocks.tolist(), [0, 1, 2, 0])
+        self.assertEqual(stream.counts.tolist(), [4, 1, 2, 1])
+        self.assertEqual(stream.total_accesses, 8)
+
+    def test_empty_trace(self):
+        stream = build_block_stream([], block_size=4)
+        self.assertEqual(len(stream), 0)
+        self.assertEqual(stream.total_accesses, 0)
+
+    def test_streams_are_shared_per_block_size(self):
+        streams = BlockStreamCache([0, 4, 8])
+        self.assertIs(streams.get(4), streams.get(4))
+        self.assertIsNot(streams.get(4), streams.get(8))
+
+    def test_block_stream_matches_address_trace(self):
+        trace = phase_mixture([(1, 'scan', {}), (1, 'zipf', {'num_blocks': 64}), (1, 'loop', {'loop_length': 40})],
+                              3000, seed=2, interleave=True)
+        streams = BlockStreamCache(trace)
+        for block_size in (4, 16):
+            expected = CacheSimulator(cache_size=16, block_size=block_size)
+            for address in trace.tolist():
+                expected.access_memory(address)
+
+            plain = CacheSimulator(cache_size=16, block_size=block_size)
+            plain.simulate_block_stream(streams.get(block_size))
+            instrumented = CacheSimulator(cache_size=16, block_size=block_size,
+                                          instrumentation=CacheInstrumentation(100))
+            instrumented.simulate_block_stream(streams.get(block_size))
+
+            for cache in (plain, instrumented):
+                self.assertEqual((cache.total_accesses, cache.hits, cache.misses),
+                                 (expected.total_accesses, expected.hits, expected.misses))
+                self.assertEqual(cache.tags, expected.tags)
+            self.assertEqual(instrumented.instrumentation.accesses, len(trace))
+
+    def test_fast_path_only_without_instrumentation_or_buffer(self):
+        self.assertTrue(CacheSimulator()._fast_path)
+        self.assertFalse(CacheSimulator(instrumentation=CacheInstrumentation())._fast_path)
+        self.assertFalse(CacheSimulator(victim_entries=2)._fast_path)
+
+    def test_block_size_mismatch(self):
+        with self.assertRaises(ValueError):
+            CacheSimulator(block_size=4).simulate_block_stream(build_block_stream([0], block_size=8))
+
+if __name__ == '__main__':
+    unittest.main()
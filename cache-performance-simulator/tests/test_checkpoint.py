@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from src.cache.browser_cache_simulator import BrowserLRUCache
+from src.cache.cache_simulator import CacheSimulator
+from src.cache.checkpoint import load_checkpoint, resume, run_with_checkpoints, save_checkpoint
+from src.memory.workloads import zipf_stream
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.ckpt')
+        self.trace = zipf_stream(5000, num_blocks=256, seed=3).tolist()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cache_round_trip(self):
+        cache = CacheSimulator(cache_size=32, block_size=16)
+        for address in self.trace:
+            cache.access_memory(address)
+        save_checkpoint(cache, self.path, trace_offset=len(self.trace))
+
+        restored, offset = load_checkpoint(self.path)
+        self.assertEqual(offset, len(self.trace))
+        self.assertEqual(restored.get_state(), cache.get_state())
+
+    def test_browser_round_trip_keeps_lru_order(self):
+        cache = BrowserLRUCache(3)
+        for url in ['a.com', 'b.com', 'c.com', 'a.com', 'd.com']:
+            cache.access_page(url)
+        save_checkpoint(cache, self.path, trace_offset=5)
+
+        restored, offset = load_checkpoint(self.path)
+        self.assertEqual(offset, 5)
+        self.assertEqual(restored.get_current_cache_contents(), ['c.com', 'a.com', 'd.com'])
+        # The next eviction follows the restored LRU order
+        restored.access_page('e.com')
+        self.assertEqual(restored.get_current_cache_contents(), ['a.com', 'd.com', 'e.com'])
+
+    def test_resume_matches_uninterrupted_run(self):
+        expected = CacheSimulator(cache_size=32, block_size=16)
+        for address in self.trace:
+            expected.access_memory(address)
+
+        # Simulate a crash after the first checkpoint of a run on a prefix
+        interrupted = CacheSimulator(cache_size=32, block_size=16)
+        run_with_checkpoints(interrupted, self.trace[:1700], self.path, every_accesses=1000)
+        _, offset = load_checkpoint(self.path)
+        self.assertEqual(offset, 1700)
+
+        resumed = resume(self.path, self.trace, every_accesses=1000)
+        self.assertEqual(resumed.get_state(), expected.get_state())
+        self.assertEqual(load_checkpoint(self.path)[1], len(self.trace))
+
+    def test_forked_experiments_are_independent(self):
+        warm = CacheSimulator(cache_size=16, block_size=4)
+        for address in self.trace[:1000]:
+            warm.access_memory(address)
+        save_checkpoint(warm, self.path, trace_offset=1000)
+
+        first, _ = load_checkpoint(self.path)
+        second, _ = load_checkpoint(self.path)
+        for address in self.trace[1000:2000]:
+            first.access_memory(address)
+        self.assertEqual(second.get_state(), warm.get_state())
+
+    def test_geometry_mismatch_is_rejected(self):
+        state = CacheSimulator(cache_size=16, block_size=4).get_state()
+        with self.assertRaises(ValueError):
+            CacheSimulator(cache_size=8, block_size=4).set_state(state)
+
+if __name__ == '__main__':
+    unittest.main()
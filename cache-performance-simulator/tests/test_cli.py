@@ -0,0 +1,141 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_cli(*args):
+    return subprocess.run([sys.executable, '-m', 'src.cli', *args], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True, check=True)
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.trace = os.path.join(self.tmp.name, 'trace.txt')
+        with open(self.trace, 'w') as f:
+            f.write("\n".join(["3e8", "3ec", "7d0", "3e8", "bb8", "3ec", "fa0"]) + "\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_simulate_writes_results(self):
+        run_cli('--results-dir', self.tmp.name, 'simulate', self.trace, '--cache-size', '16', '--block-size', '4')
+        with open(os.path.join(self.tmp.name, 'simulate.json')) as f:
+            results = json.load(f)
+        self.assertEqual(results['stats']['hits'], 2)
+        self.assertEqual(results['stats']['misses'], 5)
+
+    def test_simulate_does_not_import_plotting(self):
+        code = ("import sys; from src.cli import main; "
+                f"main(['--results-dir', {self.tmp.name!r}, 'simulate', {self.trace!r}]); "
+                "print('matplotlib' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], 'False')
+
+    def test_config_file_overrides_defaults(self):
+        config_path = os.path.join(self.tmp.name, 'config.json')
+        with open(config_path, 'w') as f:
+            json.dump({'cache_size': 1, 'results_dir': self.tmp.name}, f)
+        run_cli('--config', config_path, 'simulate', self.trace)
+        with open(os.path.join(self.tmp.name, 'simulate.json')) as f:
+            results = json.load(f)
+        self.assertEqual(results['config']['cache_size'], 1)
+
+    def test_sweep_plot_renders_headless(self):
+        run_cli('--results-dir', self.tmp.name, 'sweep', self.trace, '--cache-sizes', '4', '16', '--plot')
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, 'sweep_block4.png')))
+
+    def test_sweep_store_and_results_diff(self):
+        for run, sizes in (('small', ['4', '16']), ('large', ['16', '64'])):
+            run_cli('--results-dir', self.tmp.name, 'sweep', self.trace, '--cache-sizes', *sizes,
+                    '--store', '--run-name', run)
+        run_cli('--results-dir', self.tmp.name, 'results', '--diff', 'small', 'large')
+        with open(os.path.join(self.tmp.name, 'results.json')) as f:
+            results = json.load(f)
+        self.assertEqual(results['rows'], 4)
+        self.assertEqual((results['diff']['only_a'], results['diff']['only_b']), (1, 1))
+        self.assertEqual(results['diff']['rows'][0]['cache_size'], 16)
+
+    def test_victim_sweep_shares_store_with_plain_sweep(self):
+        run_cli('--results-dir', self.tmp.name, 'sweep', self.trace, '--cache-sizes', '4', '--store', '--run-name', 'a')
+        for run in ('v1', 'v2'):
+            run_cli('--results-dir', self.tmp.name, 'sweep', self.trace, '--cache-sizes', '4', '--store',
+                    '--run-name', run, '--victim-entries', '0', '8')
+        run_cli('--results-dir', self.tmp.name, 'results', '--diff', 'v1', 'v2')
+        with open(os.path.join(self.tmp.name, 'results.json')) as f:
+            results = json.load(f)
+        self.assertEqual(results['rows'], 5)
+        self.assertEqual((results['diff']['only_a'], results['diff']['only_b']), (0, 0))
+        self.assertEqual([row['victim_entries'] for row in results['diff']['rows']], [0, 8])
+
+    def test_policy_sweeps_diff_policy_by_policy(self):
+        run_cli('--results-dir', self.tmp.name, 'sweep', self.trace, '--cache-sizes', '16', '--store', '--run-name', 'a')
+        for run, sizes in (('p1', ['16']), ('p2', ['16', '32'])):
+            run_cli('--results-dir', self.tmp.name, 'sweep', self.trace, '--cache-sizes', *sizes, '--store',
+                    '--run-name', run, '--associativity', '4', '--policies', 'lru', 'drrip')
+        run_cli('--results-dir', self.tmp.name, 'results', '--diff', 'p1', 'p2')
+        with open(os.path.join(self.tmp.name, 'results.json')) as f:
+            results = json.load(f)
+        self.assertEqual(results['rows'], 7)
+        self.assertEqual((results['diff']['only_a'], results['diff']['only_b']), (0, 2))
+        self.assertEqual(sorted(row['policy'] for row in results['diff']['rows']), ['drrip', 'lru'])
+        self.assertEqual([row['miss_rate_change'] for row in results['diff']['rows']], [0.0, 0.0])
+
+    def test_simulate_resumes_from_checkpoint(self):
+        checkpoint = os.path.join(self.tmp.name, 'run.ckpt')
+        run_cli('--results-dir', self.tmp.name, 'simulate', self.trace, '--checkpoint', checkpoint,
+                '--checkpoint-every', '3')
+        self.assertTrue(os.path.exists(checkpoint))
+        # The saved run is complete, so resuming adds no accesses
+        run_cli('--results-dir', self.tmp.name, 'simulate', self.trace, '--checkpoint', checkpoint, '--resume')
+        with open(os.path.join(self.tmp.name, 'simulate.json')) as f:
+            results = json.load(f)
+        self.assertEqual(results['stats']['hits'], 2)
+        self.assertEqual(results['stats']['misses'], 5)
+
+    def test_simulate_attributes_misses_to_regions(self):
+        regions = os.path.join(self.tmp.name, 'regions.txt')
+        with open(regions, 'w') as f:
+            f.write("low 0x0 0x800\nhigh 0x800 0x1000\n")
+        run_cli('--results-dir', self.tmp.name, 'simulate', self.trace, '--cache-size', '16', '--block-size', '4',
+                '--regions', regions)
+        with open(os.path.join(self.tmp.name, 'simulate.json')) as f:
+            results = json.load(f)
+        misses = {row['region']: row['misses'] for row in results['regions']}
+        self.assertEqual(misses, {'low': 3, 'high': 2})
+        self.assertNotIn('timeseries', results)
+
+    def test_simulate_set_associative_policy(self):
+        run_cli('--results-dir', self.tmp.name, 'simulate', self.trace, '--cache-size', '16', '--block-size', '4',
+                '--associativity', '4', '--policy', 'drrip', '--sample-interval', '2')
+        with open(os.path.join(self.tmp.name, 'simulate.json')) as f:
+            results = json.load(f)
+        self.assertEqual((results['stats']['hits'], results['stats']['misses']), (2, 5))
+        self.assertEqual(results['config']['policy'], 'drrip')
+        self.assertEqual(results['dueling']['policies'], ['srrip', 'brrip'])
+        self.assertEqual(sum(results['dueling']['winner_samples'].values()), len(results['timeseries']['accesses']))
+
+    def test_stream_from_stdin(self):
+        with open(self.trace) as trace:
+            subprocess.run([sys.executable, '-m', 'src.cli', '--results-dir', self.tmp.name, 'stream', '-',
+                            '--cache-size', '16', '--block-size', '4'],
+                           cwd=PROJECT_ROOT, stdin=trace, capture_output=True, text=True, check=True)
+        with open(os.path.join(self.tmp.name, 'stream.json')) as f:
+            results = json.load(f)
+        self.assertEqual(results['stats']['hits'], 2)
+        self.assertEqual(results['rolling']['total_accesses'], 7)
+
+    def test_convert_trace_round_trip(self):
+        npy_path = os.path.join(self.tmp.name, 'trace.npy')
+        hex_path = os.path.join(self.tmp.name, 'converted.txt')
+        run_cli('convert-trace', self.trace, npy_path)
+        run_cli('convert-trace', npy_path, hex_path)
+        with open(self.trace) as original, open(hex_path) as converted:
+            self.assertEqual(original.read(), converted.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import gzip
+import os
+import tempfile
+import unittest
+from src.cache.browser_cache_simulator import BrowserLRUCache
+from src.cache.client_caches import SharedClientCaches
+from src.memory.access_log import AccessLogReader
+from src.memory.workloads import zipf_stream
+
+LOG_LINES = [
+    '10.0.0.1 - - [10/Oct/2000:13:55:36 -0700] "GET /a.html HTTP/1.0" 200 2326 "-" "Mozilla" "sid=alice"',
+    '10.0.0.2 - bob [10/Oct/2000:13:55:37 -0700] "GET /a.html HTTP/1.1" 200 512',
+    '10.0.0.1 - - [10/Oct/2000:13:55:38 -0700] "GET /a.html HTTP/1.0" 304 - "-" "Mozilla" "sid=alice"',
+    '10.0.0.1 - - [10/Oct/2000:13:55:39 -0700] "POST /form HTTP/1.0" 200 10',
+    'garbage line',
+    '10.0.0.3 - - [10/Oct/2000:13:55:40 -0700] "GET /missing HTTP/1.0" 404 0',
+]
+
+class TestClientCaches(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, 'access.log')
+        with open(self.log, 'w') as f:
+            f.write("\n".join(LOG_LINES) + "\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reader_extracts_cacheable_requests(self):
+        reader = AccessLogReader(self.log)
+        self.assertEqual(list(reader), [('10.0.0.1', '/a.html'), ('10.0.0.2', '/a.html'), ('10.0.0.1', '/a.html')])
+        self.assertEqual(reader.filtered, 2)
+        self.assertEqual(reader.malformed, 1)
+        self.assertEqual(reader.errors, [(5, 'garbage line')])
+
+    def test_client_keys(self):
+        users = [client for client, _ in AccessLogReader(self.log, client_key='user')]
+        self.assertEqual(users, ['-', 'bob', '-'])
+        cookies = [client for client, _ in AccessLogReader(self.log, client_key='cookie', cookie_name='sid')]
+        self.assertEqual(cookies, ['alice', '10.0.0.2', 'alice'])
+
+    def test_gzip_log(self):
+        gz_path = self.log + '.gz'
+        with gzip.open(gz_path, 'wt') as f:
+            f.write("\n".join(LOG_LINES) + "\n")
+        self.assertEqual(len(list(AccessLogReader(gz_path))), 3)
+
+    def test_matches_one_browser_cache_per_client(self):
+        pages = zipf_stream(4000, num_blocks=60, block_size=1, scatter=False, seed=5).tolist()
+        requests = [(f"client{i % 37}", f"https://site{page}.com") for i, page in enumerate(pages)]
+
+        shared = SharedClientCaches(8)
+        shared.simulate(requests)
+        separate = {}
+        for client, url in requests:
+            separate.setdefault(client, BrowserLRUCache(8)).access_page(url)
+
+        self.assertEqual(shared.hits, sum(cache.hits for cache in separate.values()))
+        for client, cache in separate.items():
+            self.assertEqual(shared.get_client_contents(client), cache.get_current_cache_contents())
+
+    def test_report_percentiles(self):
+        caches = SharedClientCaches(2)
+        caches.simulate([('a', '/x'), ('a', '/x'), ('b', '/y'), ('b', '/z')])
+        report = caches.report(percentiles=(0, 100))
+        self.assertEqual(report['clients'], 2)
+        self.assertEqual(report['hit_rate'], 25.0)
+        self.assertEqual(report['client_hit_rate_percentiles'], {'0': 0.0, '100': 50.0})
+
+if __name__ == '__main__':
+    unittest.main()
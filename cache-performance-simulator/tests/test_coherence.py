@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from src.cache.coherence import CoherentCacheSystem, EXCLUSIVE, MODIFIED, SHARED
+from src.memory.trace_loader import load_core_trace
+
+class TestCoherence(unittest.TestCase):
+    def setUp(self):
+        self.system = CoherentCacheSystem(num_cores=2, cache_size=16, block_size=16)
+
+    def test_exclusive_then_shared_read(self):
+        self.system.access(0, 0x100)
+        self.assertEqual(self.system.states[0][0], EXCLUSIVE)
+        self.system.access(1, 0x100)
+        self.assertEqual(self.system.states[0][0], SHARED)
+        self.assertEqual(self.system.states[1][0], SHARED)
+
+    def test_msi_read_miss_loads_shared(self):
+        system = CoherentCacheSystem(num_cores=2, cache_size=16, block_size=16, protocol='MSI')
+        system.access(0, 0x100)
+        self.assertEqual(system.states[0][0], SHARED)
+
+    def test_silent_upgrade_from_exclusive(self):
+        self.system.access(0, 0x100)
+        self.assertTrue(self.system.access(0, 0x100, is_write=True))
+        self.assertEqual(self.system.states[0][0], MODIFIED)
+        self.assertEqual(self.system.report()[0]['bus_transactions'], 1)
+
+    def test_write_invalidates_and_causes_coherence_miss(self):
+        self.system.access(0, 0x100)
+        self.system.access(1, 0x100)
+        self.system.access(1, 0x100, is_write=True)  # upgrade, invalidates core 0
+        self.assertFalse(self.system.access(0, 0x100))  # coherence miss, core 1 flushes
+
+        core0, core1 = self.system.report()
+        self.assertEqual(core0['coherence_misses'], 1)
+        self.assertEqual(core0['invalidations_received'], 1)
+        self.assertEqual(core1['invalidations_sent'], 1)
+        self.assertEqual(core1['bus_upgrades'], 1)
+        self.assertEqual(core1['writebacks'], 1)
+        self.assertEqual(self.system.states[1][0], SHARED)
+
+    def test_false_sharing_detected(self):
+        # Each core writes its own word of the same 16-byte line
+        for _ in range(5):
+            self.system.access(0, 0x100, is_write=True)
+            self.system.access(1, 0x108, is_write=True)
+        hotspot = self.system.sharing_hotspots()[0]
+        self.assertEqual(hotspot['address'], 0x100)
+        self.assertEqual(hotspot['invalidations'], 9)
+        self.assertTrue(hotspot['false_sharing'])
+
+    def test_true_sharing_not_flagged(self):
+        for _ in range(3):
+            self.system.access(0, 0x100, is_write=True)
+            self.system.access(1, 0x100, is_write=True)
+        self.assertFalse(self.system.sharing_hotspots()[0]['false_sharing'])
+
+    def test_load_core_trace(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cores.txt')
+            with open(path, 'w') as f:
+                f.write("# core op address\n0 R 100\n1 W 108\nbad line\n")
+            records = load_core_trace(path)
+        self.assertEqual(records, [(0, False, 0x100), (1, True, 0x108)])
+        self.system.simulate(records)
+        self.assertEqual(self.system.report()[1]['invalidations_sent'], 1)
+
+    def test_core_ids_out_of_range_are_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cores.txt')
+            with open(path, 'w') as f:
+                f.write("0 R 100\n2 W 108\n")
+            with self.assertRaisesRegex(ValueError, r"cores.txt:2: core 2 out of range"):
+                load_core_trace(path, num_cores=2)
+        with self.assertRaises(ValueError):
+            self.system.simulate([(0, False, 0x100), (5, False, 0x100)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+from src.cache.cache_simulator import CacheSimulator
+from src.optimization.conflict_analyzer import ConflictAnalyzer, find_regions
+
+SPAN = 64 * 16  # bytes covered by a 64-line cache with 16-byte blocks
+
+class TestConflictAnalyzer(unittest.TestCase):
+    def test_classifies_misses(self):
+        # Two blocks one cache span apart thrash one set; a fully associative cache would hold both
+        analyzer = ConflictAnalyzer(CacheSimulator(cache_size=64, block_size=16))
+        report = analyzer.analyze([0, SPAN, 0, SPAN, 0])
+        self.assertEqual(report['misses'], 5)
+        self.assertEqual(report['compulsory_misses'], 2)
+        self.assertEqual(report['conflict_misses'], 3)
+        self.assertEqual(report['hot_sets'][0], {'set': 0, 'conflict_misses': 3, 'evictions': 4})
+        self.assertEqual(report['hot_pairs'][0]['b'], hex(SPAN))
+        self.assertEqual(report['hot_pairs'][0]['conflicts'], 3)
+
+    def test_offset_between_aligned_arrays(self):
+        a, b = 0x10000, 0x10000 + 8 * SPAN
+        trace = [address for _ in range(4) for i in range(0, 512, 4) for address in (a + i, b + i)]
+        analyzer = ConflictAnalyzer(CacheSimulator(cache_size=64, block_size=16))
+        report = analyzer.analyze(trace)
+
+        self.assertEqual([name for name, _, _ in analyzer.regions], ['0x10000-0x10200', '0x12000-0x12200'])
+        self.assertEqual(report['region_conflicts'],
+                         [{'region_a': '0x10000-0x10200', 'region_b': '0x12000-0x12200', 'conflicts': 960}])
+        suggestion = report['suggestions'][0]
+        self.assertEqual(suggestion['kind'], 'offset')
+        self.assertEqual(suggestion['offset_bytes'], 512)
+        self.assertEqual(suggestion['conflict_misses'], 0)
+        self.assertEqual(suggestion['conflict_reduction'], 100.0)
+        # Moving both arrays by the same offset would undo the fix, so only the first is moved
+        self.assertEqual(report['combined'], {'misses': 64, 'conflict_misses': 0, 'miss_reduction': 93.75,
+                                              'conflict_reduction': 100.0, 'regions': ['0x10000-0x10200']})
+
+    def test_row_padding_for_column_walk(self):
+        trace = [0x40000 + row * SPAN + column for _ in range(3) for column in range(0, 64, 4) for row in range(16)]
+        analyzer = ConflictAnalyzer(CacheSimulator(cache_size=64, block_size=16),
+                                    regions=[('matrix', 0x40000, 0x40000 + 16 * SPAN)])
+        report = analyzer.analyze(trace)
+        suggestion = report['suggestions'][0]
+        self.assertEqual(suggestion['kind'], 'row_padding')
+        self.assertEqual((suggestion['row_bytes'], suggestion['pad_bytes']), (SPAN, 16))
+        self.assertLess(suggestion['conflict_misses'], report['conflict_misses'] / 4)
+
+    def test_remap_keeps_blocks_distinct(self):
+        trace = np.arange(0, 4 * SPAN, 16)
+        analyzer = ConflictAnalyzer(CacheSimulator(cache_size=64, block_size=16), regions=[('all', 0, 4 * SPAN)])
+        analyzer.analyze(trace)
+        remapped = analyzer.remap([{'kind': 'row_padding', 'region': 'all', 'row_bytes': SPAN, 'pad_bytes': 16}])
+        self.assertEqual(len(np.unique(remapped // 16)), len(trace))
+
+    def test_find_regions(self):
+        regions = find_regions(np.array([0x100, 0x104, 0x5000, 0x5010]), gap=0x1000, block_size=16)
+        self.assertEqual(regions, [('0x100-0x110', 0x100, 0x110), ('0x5000-0x5020', 0x5000, 0x5020)])
+
+if __name__ == '__main__':
+    unittest.main()
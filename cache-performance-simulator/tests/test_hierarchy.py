@@ -0,0 +1,54 @@
+import unittest
+from src.cache.browser_cache_simulator import BrowserLRUCache
+from src.cache.hierarchy import CacheHierarchy, ConsistentHashRing, KeyCache
+from src.memory.workloads import zipf_stream
+
+class TestHierarchy(unittest.TestCase):
+    def setUp(self):
+        pages = zipf_stream(6000, num_blocks=300, block_size=1, scatter=False, seed=7).tolist()
+        self.requests = [(f"client{i % 50}", f"/page{page}") for i, page in enumerate(pages)]
+
+    def test_lru_key_cache_matches_browser_cache(self):
+        urls = [url for _, url in self.requests]
+        key_cache, browser = KeyCache(20), BrowserLRUCache(20)
+        for url in urls:
+            self.assertEqual(key_cache.access(url), browser.access_page(url))
+
+    def test_fifo_and_lfu_eviction(self):
+        fifo = KeyCache(2, 'fifo')
+        for key in ['a', 'b', 'a', 'c']:
+            fifo.access(key)
+        self.assertFalse(fifo.access('a'))  # 'a' was the oldest insert despite its hit
+
+        lfu = KeyCache(2, 'lfu')
+        for key in ['a', 'a', 'b', 'c']:
+            lfu.access(key)
+        self.assertTrue(lfu.access('a'))    # 'b' had the lowest count and was evicted
+        self.assertFalse(lfu.access('b'))
+
+    def test_tiers_account_for_every_request(self):
+        hierarchy = CacheHierarchy(browser_capacity=5, proxy_capacity=50, proxy_nodes=4)
+        hierarchy.simulate(self.requests)
+        report = hierarchy.report()
+        self.assertEqual(report['browser_hits'] + report['proxy_hits'] + report['origin_requests'],
+                         len(self.requests))
+        self.assertEqual(sum(row['requests'] for row in report['nodes']), report['proxy_requests'])
+        self.assertGreaterEqual(report['load_imbalance'], 1.0)
+
+    def test_single_proxy_tier_matches_lru(self):
+        hierarchy = CacheHierarchy(browser_capacity=0, proxy_capacity=40)
+        hierarchy.simulate(self.requests)
+        proxy = BrowserLRUCache(40)
+        for _, url in self.requests:
+            proxy.access_page(url)
+        self.assertEqual(hierarchy.report()['origin_requests'], proxy.misses)
+
+    def test_consistent_hashing_moves_few_keys(self):
+        keys = [f"/page{i}" for i in range(2000)]
+        before, after = ConsistentHashRing(8), ConsistentHashRing(9)
+        moved = sum(before.node_for(key) != after.node_for(key) for key in keys)
+        # Roughly 1/9 of the keys should move to the new node
+        self.assertLess(moved, len(keys) * 0.25)
+
+if __name__ == '__main__':
+    unittest.main()
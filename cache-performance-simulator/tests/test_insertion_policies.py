@@ -0,0 +1,104 @@
+import unittest
+from collections import OrderedDict
+import numpy as np
+from src.cache.instrumentation import CacheInstrumentation
+from src.cache.set_associative import POLICIES, SetAssociativeCache
+from src.memory.block_stream import build_block_stream
+
+# 64 lines of 4 bytes, 4-way: 16 sets
+def _cache(policy, **kwargs):
+    return SetAssociativeCache(cache_size=64, block_size=4, associativity=4, policy=policy, leader_sets=2, **kwargs)
+
+def _run(policy, trace):
+    cache = _cache(policy)
+    for address in trace:
+        cache.access_memory(address)
+    return cache
+
+# A loop over 1.5x the cache: LRU evicts every block just before its reuse
+THRASH = [block * 4 for block in range(96)] * 40
+
+# A small hot set reused between scans of blocks that are never touched again
+SCANS = []
+for scan in range(30):
+    SCANS += [block * 4 for block in range(32)] * 2
+    SCANS += [(10000 + 64 * scan + block) * 4 for block in range(64)]
+
+# Two working sets that each fit, one after the other: LIP never lets the second one in
+PHASES = [block * 4 for block in range(64)] * 10 + [(block + 1000) * 4 for block in range(64)] * 10
+
+class TestInsertionPolicies(unittest.TestCase):
+    def test_lru_matches_reference(self):
+        trace = np.random.default_rng(1).integers(0, 2048, 5000).tolist()
+        cache = _run('lru', trace)
+        sets = [OrderedDict() for _ in range(16)]
+        hits = 0
+        for address in trace:
+            block = address // 4
+            ways = sets[block % 16]
+            if block in ways:
+                ways.move_to_end(block)
+                hits += 1
+            else:
+                if len(ways) == 4:
+                    ways.popitem(last=False)
+                ways[block] = True
+        self.assertEqual(cache.hits, hits)
+        self.assertEqual(cache.sets[3], [block // 16 for block in reversed(sets[3])])
+
+    def test_thrash_resistant_policies_beat_lru(self):
+        hits = {policy: _run(policy, THRASH).hits for policy in POLICIES}
+        self.assertEqual((hits['lru'], hits['srrip']), (0, 0))
+        for policy in ('lip', 'bip', 'brrip', 'dip', 'drrip'):
+            self.assertGreater(hits[policy], len(THRASH) // 4)
+
+    def test_srrip_protects_reused_lines_from_scans(self):
+        self.assertGreater(_run('srrip', SCANS).hits, 1.5 * _run('lru', SCANS).hits)
+
+    def test_rrpv_state_is_compact(self):
+        cache = _run('srrip', SCANS[:200])
+        self.assertIsInstance(cache.rrpv, bytearray)
+        self.assertEqual(len(cache.rrpv), 64)
+        self.assertLessEqual(max(cache.rrpv), 3)
+
+    def test_set_dueling_picks_the_better_policy(self):
+        self.assertEqual(_run('dip', THRASH).dueling_stats()['winner'], 'bip')
+        self.assertEqual(_run('drrip', THRASH).dueling_stats()['winner'], 'brrip')
+
+        dip = _run('dip', PHASES)
+        self.assertEqual(dip.dueling_stats()['winner'], 'lru')
+        self.assertGreater(dip.hits, _run('lip', PHASES).hits)
+        self.assertEqual(_run('drrip', PHASES).dueling_stats()['winner'], 'srrip')
+
+    def test_instrumentation_samples_the_winner(self):
+        instrumentation = CacheInstrumentation(sample_interval=100)
+        cache = _cache('dip', instrumentation=instrumentation)
+        for address in PHASES[:640] + THRASH:
+            cache.access_memory(address)
+        samples = instrumentation.samples()
+        self.assertEqual(len(samples['psel']), len(samples['accesses']))
+        self.assertEqual(samples['duel_winner'][-1], 1)
+        self.assertEqual(samples['duel_winner'][0], 0)
+        self.assertEqual(instrumentation.misses, cache.misses)
+        self.assertIn('duel_winner', instrumentation.to_chart_data())
+
+    def test_block_stream_matches_per_access(self):
+        trace = np.random.default_rng(2).integers(0, 1024, 3000)
+        trace = np.repeat(trace, np.random.default_rng(3).integers(1, 4, len(trace)))
+        for policy in POLICIES:
+            expected = _run(policy, trace.tolist())
+            streamed = _cache(policy)
+            streamed.simulate_block_stream(build_block_stream(trace, 4))
+            self.assertEqual((streamed.hits, streamed.misses), (expected.hits, expected.misses))
+            self.assertEqual(streamed.sets, expected.sets)
+
+    def test_rejects_invalid_geometry(self):
+        with self.assertRaises(ValueError):
+            SetAssociativeCache(cache_size=64, associativity=3)
+        with self.assertRaises(ValueError):
+            SetAssociativeCache(policy='mru')
+        with self.assertRaises(ValueError):
+            SetAssociativeCache(cache_size=4, associativity=4, policy='drrip')
+
+if __name__ == '__main__':
+    unittest.main()
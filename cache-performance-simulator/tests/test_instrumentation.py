@@ -0,0 +1,60 @@
+import unittest
+from src.cache.cache_simulator import CacheSimulator
+from src.cache.browser_cache_simulator import BrowserLRUCache
+from src.cache.instrumentation import CacheInstrumentation
+
+class TestInstrumentation(unittest.TestCase):
+    def test_uninstrumented_simulator_keeps_plain_path(self):
+        cache = CacheSimulator(cache_size=16, block_size=4)
+        self.assertNotIn('access_memory', vars(cache))
+
+    def test_instrumented_results_match_plain(self):
+        trace = [1000, 1004, 2000, 1000, 3000, 1004, 4000] * 20
+        plain = CacheSimulator(cache_size=16, block_size=4)
+        instrumented = CacheSimulator(cache_size=16, block_size=4, instrumentation=CacheInstrumentation(10))
+        for address in trace:
+            self.assertEqual(plain.access_memory(address), instrumented.access_memory(address))
+        self.assertEqual((plain.hits, plain.misses), (instrumented.hits, instrumented.misses))
+
+    def test_per_set_counters(self):
+        instrumentation = CacheInstrumentation()
+        cache = CacheSimulator(cache_size=4, block_size=4, instrumentation=instrumentation)
+        for address in [0, 0, 16, 0, 4]:  # 0 and 16 conflict in set 0
+            cache.access_memory(address)
+        counters = instrumentation.per_set_counters()
+        self.assertEqual(counters['hits'].tolist(), [1, 0, 0, 0])
+        self.assertEqual(counters['misses'].tolist(), [3, 1, 0, 0])
+        self.assertEqual(counters['evictions'].tolist(), [2, 0, 0, 0])
+
+    def test_samples_and_window_hit_rates(self):
+        instrumentation = CacheInstrumentation(sample_interval=4, expected_accesses=2)
+        cache = CacheSimulator(cache_size=4, block_size=4, instrumentation=instrumentation)
+        # First window: 4 misses, then repeated hits
+        for address in [0, 4, 8, 12] + [0] * 10:
+            cache.access_memory(address)
+        data = instrumentation.to_chart_data()
+        self.assertEqual(data['accesses'], [4, 8, 12, 14])
+        self.assertEqual(data['hits'], [0, 4, 8, 10])
+        self.assertEqual(data['misses'], [4, 4, 4, 4])
+        _, rates = instrumentation.window_hit_rates(window=8)
+        self.assertEqual(rates.tolist(), [0.0, 50.0, 100.0])
+
+    def test_hooks(self):
+        evictions = []
+        instrumentation = CacheInstrumentation(on_evict=lambda old, new, index: evictions.append((old, new, index)))
+        cache = CacheSimulator(cache_size=4, block_size=4, instrumentation=instrumentation)
+        cache.access_memory(0)
+        cache.access_memory(16)
+        self.assertEqual(evictions, [(0, 16, 0)])
+
+    def test_browser_cache_instrumentation(self):
+        evicted = []
+        instrumentation = CacheInstrumentation(sample_interval=2, on_evict=lambda old, new, index: evicted.append(old))
+        cache = BrowserLRUCache(2, instrumentation=instrumentation)
+        for url in ['a', 'b', 'a', 'c', 'b']:
+            cache.access_page(url)
+        self.assertEqual(evicted, ['b', 'a'])
+        self.assertEqual(instrumentation.to_chart_data()['hits'], [0, 1, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from src.cache.browser_cache_simulator import BrowserLRUCache
+from src.cache.cache_simulator import CacheSimulator
+from src.memory.live_stream import LiveIngest, RollingStats, ingest
+from src.memory.workloads import zipf_stream
+
+class TestLiveStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addresses = zipf_stream(20000, num_blocks=512, seed=4).tolist()
+        self.payload = "".join(f"{address:x}\n" for address in self.addresses).encode()
+        self.expected = CacheSimulator(cache_size=64, block_size=16)
+        for address in self.addresses:
+            self.expected.access_memory(address)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertMatchesExpected(self, cache, snapshot):
+        self.assertEqual(snapshot['total_accesses'], len(self.addresses))
+        self.assertEqual(cache.hits, self.expected.hits)
+        self.assertEqual(cache.tags, self.expected.tags)
+
+    def test_fifo_ingest(self):
+        path = os.path.join(self.tmp.name, 'trace.fifo')
+        os.mkfifo(path)
+
+        def produce():
+            with open(path, 'wb') as f:
+                f.write(self.payload)
+
+        writer = threading.Thread(target=produce)
+        writer.start()
+        cache = CacheSimulator(cache_size=64, block_size=16)
+        snapshot = ingest(cache, path, batch_size=1000, max_pending=2, on_report=lambda snapshot: None)
+        writer.join()
+        self.assertMatchesExpected(cache, snapshot)
+
+    def test_unix_socket_with_several_producers(self):
+        path = os.path.join(self.tmp.name, 'trace.sock')
+        urls = ['a.com', 'b.com', 'a.com', 'c.com']
+        cache = BrowserLRUCache(10)
+        ingest_run = LiveIngest(cache, kind='browser', on_report=lambda snapshot: None)
+
+        async def produce():
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+            for _ in range(2):
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write("".join(url + "\n" for url in urls).encode())
+                await writer.drain()
+                writer.write_eof()
+                # The ingest closes its side of the connection once it has read everything
+                self.assertEqual(await asyncio.wait_for(reader.read(), 5), b'')
+                writer.close()
+                await writer.wait_closed()
+
+        async def run():
+            return (await asyncio.gather(ingest_run.run(f"unix://{path}", connections=2), produce()))[0]
+
+        snapshot = asyncio.run(run())
+        self.assertEqual(snapshot['total_accesses'], 8)
+        self.assertEqual(cache.misses, 3)
+        self.assertFalse(os.path.exists(path))
+
+    def test_regular_file_and_bad_lines(self):
+        path = os.path.join(self.tmp.name, 'trace.txt')
+        cut = self.payload.index(b"\n", 100) + 1
+        with open(path, 'wb') as f:
+            f.write(self.payload[:cut] + b"not-an-address\n\n" + self.payload[cut:])
+        cache = CacheSimulator(cache_size=64, block_size=16)
+        snapshot = ingest(cache, path, on_report=lambda snapshot: None)
+        self.assertEqual(snapshot['parse_errors'], 1)
+        self.assertMatchesExpected(cache, snapshot)
+
+    def test_rolling_window(self):
+        stats = RollingStats(window=10.0)
+        stats.started = 0.0
+        stats.record(100, 90, now=1.0)
+        stats.record(100, 10, now=15.0)
+        snapshot = stats.snapshot(now=15.0)
+        self.assertEqual(snapshot['hit_rate'], 50.0)
+        self.assertEqual(snapshot['window_hit_rate'], 10.0)
+        self.assertEqual(snapshot['throughput'], 10.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+from src.cache.cache_simulator import CacheSimulator
+from src.cache.parallel import partition_by_set, simulate_partitioned
+from src.memory.workloads import phase_mixture
+
+class TestParallelSimulation(unittest.TestCase):
+    def setUp(self):
+        phases = [(1, 'zipf', {'num_blocks': 512}), (1, 'loop', {'loop_length': 100}), (1, 'uniform', {})]
+        self.trace = phase_mixture(phases, 20000, seed=11, interleave=True)
+
+    def serial(self, cache_size, block_size):
+        cache = CacheSimulator(cache_size=cache_size, block_size=block_size)
+        for address in self.trace.tolist():
+            cache.access_memory(address)
+        return cache
+
+    def test_partitions_cover_every_set_and_access(self):
+        sorted_addresses, partitions = partition_by_set(self.trace, 64, 4, 4)
+        self.assertEqual(partitions[0][0], 0)
+        self.assertEqual(partitions[-1][1], 64)
+        self.assertEqual(partitions[-1][3], len(self.trace))
+        for previous, current in zip(partitions, partitions[1:]):
+            self.assertEqual(previous[1], current[0])
+            self.assertEqual(previous[3], current[2])
+        self.assertEqual(sorted(sorted_addresses.tolist()), sorted(self.trace.tolist()))
+
+    def test_parallel_matches_serial(self):
+        expected = self.serial(64, 16)
+        for workers in (1, 2, 3):
+            merged = simulate_partitioned(self.trace, cache_size=64, block_size=16, workers=workers)
+            self.assertEqual((merged.total_accesses, merged.hits, merged.misses),
+                             (expected.total_accesses, expected.hits, expected.misses))
+            self.assertEqual(merged.tags, expected.tags)
+            self.assertEqual(merged.valid_bits, expected.valid_bits)
+
+if __name__ == '__main__':
+    unittest.main()
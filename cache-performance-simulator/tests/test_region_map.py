@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.cache.cache_analyzer import CacheAnalyzer
+from src.cache.cache_simulator import CacheSimulator
+from src.cache.instrumentation import CacheInstrumentation
+from src.cache.set_associative import SetAssociativeCache
+from src.memory.block_stream import build_block_stream
+from src.memory.region_map import RegionMap
+
+class TestRegionMap(unittest.TestCase):
+    def setUp(self):
+        self.regions = RegionMap([('b', 0x200, 0x300), ('a', 0x0, 0x100)])
+
+    def test_lookup_uses_sorted_index(self):
+        self.assertEqual(self.regions.names, ['a', 'b'])
+        indices = self.regions.lookup([0x0, 0xff, 0x100, 0x200, 0x2ff, 0x300, -1])
+        self.assertEqual(indices.tolist(), [0, 0, 2, 1, 1, 2, 2])
+        self.assertEqual(self.regions.region_of(0x250), 'b')
+        self.assertIsNone(self.regions.region_of(0x150))
+
+    def test_rejects_overlap(self):
+        with self.assertRaises(ValueError):
+            self.regions.add('c', 0xf0, 0x110)
+        with self.assertRaises(ValueError):
+            self.regions.add('d', 0x400, 0x400)
+
+    def test_load_name_ranges_and_nm_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'regions.txt')
+            with open(path, 'w') as f:
+                f.write("# data\nmatrix 0x1000 0x2000\n0000000000003000 0000000000000100 B counts\n")
+            region_map = RegionMap.load(path)
+        self.assertEqual(list(region_map), [('matrix', 0x1000, 0x2000), ('counts', 0x3000, 0x3100)])
+        self.assertIsNone(RegionMap.load('missing_regions.txt'))
+
+class TestRegionAttribution(unittest.TestCase):
+    def test_misses_and_evictions_per_region(self):
+        instrumentation = CacheInstrumentation(region_map=RegionMap([('a', 0, 64), ('b', 64, 128)]), region_batch=2)
+        cache = CacheSimulator(cache_size=4, block_size=16, instrumentation=instrumentation)
+        for address in [0, 0, 64, 0, 16, 200]:  # 0, 64 and the unmapped 200 share set 0
+            cache.access_memory(address)
+        rows = {row['region']: row for row in CacheAnalyzer.analyze_region_misses(cache)}
+        self.assertEqual((rows['a']['accesses'], rows['a']['misses'], rows['a']['evictions']), (4, 3, 2))
+        self.assertEqual((rows['b']['misses'], rows['b']['evictions']), (1, 1))
+        self.assertEqual(rows['(unmapped)']['misses'], 1)
+        self.assertAlmostEqual(sum(row['miss_share'] for row in rows.values()), 100.0)
+        self.assertIn('Miss rate', CacheAnalyzer.format_region_table(list(rows.values())))
+
+    def test_block_stream_matches_per_access(self):
+        region_map = RegionMap([('low', 0, 4096), ('high', 4096, 8192)])
+        trace = np.random.default_rng(1).integers(0, 10000, 2000)
+        tables = []
+        for use_stream in (False, True):
+            instrumentation = CacheInstrumentation(region_map=region_map, region_batch=100)
+            cache = CacheSimulator(cache_size=32, block_size=16, instrumentation=instrumentation)
+            if use_stream:
+                cache.simulate_block_stream(build_block_stream(trace, 16))
+            else:
+                for address in trace.tolist():
+                    cache.access_memory(address)
+            tables.append(instrumentation.region_table())
+        self.assertEqual(tables[0], tables[1])
+        self.assertEqual(sum(row['accesses'] for row in tables[0]), len(trace))
+
+    def test_block_stream_rejects_unaligned_regions(self):
+        # The a/b boundary falls inside block 0, so a run of block 0 spans both regions
+        region_map = RegionMap([('a', 0, 8), ('b', 8, 64)])
+        trace = np.array([0, 12, 12, 40, 44])
+        instrumentation = CacheInstrumentation(region_map=region_map)
+        cache = CacheSimulator(cache_size=4, block_size=16, instrumentation=instrumentation)
+        for address in trace.tolist():
+            cache.access_memory(address)
+        rows = {row['region']: row['accesses'] for row in instrumentation.region_table()}
+        self.assertEqual((rows['a'], rows['b']), (1, 4))
+
+        for simulator in (CacheSimulator, SetAssociativeCache):
+            cache = simulator(cache_size=4, block_size=16, instrumentation=CacheInstrumentation(region_map=region_map))
+            with self.assertRaisesRegex(ValueError, "Region a .* not aligned to 16-byte blocks"):
+                cache.simulate_block_stream(build_block_stream(trace, 16))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.cache.cache_analyzer import CacheAnalyzer
+from src.cache.results_table import ResultsTable, RunStore
+
+def _row(run, cache_size, block_size, miss_rate):
+    return {'run': run, 'cache_size': cache_size, 'block_size': block_size,
+            'cache_bytes': cache_size * block_size, 'hit_rate': 100.0 - miss_rate, 'miss_rate': miss_rate}
+
+class TestResultsTable(unittest.TestCase):
+    def setUp(self):
+        self.rows = [_row('a', 16, 4, 40.0), _row('a', 32, 4, 30.0), _row('a', 16, 8, 35.0),
+                     _row('a', 64, 4, 31.0), _row('b', 16, 4, 38.0), _row('b', 64, 4, 20.0), _row('b', 128, 4, 20.0)]
+        self.table = ResultsTable.from_rows(self.rows)
+
+    def test_columns_are_typed(self):
+        dtype = self.table.data.dtype
+        self.assertEqual((dtype['cache_size'], dtype['miss_rate'], dtype['run'].kind), (np.int64, np.float64, 'U'))
+        self.assertEqual(self.table.rows()[0], self.rows[0])
+
+    def test_rank_and_where(self):
+        ranked = self.table.where(run='a').rank('miss_rate', top=2)
+        self.assertEqual(ranked['cache_size'].tolist(), [32, 64])
+        self.assertEqual(self.table.rank('cache_size', descending=True, top=1)['cache_size'].tolist(), [128])
+
+    def test_pareto_front(self):
+        front = self.table.where(run='a').pareto_front('cache_bytes', 'miss_rate')
+        # 64x4 costs more than 32x4 and misses more, so it is dominated
+        self.assertEqual(front['cache_bytes'].tolist(), [64, 128])
+        self.assertEqual(front['miss_rate'].tolist(), [40.0, 30.0])
+
+    def test_diff_joins_on_configuration(self):
+        diff = self.table.where(run='a').diff(self.table.where(run='b'), metrics=('miss_rate',))
+        table = diff['table']
+        self.assertEqual(table['cache_size'].tolist(), [16, 64])
+        self.assertEqual(table['miss_rate_change'].tolist(), [-2.0, -11.0])
+        self.assertEqual((diff['only_a'], diff['only_b']), (2, 1))
+
+    def test_diff_uses_last_row_of_repeated_configurations(self):
+        a = ResultsTable.from_rows([_row('a', 16, 4, 40.0), _row('a', 16, 4, 30.0), _row('a', 32, 4, 25.0)])
+        b = ResultsTable.from_rows([_row('b', 16, 4, 50.0), _row('b', 16, 4, 20.0), _row('b', 64, 4, 10.0),
+                                    _row('b', 64, 4, 12.0)])
+        diff = a.diff(b, metrics=('miss_rate',))
+        self.assertEqual(diff['table']['cache_size'].tolist(), [16])
+        self.assertEqual(diff['table']['miss_rate_change'].tolist(), [-10.0])
+        self.assertEqual((diff['only_a'], diff['only_b']), (1, 1))
+
+        same = a.diff(a, metrics=('miss_rate',))
+        self.assertEqual((len(same['table']), same['only_a'], same['only_b']), (2, 0, 0))
+
+    def test_run_store_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('runs.csv', 'runs.jsonl'):
+                path = os.path.join(tmp, name)
+                store = RunStore(path)
+                for row in self.rows[:3]:
+                    store.append(row)
+                RunStore(path).extend(self.rows[3:])
+                loaded = RunStore(path).load()
+                np.testing.assert_array_equal(loaded.data, self.table.data)
+
+    def test_numpy_scalars_round_trip(self):
+        stats = [{'cache_size': np.int64(16), 'miss_rate': np.float64(12.5), 'hits': np.int32(7)}]
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('runs.csv', 'runs.jsonl'):
+                path = CacheAnalyzer.export_results(stats, tmp, name)
+                loaded = RunStore(path).load()
+                self.assertEqual(loaded['cache_size'].tolist(), [16])
+                self.assertEqual(loaded['miss_rate'].tolist(), [12.5])
+                self.assertEqual(loaded['hits'].tolist(), [7])
+
+    def test_csv_store_widens_for_new_columns(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'runs.csv')
+            RunStore(path).extend(self.rows[:2])
+            RunStore(path).extend([dict(self.rows[2], victim_entries=8, policy='lru')])
+            loaded = RunStore(path).load()
+        self.assertEqual(loaded.columns, list(self.rows[0]) + ['victim_entries', 'policy'])
+        self.assertEqual(loaded['cache_size'].tolist(), [16, 32, 16])
+        self.assertTrue(np.isnan(loaded['victim_entries'][0]))
+        self.assertEqual(loaded['victim_entries'][2], 8)
+        self.assertEqual(loaded['policy'].tolist(), ['', '', 'lru'])
+
+    def test_csv_with_missing_values(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'runs.csv')
+            RunStore(path).extend([{'run': 'a', 'misses': 3, 'miss_rate': 0.5}, {'run': 'b', 'misses': 4}])
+            loaded = ResultsTable.load(path)
+        self.assertEqual(loaded['misses'].tolist(), [3, 4])
+        self.assertTrue(np.isnan(loaded['miss_rate'][1]))
+
+    def test_analyzer_compares_many(self):
+        stats = [{'hits': hits, 'misses': 100 - hits, 'hit_rate': float(hits), 'miss_rate': 100.0 - hits}
+                 for hits in (50, 80, 65)]
+        summary = CacheAnalyzer.compare_many(stats)
+        self.assertTrue(summary.endswith("Cache 2 is best by miss_rate (20.00)."))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = CacheAnalyzer.export_results(stats, tmp, run='sweep')
+            self.assertEqual(ResultsTable.load(path)['run'].tolist(), ['sweep'] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from src.memory.sketches import HyperLogLog, CountMinSketch, SpaceSaving, StreamProfile, hash_keys
+from src.memory.access_patterns import profile_access_stream, generate_streaming_report
+
+class TestSketches(unittest.TestCase):
+    def test_hyperloglog_estimate_within_error(self):
+        hll = HyperLogLog(precision=12)
+        hll.add_hashes(hash_keys(np.arange(100000)))
+        error = abs(hll.estimate() - 100000) / 100000
+        self.assertLess(error, 4 * hll.relative_error())
+
+    def test_hyperloglog_small_range(self):
+        hll = HyperLogLog(precision=12)
+        hll.add_hashes(hash_keys(np.array([1, 2, 3, 3, 2, 1])))
+        self.assertEqual(round(hll.estimate()), 3)
+
+    def test_count_min_never_underestimates(self):
+        cms = CountMinSketch(epsilon=0.01, delta=0.01)
+        keys = np.random.default_rng(0).integers(0, 5000, size=50000)
+        cms.add_hashes(hash_keys(keys))
+        unique, counts = np.unique(keys, return_counts=True)
+        estimates = cms.estimate_hashes(hash_keys(unique))
+        self.assertTrue(np.all(estimates >= counts))
+        self.assertTrue(np.all(estimates - counts <= cms.error_bound()))
+
+    def test_space_saving_finds_heavy_hitters(self):
+        ss = SpaceSaving(k=10)
+        stream = ['a'] * 500 + ['b'] * 300 + [f"rare{i}" for i in range(1000)]
+        for key in stream:
+            ss.update(key)
+        top = ss.top(2)
+        self.assertEqual([key for key, _, _ in top], ['a', 'b'])
+        self.assertEqual(len(ss.counts), 10)
+
+    def test_profile_memory_is_fixed(self):
+        small = StreamProfile(top_k=20)
+        small.update_many(np.arange(1000))
+        large = StreamProfile(top_k=20)
+        large.update_many(np.arange(200000))
+        self.assertEqual(small.memory_bytes(), large.memory_bytes())
+        self.assertLessEqual(len(large.space_saving.counts), 20)
+
+    def test_profile_urls(self):
+        urls = ["https://site1.com"] * 50 + ["https://site2.com"] * 20 + ["https://site3.com"] * 5
+        profile = profile_access_stream(urls, top_k=10)
+        self.assertEqual(profile.distinct_count(), 3)
+        hitters = profile.heavy_hitters(2)
+        self.assertEqual(hitters[0][:2], ("https://site1.com", 50))
+        self.assertEqual(hitters[1][:2], ("https://site2.com", 20))
+
+    def test_streaming_report(self):
+        report = generate_streaming_report(profile_access_stream([1000, 1000, 2000]))
+        self.assertIn("Distinct addresses (est.): 2", report)
+        self.assertIn("1000", report)
+
+if __name__ == '__main__':
+    unittest.main()
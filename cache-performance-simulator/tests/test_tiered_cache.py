@@ -0,0 +1,51 @@
+import unittest
+from src.cache.tiered_cache import LatencyModel, TwoTierBrowserCache, split_page_loads
+
+class TestTieredCache(unittest.TestCase):
+    def setUp(self):
+        self.latency = LatencyModel(memory_hit_ms=1, memory_mb_per_s=1e9, disk_hit_ms=10, disk_mb_per_s=1e9,
+                                    network_rtt_ms=100, network_mbit_per_s=1e9)
+
+    def test_promotion_and_demotion(self):
+        cache = TwoTierBrowserCache(memory_budget=200, disk_budget=1000, latency=self.latency)
+        self.assertEqual(cache.access('a', 100)[0], 'network')
+        self.assertEqual(cache.access('b', 100)[0], 'network')
+        cache.access('c', 100)                      # 'a' is demoted to disk
+        self.assertEqual(list(cache.disk), ['a'])
+        self.assertEqual(cache.access('a')[0], 'disk')    # promoted back, 'b' demoted
+        self.assertEqual(list(cache.memory), ['c', 'a'])
+        self.assertEqual(list(cache.disk), ['b'])
+        self.assertEqual(cache.access('a')[0], 'memory')
+        self.assertEqual((cache.promotions, cache.demotions), (1, 2))
+        self.assertLessEqual(cache.memory_used, 200)
+
+    def test_large_objects_bypass_memory(self):
+        cache = TwoTierBrowserCache(memory_budget=100, disk_budget=1000, latency=self.latency)
+        cache.access('video', 500)
+        self.assertEqual(list(cache.memory), [])
+        self.assertEqual(cache.access('video')[0], 'disk')
+        # Too big for memory, so the disk hit leaves it on disk and is not a promotion
+        self.assertEqual(cache.promotions, 0)
+        self.assertIn('video', cache.disk)
+        cache.access('huge', 5000)
+        self.assertEqual(cache.access('huge', 5000)[0], 'network')
+
+    def test_page_load_uses_parallel_fetches(self):
+        cache = TwoTierBrowserCache(latency=self.latency, parallel_fetches=2)
+        # Three network fetches of 100 ms over two connections take 200 ms
+        self.assertAlmostEqual(cache.load_page([('/', 10), ('/a.js', 10), ('/b.css', 10)]), 200)
+        # All memory hits the second time
+        self.assertAlmostEqual(cache.load_page([('/', 10), ('/a.js', 10), ('/b.css', 10)]), 2)
+        report = cache.report(percentiles=(50,))
+        self.assertEqual(report['pages'], 2)
+        self.assertEqual(report['memory_hits'], 3)
+        self.assertAlmostEqual(report['page_load_ms']['mean'], 101)
+
+    def test_split_page_loads(self):
+        requests = [('u1', '/', 0), ('u2', '/x', 0), ('u1', '/app.js', 0), ('u1', '/next', 0), ('u2', '/y.png?v=2', 0)]
+        pages = list(split_page_loads(requests))
+        self.assertEqual(pages, [('u1', [('/', 0), ('/app.js', 0)]), ('u1', [('/next', 0)]),
+                                 ('u2', [('/x', 0), ('/y.png?v=2', 0)])])
+
+if __name__ == '__main__':
+    unittest.main()
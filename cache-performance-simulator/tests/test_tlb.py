@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from src.cache.cache_simulator import CacheSimulator
+from src.memory.tlb import MMU, PageTable, TLB, PAGE_SIZES
+from src.memory.workloads import strided_stream
+
+class TestTLB(unittest.TestCase):
+    def test_tlb_lru_replacement(self):
+        tlb = TLB(entries=2, associativity=2)
+        results = [tlb.lookup(vpn, 4096) for vpn in [1, 2, 1, 3, 2]]
+        self.assertEqual(results, [False, False, True, False, False])
+
+    def test_first_touch_frames_are_aligned(self):
+        table = PageTable(huge_page_regions=[(1 << 30, (1 << 30) + (4 << 20), '2M')])
+        self.assertEqual(table.translate(0x1234), 0x234)  # First frame
+        self.assertEqual(table.translate((1 << 30) + 0x10), (2 << 20) + 0x10)
+        self.assertEqual(table.page_size_for((1 << 30) + (5 << 20)), PAGE_SIZES['4K'])
+
+    def test_walk_cost_by_page_size(self):
+        mmu = MMU(page_table=PageTable(default_page_size='2M'), walk_cycles_per_level=10)
+        mmu.access(0)
+        mmu.access(4096)
+        report = mmu.report()
+        self.assertEqual(report['page_walks'], 1)
+        self.assertEqual(report['walk_cycles'], 30)
+        self.assertEqual(report['tlb_hit_rate'], 50.0)
+
+    def test_huge_pages_reduce_walks(self):
+        trace = strided_stream(20000, stride=4096, span=64 << 20)
+        small = MMU()
+        small.simulate(trace)
+        huge = MMU(page_table=PageTable(default_page_size='2M'))
+        huge.simulate(trace)
+        self.assertLess(huge.report()['walk_cycles'], small.report()['walk_cycles'] / 10)
+
+    def test_simulate_matches_per_address_access(self):
+        rng = np.random.default_rng(4)
+        trace = np.concatenate([np.repeat(rng.integers(0, 1 << 24, 300), 3), rng.integers(0, 1 << 30, 300)])
+        regions = [(0, 8 << 20, '2M')]
+        vectorized = MMU(TLB(16, 4), PageTable(huge_page_regions=regions), CacheSimulator(64, 16))
+        physical = vectorized.simulate(trace)
+        scalar = MMU(TLB(16, 4), PageTable(huge_page_regions=regions), CacheSimulator(64, 16))
+        expected = [scalar.access(address) for address in trace.tolist()]
+        self.assertEqual(physical.tolist(), expected)
+        self.assertEqual(vectorized.report(), scalar.report())
+        self.assertEqual(vectorized.data_cache.misses, scalar.data_cache.misses)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.memory.trace_formats import OP_IFETCH, OP_MODIFY, OP_READ, OP_WRITE, detect_format, parse_trace
+
+class TestTraceFormats(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_lackey(self):
+        path = self.write('lackey.out', "==42== Lackey, an example Valgrind tool\n"
+                                        "I  0023C790,2\n S BE80199C,4\n L 0025B5A8,8\n M 0421C7F0,4\n")
+        trace = parse_trace(path)
+        self.assertEqual(trace.trace_format, 'lackey')
+        self.assertEqual(trace.addresses.tolist(), [0x23C790, 0xBE80199C, 0x25B5A8, 0x421C7F0])
+        self.assertEqual(trace.ops.tolist(), [OP_IFETCH, OP_WRITE, OP_READ, OP_MODIFY])
+        self.assertEqual(trace.sizes.tolist(), [2, 4, 8, 4])
+        self.assertEqual(trace.error_count, 0)
+
+    def test_din_skips_flushes(self):
+        path = self.write('trace.din', "0 1000\n1 2000\n2 3000\n4 0\n")
+        trace = parse_trace(path)
+        self.assertEqual(trace.trace_format, 'din')
+        self.assertEqual(trace.addresses.tolist(), [0x1000, 0x2000, 0x3000])
+        self.assertEqual(trace.ops.tolist(), [OP_READ, OP_WRITE, OP_IFETCH])
+
+    def test_csv_named_columns(self):
+        path = self.write('trace.csv', "cycle,op,addr,size\n1,R,0x10,4\n2,W,0x20,8\n")
+        trace = parse_trace(path)
+        self.assertEqual(trace.trace_format, 'csv')
+        self.assertEqual(trace.addresses.tolist(), [0x10, 0x20])
+        self.assertEqual(trace.ops.tolist(), [OP_READ, OP_WRITE])
+        self.assertEqual(trace.sizes.tolist(), [4, 8])
+
+        decimal = parse_trace(self.write('dec.csv', "address\n16\n32\n"))
+        self.assertEqual(decimal.addresses.tolist(), [16, 32])
+
+    def test_bad_lines_are_reported_not_fatal(self):
+        path = self.write('trace.txt', "3e8\nxyz\n\n7d0\n12 34\nbb8\n")
+        trace = parse_trace(path)
+        self.assertEqual(trace.addresses.tolist(), [0x3e8, 0x7d0, 0xbb8])
+        self.assertEqual(trace.error_count, 2)
+        self.assertEqual(trace.errors, [(2, 'xyz'), (5, '12 34')])
+
+    def test_chunked_parse_matches_single_chunk(self):
+        addresses = np.random.default_rng(0).integers(0, 1 << 48, 5000)
+        path = self.write('trace.txt', "".join(f"0x{address:x}\n" for address in addresses.tolist()))
+        for chunk_bytes in (64, 1000, 1 << 24):
+            trace = parse_trace(path, 'hex', chunk_bytes=chunk_bytes)
+            self.assertEqual(trace.addresses.tolist(), addresses.tolist())
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("3e8\n3ec\n"), 'hex')
+        self.assertEqual(detect_format(" L 0025B5A8,8\n"), 'lackey')
+        self.assertEqual(detect_format("0 1000\n"), 'din')
+        self.assertEqual(detect_format("addr,op\n0x10,R\n"), 'csv')
+
+    def test_missing_file(self):
+        self.assertIsNone(parse_trace(os.path.join(self.tmp.name, 'missing.txt')))
+
+    def test_records(self):
+        path = self.write('trace.din', "1 ff\n")
+        records = parse_trace(path).to_records()
+        self.assertEqual(records['address'][0], 0xff)
+        self.assertEqual(records['op'][0], OP_WRITE)
+
+if __name__ == '__main__':
+    unittest.main()
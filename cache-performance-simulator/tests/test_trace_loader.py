@@ -1,4 +1,8 @@
+import io
+import os
+import tempfile
 import unittest
+from contextlib import redirect_stdout
 from src.memory.trace_loader import load_memory_trace
 
 class TestTraceLoader(unittest.TestCase):
@@ -23,5 +27,15 @@ class TestTraceLoader(unittest.TestCase):
         loaded_addresses = load_memory_trace(trace_file)
         self.assertEqual(loaded_addresses, [])
 
+    def test_malformed_line_does_not_truncate_the_trace(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_file = os.path.join(tmp, 'trace.txt')
+            with open(trace_file, 'w') as f:
+                f.write("3e8\nnot-an-address\n3ec\n\n7d0\n")
+            with redirect_stdout(io.StringIO()) as output:
+                loaded_addresses = load_memory_trace(trace_file)
+        self.assertEqual(loaded_addresses, [1000, 1004, 2000])
+        self.assertIn("line 2: not-an-address", output.getvalue())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
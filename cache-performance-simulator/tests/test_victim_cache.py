@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.cache.cache_simulator import CacheSimulator
+from src.cache.checkpoint import load_checkpoint, save_checkpoint
+from src.cache.instrumentation import CacheInstrumentation
+from src.memory.block_stream import build_block_stream
+
+# Three blocks that map to set 0 of a 4-line cache with 4-byte blocks
+A, B, C = 0, 16, 32
+
+class TestVictimCache(unittest.TestCase):
+    def test_no_buffer_keeps_plain_path(self):
+        cache = CacheSimulator(cache_size=4, block_size=4)
+        self.assertNotIn('access_memory', vars(cache))
+        with self.assertRaises(ValueError):
+            CacheSimulator(victim_entries=4, victim_mode='stream')
+
+    def test_victim_cache_swaps_evicted_lines(self):
+        cache = CacheSimulator(cache_size=4, block_size=4, victim_entries=2)
+        results = [cache.access_memory(address) for address in [A, B, A, B, C, A, B]]
+        self.assertEqual(results, [False] * 7)
+        # A and B ping-pong through the buffer; C pushes out neither while the buffer holds two lines
+        self.assertEqual(cache.victim_hits, 4)
+        self.assertEqual(list(cache.victim_buffer), [C // 4, A // 4])
+        self.assertEqual(cache.tags[0], B // 16)
+
+    def test_buffer_is_bounded_lru(self):
+        cache = CacheSimulator(cache_size=4, block_size=4, victim_entries=1)
+        for address in [A, B, C, A]:
+            cache.access_memory(address)
+        # The one-entry buffer only ever holds the last line evicted
+        self.assertEqual(cache.victim_hits, 0)
+        self.assertEqual(list(cache.victim_buffer), [C // 4])
+
+    def test_miss_cache_keeps_fetched_lines(self):
+        cache = CacheSimulator(cache_size=4, block_size=4, victim_entries=2, victim_mode='miss')
+        for address in [A, B, A, B, C, A]:
+            cache.access_memory(address)
+        self.assertEqual(cache.victim_hits, 2)
+        self.assertEqual(list(cache.victim_buffer), [C // 4, A // 4])
+
+    def test_hit_and_miss_counts_match_direct_mapped(self):
+        trace = np.random.default_rng(2).integers(0, 4096, 3000).tolist()
+        plain = CacheSimulator(cache_size=32, block_size=16)
+        instrumentation = CacheInstrumentation()
+        buffered = CacheSimulator(cache_size=32, block_size=16, victim_entries=8, instrumentation=instrumentation)
+        for address in trace:
+            self.assertEqual(plain.access_memory(address), buffered.access_memory(address))
+        self.assertEqual((plain.hits, plain.misses), (buffered.hits, buffered.misses))
+        self.assertEqual(instrumentation.misses, buffered.misses)
+        self.assertGreater(buffered.victim_hits, 0)
+
+    def test_block_stream_and_checkpoint(self):
+        trace = np.random.default_rng(3).integers(0, 2048, 2000)
+        expected = CacheSimulator(cache_size=16, block_size=16, victim_entries=4)
+        for address in trace.tolist():
+            expected.access_memory(address)
+
+        streamed = CacheSimulator(cache_size=16, block_size=16, victim_entries=4)
+        streamed.simulate_block_stream(build_block_stream(trace, 16))
+        self.assertEqual(streamed.get_state(), expected.get_state())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'victim.ckpt')
+            save_checkpoint(expected, path)
+            restored, _ = load_checkpoint(path)
+        self.assertEqual((restored.victim_entries, restored.victim_mode), (4, 'victim'))
+        self.assertEqual(restored.get_state(), expected.get_state())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.memory.workloads import (generate_workload, phase_mixture, pointer_chase_stream, zipf_stream,
+                                  loop_stream, write_memory_trace)
+from src.memory.trace_loader import load_memory_trace
+
+class TestWorkloads(unittest.TestCase):
+    def test_seeded_workloads_are_reproducible(self):
+        first = generate_workload('zipf', 1000, seed=42, num_blocks=100)
+        second = generate_workload('zipf', 1000, seed=42, num_blocks=100)
+        np.testing.assert_array_equal(first, second)
+
+    def test_zipf_is_skewed(self):
+        addresses = zipf_stream(100000, num_blocks=1000, alpha=1.2, block_size=1, scatter=False, seed=1)
+        counts = np.bincount(addresses, minlength=1000)
+        self.assertEqual(int(np.argmax(counts)), 0)
+        self.assertGreater(counts[0], 10 * counts[100])
+
+    def test_loop_repeats_working_set(self):
+        addresses = loop_stream(10, loop_length=4, base=100, element_size=4)
+        self.assertEqual(addresses.tolist(), [100, 104, 108, 112, 100, 104, 108, 112, 100, 104])
+
+    def test_pointer_chase_visits_every_node_once_per_lap(self):
+        addresses = pointer_chase_stream(64, num_nodes=32, node_size=64, seed=3)
+        self.assertEqual(len(set(addresses[:32].tolist())), 32)
+        np.testing.assert_array_equal(addresses[:32], addresses[32:])
+
+    def test_phase_mixture_lengths(self):
+        phases = [(3, 'scan', {}), (1, 'uniform', {'num_blocks': 8})]
+        stream = phase_mixture(phases, 1001, seed=7)
+        self.assertEqual(len(stream), 1001)
+        self.assertEqual(stream[:750].tolist(), list(range(0, 3000, 4)))
+        interleaved = phase_mixture(phases, 1000, seed=7, interleave=True)
+        self.assertEqual(len(interleaved), 1000)
+
+    def test_unknown_workload(self):
+        with self.assertRaises(ValueError):
+            generate_workload('random_walk', 10)
+
+    def test_written_trace_round_trips_through_loader(self):
+        addresses = generate_workload('uniform', 500, seed=5, num_blocks=64)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.txt')
+            write_memory_trace(addresses, path)
+            self.assertEqual(load_memory_trace(path), addresses.tolist())
+
+if __name__ == '__main__':
+    unittest.main()